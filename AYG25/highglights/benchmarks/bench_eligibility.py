@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: row-by-row vs columnar eligibility filtering
+Compares the old iterrows()/has_value() filter from load_data with the
+column masks from highlight_filters.py on synthetic sheet data (synthetic_sheet.py).
+
+Usage:
+    python benchmarks/bench_eligibility.py
+    python benchmarks/bench_eligibility.py --rows 10000 100000 --repeat 3
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+# Allow running from the highlights directory or from benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from config import COLUMN_MAPPINGS, DATA_START_ROW  # noqa: E402
+from highlight_filters import build_eligibility_masks  # noqa: E402
+from synthetic_sheet import make_sheet_values  # noqa: E402
+
+
+def make_synthetic_df(n_rows, seed=42):
+    """Build a DataFrame from a synthetic data collection sheet (see synthetic_sheet.py)"""
+    values = make_sheet_values(n_rows, seed=seed)
+    headers = [header.strip() for header in values[DATA_START_ROW - 1]]
+    return pd.DataFrame(values[DATA_START_ROW:], columns=headers)
+
+
+def legacy_valid_rows(df):
+    """The original per-row filter from HighlightsGenerator.load_data"""
+    sport_col = COLUMN_MAPPINGS.get('SPORT', 'SPORT')
+    event_col = COLUMN_MAPPINGS.get('EVENT', 'EVENT')
+    stage_col = COLUMN_MAPPINGS.get('STAGE', 'STAGE / ROUND OF COMPETITION')
+    athlete_col = COLUMN_MAPPINGS.get('ATHLETE_NAME', 'NAME OF ATHLETE (SGP)')
+    competitor_name_col = COLUMN_MAPPINGS.get('COMPETITOR_NAME', 'NAME OF ATHLETE (COMPETITOR)')
+    competitor_country_col = COLUMN_MAPPINGS.get('COMPETITOR_COUNTRY', 'COUNTRY NAME (COMPETITOR)')
+    score_sgp_col = COLUMN_MAPPINGS.get('SCORE_SGP', 'SCORE/DISTANCE/HEIGHT\n(SGP)')
+    score_competitor_col = COLUMN_MAPPINGS.get('SCORE_COMPETITOR', 'SCORE (COMPETITOR)')
+    timing_sgp_col = COLUMN_MAPPINGS.get('TIMING_SGP', 'TIMING (SGP)\nhh:mm:ss.ms')
+    available_cols = set(df.columns)
+
+    def has_value(col, row):
+        if col not in available_cols:
+            return False
+        val = row.get(col)
+        return pd.notna(val) and str(val).strip() != ''
+
+    valid_rows = []
+    for idx, row in df.iterrows():
+        is_h2h = has_value(competitor_name_col, row) and has_value(competitor_country_col, row)
+        has_basic = (has_value(sport_col, row) and
+                     has_value(event_col, row) and
+                     has_value(stage_col, row) and
+                     has_value(athlete_col, row))
+        if is_h2h:
+            has_result = has_value(score_sgp_col, row) or has_value(score_competitor_col, row)
+        else:
+            has_result = has_value(timing_sgp_col, row) or has_value(score_sgp_col, row)
+        if has_basic and has_result:
+            valid_rows.append(idx)
+    return valid_rows
+
+
+def best_of(func, repeat):
+    """Return the fastest wall time (seconds) and last result of func()"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark highlights eligibility filtering')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help='Synthetic row counts to benchmark (default: 10000 100000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Repetitions per measurement, best time is reported (default: 3)')
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'iterrows (s)':>13}  {'columnar (s)':>13}  {'speedup':>8}")
+    for n_rows in args.rows:
+        df = make_synthetic_df(n_rows)
+        legacy_time, legacy_rows = best_of(lambda: legacy_valid_rows(df), args.repeat)
+        columnar_time, masks = best_of(lambda: build_eligibility_masks(df), args.repeat)
+
+        columnar_rows = list(df.index[masks['eligible']])
+        if columnar_rows != legacy_rows:
+            print(f"MISMATCH at {n_rows} rows: {len(legacy_rows)} vs {len(columnar_rows)} eligible")
+            return 1
+
+        print(f"{n_rows:>8}  {legacy_time:>13.4f}  {columnar_time:>13.4f}  "
+              f"{legacy_time / columnar_time:>7.1f}x")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark: highlights generator stages at several sheet sizes
+Runs HighlightsGenerator against synthetic sheets (benchmarks/synthetic_sheet.py) served
+by an in-memory fake worksheet, times each stage and writes the results to JSON so
+runs can be compared across commits.
+
+Usage:
+    python benchmarks/bench_highlights.py
+    python benchmarks/bench_highlights.py --rows 2000 10000 20000 --repeat 3
+    python benchmarks/bench_highlights.py --sports 40 --dates 12 --h2h-ratio 0.5
+    python benchmarks/bench_highlights.py --compare benchmarks/results/highlights_abc1234.json
+"""
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Allow running from the highlights directory or from benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_highlights import HighlightsGenerator  # noqa: E402
+from synthetic_sheet import FakeWorksheet, make_sheet_values  # noqa: E402
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+STAGES = ('load_data', 'group_highlights', 'build_result_cards', 'generate_html',
+          'generate_all', 'generate_all_fused')
+
+
+def best_of(func, repeat):
+    """Return the fastest wall time (seconds) and last result of func()"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def git_commit():
+    """Short hash of the checked-out commit, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=Path(__file__).resolve().parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_size(n_rows, args, output_dir):
+    """Time every stage for one synthetic sheet size"""
+    values = make_sheet_values(n_rows, sports=args.sports, dates=args.dates,
+                               h2h_ratio=args.h2h_ratio, medal_density=args.medal_density,
+                               noise=args.noise, seed=args.seed)
+    generator = HighlightsGenerator(connect=False, refresh=True, snapshot_ttl=0)
+    generator.output_dir = output_dir
+    generator.worksheet = FakeWorksheet(values)
+    generation_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    timings = {}
+    timings['load_data'], df = best_of(lambda: generator.load_data(start_row=8), args.repeat)
+    timings['group_highlights'], grouped = best_of(lambda: generator.group_highlights(df), args.repeat)
+    timings['build_result_cards'], _ = best_of(
+        lambda: [generator.build_result_cards(key, highlights) for key, highlights in grouped.items()],
+        args.repeat
+    )
+    timings['generate_html'], _ = best_of(
+        lambda: [generator.generate_html(key, highlights, generation_date)
+                 for key, highlights in grouped.items()],
+        args.repeat
+    )
+    timings['generate_all'], _ = best_of(lambda: generator.generate_all(force=True), args.repeat)
+    timings['generate_all_fused'], _ = best_of(
+        lambda: generator.generate_all(force=True, fused=True), args.repeat
+    )
+
+    return {
+        'rows': n_rows,
+        'eligible_rows': len(df),
+        'groups': len(grouped),
+        'highlights': sum(len(highlights) for highlights in grouped.values()),
+        'seconds': timings
+    }
+
+
+def print_comparison(results, baseline):
+    """Print current vs baseline timings for the sizes both runs cover"""
+    previous = {entry['rows']: entry['seconds'] for entry in baseline.get('results', [])}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp', '?')}):")
+    print(f"{'rows':>8}  {'stage':<20}  {'before (s)':>11}  {'after (s)':>10}  {'speedup':>8}")
+    for entry in results:
+        before = previous.get(entry['rows'])
+        if before is None:
+            continue
+        for stage, seconds in entry['seconds'].items():
+            if stage not in before:
+                continue
+            print(f"{entry['rows']:>8}  {stage:<20}  {before[stage]:>11.4f}  {seconds:>10.4f}  "
+                  f"{before[stage] / seconds if seconds else float('inf'):>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark highlights generator stages on synthetic sheets')
+    parser.add_argument('--rows', type=int, nargs='+', default=[2000, 10000, 20000],
+                        help='Synthetic row counts to benchmark (default: 2000 10000 20000)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Repetitions per measurement, best time is reported (default: 3)')
+    parser.add_argument('--sports', type=int, default=12, help='Distinct sports (default: 12)')
+    parser.add_argument('--dates', type=int, default=8, help='Distinct competition dates (default: 8)')
+    parser.add_argument('--h2h-ratio', type=float, default=0.4,
+                        help='Fraction of head-to-head rows (default: 0.4)')
+    parser.add_argument('--medal-density', type=float, default=0.15,
+                        help='Fraction of rows with a medal (default: 0.15)')
+    parser.add_argument('--noise', type=float, default=0.1,
+                        help='Column noise: blank cells, padded headers, odd formats (default: 0.1)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Results JSON file (default: benchmarks/results/highlights_<commit>.json)')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='Earlier results JSON file to compare against')
+    args = parser.parse_args()
+
+    # Keep the generator's per-page logging out of the timings and the output
+    logging.disable(logging.INFO)
+
+    results = []
+    print(f"{'rows':>8}  {'groups':>6}  " + '  '.join(f"{stage:>18}" for stage in STAGES))
+    with tempfile.TemporaryDirectory(prefix='bench_highlights_') as tmp:
+        for n_rows in args.rows:
+            output_dir = Path(tmp) / str(n_rows)
+            output_dir.mkdir()
+            entry = bench_size(n_rows, args, output_dir)
+            results.append(entry)
+            print(f"{n_rows:>8}  {entry['groups']:>6}  " +
+                  '  '.join(f"{entry['seconds'][stage]:>17.4f}s" for stage in STAGES))
+
+    commit = git_commit()
+    report = {
+        'benchmark': 'highlights',
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {
+            'repeat': args.repeat, 'sports': args.sports, 'dates': args.dates,
+            'h2h_ratio': args.h2h_ratio, 'medal_density': args.medal_density,
+            'noise': args.noise, 'seed': args.seed
+        },
+        'results': results
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"highlights_{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        print_comparison(results, json.loads(Path(args.compare).read_text(encoding='utf-8')))
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
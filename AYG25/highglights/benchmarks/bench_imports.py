@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark: start-up import time of the generator entry points
+Imports each module in a fresh interpreter under `python -X importtime`, reports the
+cumulative import time, the slowest direct imports and whether the heavy
+dependencies (pandas, gspread, google-auth) were loaded, and writes the results to
+JSON so runs can be compared across commits.
+
+Usage:
+    python benchmarks/bench_imports.py
+    python benchmarks/bench_imports.py --modules render_snapshot generate_highlights --repeat 5
+    python benchmarks/bench_imports.py --compare benchmarks/results/imports_abc1234.json
+"""
+
+import argparse
+import json
+import platform
+import re
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_highlights import RESULTS_DIR, git_commit  # noqa: E402
+
+HIGHLIGHTS_DIR = Path(__file__).resolve().parent.parent
+MODULES = ('render_snapshot', 'generate_highlights', 'generate_daily_schedule')
+HEAVY_MODULES = ('pandas', 'numpy', 'gspread', 'google.oauth2')
+
+# "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def import_once(module):
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Returns:
+        Dictionary with total_ms, the module's direct imports {name: cumulative ms}
+        and the heavy modules that ended up loaded
+    """
+    probe = (f"import sys, {module}; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', probe], cwd=HIGHLIGHTS_DIR,
+                            capture_output=True, text=True, check=True)
+    # Children are printed before their parent; the module itself is at depth 1
+    # (one space), its direct imports at depth 2 (three spaces)
+    total_ms, children, pending = 0.0, {}, {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        depth = (len(match[3]) + 1) // 2
+        if depth == 2:
+            pending[match[4]] = int(match[2]) / 1000
+        elif depth == 1:
+            if match[4] == module:
+                total_ms, children = int(match[2]) / 1000, pending
+            pending = {}
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return {'total_ms': total_ms, 'imports': children, 'heavy_loaded': loaded}
+
+
+def bench_module(module, repeat, top):
+    """Best-of-repeat import time for one module plus its slowest direct imports"""
+    runs = [import_once(module) for _ in range(repeat)]
+    best = min(runs, key=lambda run: run['total_ms'])
+    imports = sorted(best['imports'].items(), key=lambda item: -item[1])
+    return {
+        'module': module,
+        'total_ms': round(best['total_ms'], 1),
+        'heavy_loaded': best['heavy_loaded'],
+        'slowest_imports': [{'name': name, 'ms': round(ms, 1)} for name, ms in imports[:top]]
+    }
+
+
+def print_comparison(results, baseline):
+    """Print current vs baseline import times for the modules both runs cover"""
+    previous = {entry['module']: entry['total_ms'] for entry in baseline.get('results', [])}
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'} ({baseline.get('timestamp', '?')}):")
+    print(f"{'module':<26}  {'before (ms)':>11}  {'after (ms)':>10}  {'speedup':>8}")
+    for entry in results:
+        before = previous.get(entry['module'])
+        if before is None:
+            continue
+        after = entry['total_ms']
+        print(f"{entry['module']:<26}  {before:>11.1f}  {after:>10.1f}  "
+              f"{before / after if after else float('inf'):>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark start-up import time of the generator modules')
+    parser.add_argument('--modules', nargs='+', default=list(MODULES),
+                        help=f"Modules to import (default: {' '.join(MODULES)})")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Fresh interpreters per module, best time is reported (default: 5)')
+    parser.add_argument('--top', type=int, default=5,
+                        help='Slowest direct imports to list per module (default: 5)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Results JSON file (default: benchmarks/results/imports_<commit>.json)')
+    parser.add_argument('--compare', type=str, default=None,
+                        help='Earlier results JSON file to compare against')
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'module':<26}  {'import (ms)':>11}  heavy modules loaded")
+    for module in args.modules:
+        entry = bench_module(module, args.repeat, args.top)
+        results.append(entry)
+        print(f"{module:<26}  {entry['total_ms']:>11.1f}  {', '.join(entry['heavy_loaded']) or '-'}")
+        for item in entry['slowest_imports']:
+            print(f"    {item['name']:<30} {item['ms']:>8.1f} ms")
+
+    commit = git_commit()
+    report = {
+        'benchmark': 'imports',
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {'repeat': args.repeat},
+        'results': results
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"imports_{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        print_comparison(results, json.loads(Path(args.compare).read_text(encoding='utf-8')))
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
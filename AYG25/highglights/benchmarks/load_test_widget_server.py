@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Load test: widget_server.py against a synthetic sheet
+Starts the widget server in-process on a free local port, backed by a FakeWorksheet
+(benchmarks/synthetic_sheet.py) instead of Google Sheets, then drives it with
+concurrent clients mixing plain, compressed and conditional (If-None-Match) requests
+for pages and feeds. Reports throughput, latency percentiles, status counts and bytes
+transferred, and writes the results to JSON so runs can be compared across commits.
+
+Usage:
+    python benchmarks/load_test_widget_server.py
+    python benchmarks/load_test_widget_server.py --rows 20000 --clients 16 --requests 5000
+    python benchmarks/load_test_widget_server.py --url http://localhost:8080   # existing server
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+# Allow running from the highlights directory or from benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_highlights import RESULTS_DIR, git_commit  # noqa: E402
+from generate_highlights import HighlightsGenerator  # noqa: E402
+from synthetic_sheet import FakeWorksheet, make_sheet_values  # noqa: E402
+from widget_server import WidgetCache, create_app  # noqa: E402
+
+ENCODINGS = ('br, gzip', 'gzip', '')
+
+
+def start_local_server(args, output_dir):
+    """Serve a synthetic sheet from a background thread; returns (base URL, server, cache)"""
+    from werkzeug.serving import make_server
+
+    values = make_sheet_values(args.rows, sports=args.sports, dates=args.dates, seed=args.seed)
+    generator = HighlightsGenerator(connect=False, refresh=True, snapshot_ttl=0)
+    generator.output_dir = output_dir
+    generator.worksheet = FakeWorksheet(values)
+    cache = WidgetCache(generator, groupings=args.groupings, interval=args.refresh_interval)
+    cache.refresh()
+    cache.start()
+
+    server = make_server('127.0.0.1', 0, create_app(cache), threaded=True)
+    threading.Thread(target=server.serve_forever, name='widget-server', daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server, cache
+
+
+def fetch(url, headers):
+    """GET a URL; returns (status, body bytes, response headers)"""
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            return response.status, response.read(), response.headers
+    except urllib.error.HTTPError as e:
+        return e.code, e.read(), e.headers
+
+
+def discover_paths(base_url):
+    """Pages and feeds listed by the feed index"""
+    status, body, _ = fetch(f"{base_url}/feeds/index.json", {})
+    if status != 200:
+        raise RuntimeError(f"Feed index not available ({status}) - is the server running with feeds?")
+    days = json.loads(body).get('days', [])
+    paths = ['feeds/index.json']
+    for day in days:
+        paths.append(day['url'])
+        safe = day['url'].rsplit('/', 1)[-1][:-len('.json')]
+        paths.append(f"highlights_{safe}.html")
+    return paths
+
+
+def client(base_url, paths, n_requests, conditional_ratio, seed, results):
+    """One client: random paths and encodings, replaying ETags it has seen"""
+    rnd = random.Random(seed)
+    etags = {}
+    latencies = []
+    statuses = {}
+    transferred = 0
+    for _ in range(n_requests):
+        path = rnd.choice(paths)
+        encoding = rnd.choice(ENCODINGS)
+        headers = {'Accept-Encoding': encoding} if encoding else {'Accept-Encoding': 'identity'}
+        known = etags.get((path, encoding))
+        if known and rnd.random() < conditional_ratio:
+            headers['If-None-Match'] = known
+        start = time.perf_counter()
+        status, body, response_headers = fetch(f"{base_url}/{path}", headers)
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
+        transferred += len(body)
+        if response_headers.get('ETag'):
+            etags[(path, encoding)] = response_headers['ETag']
+    results.append({'latencies': latencies, 'statuses': statuses, 'bytes': transferred})
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the highlights widget server')
+    parser.add_argument('--url', type=str, default=None,
+                        help='Existing server to test (default: start one on a synthetic sheet)')
+    parser.add_argument('--rows', type=int, default=5000, help='Synthetic sheet rows (default: 5000)')
+    parser.add_argument('--sports', type=int, default=12, help='Distinct sports (default: 12)')
+    parser.add_argument('--dates', type=int, default=8, help='Distinct competition dates (default: 8)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--groupings', nargs='+', default=None,
+                        help='Page sets the local server renders (default: config)')
+    parser.add_argument('--refresh-interval', type=int, default=0,
+                        help='Background refresh interval of the local server in seconds '
+                             '(default: 0, no refresh during the test)')
+    parser.add_argument('--clients', type=int, default=8, help='Concurrent clients (default: 8)')
+    parser.add_argument('--requests', type=int, default=2000, help='Total requests (default: 2000)')
+    parser.add_argument('--conditional-ratio', type=float, default=0.5,
+                        help='Share of repeat requests sent with If-None-Match (default: 0.5)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Results JSON file (default: benchmarks/results/widget_server_<commit>.json)')
+    args = parser.parse_args()
+
+    # Keep the generator's and the server's per-request logging out of the output
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory(prefix='widget_server_') as tmp:
+        server = cache = None
+        if args.url:
+            base_url = args.url.rstrip('/')
+        else:
+            setup_start = time.perf_counter()
+            base_url, server, cache = start_local_server(args, Path(tmp))
+            print(f"Local server on {base_url}: {len(cache.entries)} files cached in "
+                  f"{time.perf_counter() - setup_start:.2f}s")
+
+        try:
+            paths = discover_paths(base_url)
+            per_client = max(1, args.requests // args.clients)
+            results = []
+            threads = [
+                threading.Thread(target=client, args=(base_url, paths, per_client, args.conditional_ratio,
+                                                      args.seed + i, results))
+                for i in range(args.clients)
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            if server is not None:
+                server.shutdown()
+                cache.stop()
+
+    latencies = sorted(latency for result in results for latency in result['latencies'])
+    statuses = {}
+    for result in results:
+        for status, count in result['statuses'].items():
+            statuses[str(status)] = statuses.get(str(status), 0) + count
+    transferred = sum(result['bytes'] for result in results)
+
+    summary = {
+        'requests': len(latencies),
+        'clients': args.clients,
+        'paths': len(paths),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99': round(percentile(latencies, 0.99) * 1000, 2),
+            'max': round(latencies[-1] * 1000, 2) if latencies else 0.0
+        },
+        'statuses': statuses,
+        'bytes_transferred': transferred
+    }
+
+    print(f"{summary['requests']} requests from {args.clients} clients over {len(paths)} paths "
+          f"in {summary['seconds']:.2f}s: {summary['requests_per_second']} req/s")
+    print(f"Latency p50 {summary['latency_ms']['p50']} ms, p95 {summary['latency_ms']['p95']} ms, "
+          f"p99 {summary['latency_ms']['p99']} ms, max {summary['latency_ms']['max']} ms")
+    print(f"Statuses: {', '.join(f'{status}: {count}' for status, count in sorted(statuses.items()))}; "
+          f"{transferred / 2 ** 20:.1f} MB transferred")
+
+    commit = git_commit()
+    report = {
+        'benchmark': 'widget_server',
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': {
+            'url': args.url, 'rows': args.rows, 'sports': args.sports, 'dates': args.dates,
+            'seed': args.seed, 'conditional_ratio': args.conditional_ratio
+        },
+        'results': summary
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"widget_server_{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\nResults written to {output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Synthetic results sheet and in-memory fake worksheet for benchmarks
+Builds sheet values shaped like the data collection sheet (7 filler rows, the header
+row on row 8, then data rows) with configurable size and mix, and serves them through
+a FakeWorksheet implementing the gspread calls the generators use.
+"""
+
+import random
+import re
+import sys
+from pathlib import Path
+
+# Allow running from the highlights directory or from benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import COLUMN_MAPPINGS, DATA_START_ROW  # noqa: E402
+
+SPORTS = [
+    'Swimming', 'Athletics', 'Table Tennis', 'Jiu-Jitsu', 'Badminton', 'Wushu', 'Fencing',
+    'Archery', 'Sailing', 'Shooting', 'Taekwondo', 'Judo', 'Gymnastics', 'Diving',
+    'Weightlifting', 'Cycling', 'Rowing', 'Canoe', 'Boxing', 'Wrestling', 'Golf', 'Tennis',
+    'Triathlon', 'Volleyball', 'Basketball', 'Football', 'Hockey', 'Handball', 'Karate',
+    'Sepak Takraw', 'Squash', 'Bowling', 'Climbing', 'Skateboarding', 'Surfing', 'Equestrian'
+]
+COUNTRIES = [
+    'THA', 'Malaysia', 'VIE', 'INA', 'PHI', 'Japan', 'China', 'Korea Republic', 'IND',
+    'Hong Kong', 'Chinese Taipei', 'UKRAINE', 'Brunei', 'Timor-Leste', 'AUS', 'NZL'
+]
+STAGES = ['Heats', 'Preliminary', 'Round of 16', 'Quarterfinal', 'Semifinal', 'Final']
+MEDALS = ['Gold', 'Silver', 'Bronze']
+FILLER_COLUMNS = ['WHATSAPP', 'WEB RESULTS', 'INSTAGRAM', 'NOTES']
+
+
+def make_sheet_values(n_rows, sports=12, dates=8, h2h_ratio=0.4, medal_density=0.15,
+                      noise=0.1, seed=42):
+    """
+    Build synthetic sheet values (like get_all_values())
+
+    Args:
+        n_rows: Number of data rows
+        sports: Number of distinct sports (up to len(SPORTS), cycled beyond)
+        dates: Number of distinct competition dates
+        h2h_ratio: Fraction of head-to-head rows
+        medal_density: Fraction of rows with a medal
+        noise: Column noise - fraction of blank key cells, padded headers, unused long
+               text columns and oddly formatted dates/timings
+        seed: Random seed (same arguments give the same sheet)
+
+    Returns:
+        List of rows; the header row is row DATA_START_ROW (1-based)
+    """
+    rnd = random.Random(seed)
+    sport_names = [SPORTS[i % len(SPORTS)] + ('' if i < len(SPORTS) else f" {i // len(SPORTS) + 1}")
+                   for i in range(max(1, sports))]
+    date_values = [f"2025-10-{day:02d}" for day in range(20, 20 + max(1, dates))]
+
+    names = list(COLUMN_MAPPINGS.values())
+    n_filler = round(len(FILLER_COLUMNS) * min(1.0, noise * 10))
+    headers = names + FILLER_COLUMNS[:n_filler]
+    rnd.shuffle(headers)
+    # Stray whitespace around some header names (stripped by the generator)
+    headers = [f" {h} " if rnd.random() < noise else h for h in headers]
+    position = {h.strip(): i for i, h in enumerate(headers)}
+    key_columns = {key: position[name] for key, name in COLUMN_MAPPINGS.items()}
+    filler_positions = [position[name] for name in FILLER_COLUMNS[:n_filler]]
+
+    def blank_or(value):
+        return rnd.choice(['', '  ']) if rnd.random() < noise else value
+
+    rows = []
+    for i in range(n_rows):
+        row = [''] * len(headers)
+
+        def put(key, value):
+            row[key_columns[key]] = value
+
+        sport = rnd.choice(sport_names)
+        put('SPORT', blank_or(sport))
+        put('DISCIPLINE', rnd.choice(['', sport.upper()]))
+        put('EVENT', blank_or(f"{rnd.choice(['Men', 'Women'])}'s Event {rnd.randint(1, 30)}"))
+        put('EVENT_GENDER', rnd.choice(['M', 'F']))
+        put('STAGE', blank_or(rnd.choice(STAGES)))
+        date = rnd.choice(date_values)
+        if rnd.random() < noise:
+            date = rnd.choice(['', date.replace('-0', '-'), 'TBC'])
+        put('DATE_SGP', date)
+        put('TIME_START_SGP', f"{rnd.randint(8, 21):02d}:{rnd.choice(['00', '15', '30', '45'])}")
+        put('ATHLETE_NAME', blank_or(f"Athlete {i % 400}"))
+        put('COUNTRY_SGP', 'Singapore')
+
+        if rnd.random() < h2h_ratio:
+            put('COMPETITOR_NAME', blank_or(f"Opponent {i % 250}"))
+            put('COMPETITOR_COUNTRY', blank_or(rnd.choice(COUNTRIES)))
+            sgp, opp = rnd.randint(0, 21), rnd.randint(0, 21)
+            put('SCORE_SGP', blank_or(str(sgp)))
+            put('SCORE_COMPETITOR', blank_or(str(opp)))
+            put('WIN_DRAW_LOSE', 'WIN' if sgp > opp else 'LOSE' if sgp < opp else 'DRAW')
+        else:
+            minutes, seconds = rnd.randint(0, 4), rnd.uniform(0, 59.99)
+            timing = f"00:{minutes:02d}:{seconds:05.2f}"
+            if rnd.random() < noise:
+                timing = f"{minutes}:{seconds:.1f}"
+            if rnd.random() < 0.7:
+                put('TIMING_SGP', blank_or(timing))
+            else:
+                put('SCORE_SGP', blank_or(f"{rnd.uniform(1, 100):.2f}"))
+            put('POSITION', str(rnd.randint(1, 16)))
+            put('TOTAL_COMPETITORS', '16')
+            if rnd.random() < 0.1:
+                put('PB_NR', rnd.choice(['PB', 'NR', 'PB/NR']))
+
+        if rnd.random() < medal_density:
+            put('MEDALS', rnd.choice(MEDALS))
+            put('FINAL_POSITION', str(rnd.randint(1, 3)))
+        elif rnd.random() < 0.2:
+            put('ADVANCED', rnd.choice(['Yes', 'No']))
+
+        for p in filler_positions:
+            row[p] = 'lorem ipsum ' * rnd.randint(5, 40)
+        rows.append(row)
+
+    filler = [[''] * len(headers) for _ in range(DATA_START_ROW - 1)]
+    return filler + [headers] + rows
+
+
+def _column_index(letters):
+    """Sheet column letters to a 0-based index (A -> 0, AA -> 26)"""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - ord('A') + 1
+    return index - 1
+
+
+class FakeWorksheet:
+    """In-memory stand-in for a gspread Worksheet (get_all_values, row_values, batch_get)"""
+
+    def __init__(self, values, title='Synthetic'):
+        self.values = values
+        self.title = title
+
+    def get_all_values(self):
+        return [list(row) for row in self.values]
+
+    def row_values(self, row):
+        values = list(self.values[row - 1]) if row <= len(self.values) else []
+        while values and values[-1] == '':
+            values.pop()
+        return values
+
+    def batch_get(self, ranges, major_dimension='ROWS'):
+        # 'A9:C' / 'A9:C200' ranges as sheet_fetch.py and sheet_sync.py issue them; like the
+        # Sheets API, trailing empty cells and trailing empty rows/columns are dropped
+        results = []
+        for a1_range in ranges:
+            match = re.fullmatch(r'([A-Z]+)(\d+):([A-Z]+)(\d*)', a1_range)
+            first_col, last_col = _column_index(match[1]), _column_index(match[3])
+            first_row = int(match[2])
+            last_row = int(match[4]) if match[4] else None
+            block = [[row[col] if col < len(row) else '' for col in range(first_col, last_col + 1)]
+                     for row in self.values[first_row - 1:last_row]]
+            if major_dimension == 'COLUMNS':
+                block = [list(column) for column in zip(*block)]
+            for cells in block:
+                while cells and cells[-1] == '':
+                    cells.pop()
+            while block and not block[-1]:
+                block.pop()
+            results.append(block)
+        return results
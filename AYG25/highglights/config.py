@@ -13,6 +13,17 @@ GOOGLE_CREDENTIALS_FILE = '../ayg-form-system/functions/google_credentials.json'
 # Data configuration
 DATA_START_ROW = 8  # Row where column headers are located
 
+# How to fetch sheet data: 'columns' reads the header row, then only the columns in
+# COLUMN_MAPPINGS (one batch_get); 'full' downloads every column with get_all_values();
+# 'incremental' fetches only appended/changed rows into a snapshot in output/.cache
+FETCH_MODE = 'columns'
+
+# Seconds a fetched sheet snapshot (output/.cache) is reused before fetching again;
+# 0 (the default) always fetches, so published pages never lag the sheet. Set it for
+# long-running or repeated runs (e.g. widget_server.py --snapshot-ttl) that can serve
+# slightly stale data. --offline renders from the snapshot whatever its age
+SNAPSHOT_TTL = 0
+
 # Output configuration
 OUTPUT_DIR = 'output'  # Directory where HTML files will be generated
 
@@ -53,3 +64,16 @@ COLUMN_MAPPINGS = {
 # Grouping configuration
 GROUP_BY_DATE = True  # Group highlights by date instead of sport
 
+# Keep a cumulative medal tally across days: adds a "tally to date" card to each page
+# and writes output/medal_standings.html (same as --tally)
+MEDAL_TALLY = False
+
+# Publish styles.css and flag images under content-hashed names in output/assets/ and
+# point the pages at them, so static hosts can cache them long-term (same as --publish-assets)
+PUBLISH_ASSETS = False
+
+# Also write per-day JSON data feeds to output/feeds/ (same as --feeds)
+JSON_FEEDS = False
+
+# Write .gz/.br siblings of the generated HTML/CSS/JSON files for static hosts (same as --precompress)
+PRECOMPRESS = False
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Country flag index for highlight cards
+Built once per process from a single scan of flags/ plus the code/name tables,
+giving O(1) lookup of the flag emoji and flag image path for a country.
+"""
+
+import os
+from pathlib import Path
+
+FLAGS_DIR = Path(__file__).parent / 'flags'
+
+# Path prefix of flag images as referenced from pages in output/
+FLAGS_URL_PREFIX = '../flags/'
+
+FLAG_IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+
+# Country code / name -> flag emoji
+FLAG_EMOJI = {
+    'SGP': '🇸🇬', 'SINGAPORE': '🇸🇬',
+    'MAS': '🇲🇾', 'MALAYSIA': '🇲🇾',
+    'THA': '🇹🇭', 'THAILAND': '🇹🇭',
+    'PHI': '🇵🇭', 'PHILIPPINES': '🇵🇭',
+    'VIE': '🇻🇳', 'VIETNAM': '🇻🇳',
+    'INA': '🇮🇩', 'INDONESIA': '🇮🇩',
+    'MYA': '🇲🇲', 'MYANMAR': '🇲🇲',
+    'CAM': '🇰🇭', 'CAMBODIA': '🇰🇭',
+    'LAO': '🇱🇦', 'LAOS': '🇱🇦',
+    'BRU': '🇧🇳', 'BRUNEI': '🇧🇳',
+    'TLS': '🇹🇱', 'TIMOR-LESTE': '🇹🇱',
+    'CHN': '🇨🇳', 'CHINA': '🇨🇳',
+    'JPN': '🇯🇵', 'JAPAN': '🇯🇵',
+    'KOR': '🇰🇷', 'SOUTH KOREA': '🇰🇷', 'KOREA': '🇰🇷',
+    'HKG': '🇭🇰', 'HONG KONG': '🇭🇰',
+    'TPE': '🇹🇼', 'TAIWAN': '🇹🇼',
+    'IND': '🇮🇳', 'INDIA': '🇮🇳',
+    'AUS': '🇦🇺', 'AUSTRALIA': '🇦🇺',
+    'NZL': '🇳🇿', 'NEW ZEALAND': '🇳🇿',
+    'USA': '🇺🇸', 'UNITED STATES': '🇺🇸',
+    'GBR': '🇬🇧', 'UNITED KINGDOM': '🇬🇧', 'UK': '🇬🇧',
+    'FRA': '🇫🇷', 'FRANCE': '🇫🇷',
+    'GER': '🇩🇪', 'GERMANY': '🇩🇪',
+    'ITA': '🇮🇹', 'ITALY': '🇮🇹',
+    'ESP': '🇪🇸', 'SPAIN': '🇪🇸',
+    'MGL': '🇲🇳', 'MONGOLIA': '🇲🇳',
+    'KAZ': '🇰🇿', 'KAZAKHSTAN': '🇰🇿',
+}
+
+# Country code / name -> image file in flags/ (sheet codes differ from file codes, e.g. SGP -> SIN)
+FLAG_IMAGE_FILES = {
+    'SGP': 'SIN.png',
+    'SINGAPORE': 'SIN.png',
+    'SIN': 'SIN.png',
+    'THA': 'THA.png',
+    'THAILAND': 'THA.png',
+    'VIE': 'VIE.png',
+    'VIETNAM': 'VIE.png',
+    'INA': 'INA.png',
+    'INDONESIA': 'INA.png',
+    'MAS': 'MAS.png',
+    'MALAYSIA': 'MAS.png',
+    'PHI': 'PHI.png',
+    'PHILIPPINES': 'PHI.png',
+    'MYA': 'MYA.png',
+    'MYANMAR': 'MYA.png',
+    'LAO': 'LAO.png',
+    'LAOS': 'LAO.png',
+    'CAM': 'CAM.png',
+    'CAMBODIA': 'CAM.png',
+    'BRU': 'BRU.jpg',
+    'BRUNEI': 'BRU.jpg',
+    'TIMOR-LESTE': 'TLS.png',
+}
+
+
+class FlagIndex:
+    """Precomputed country -> (emoji, image path) lookups, memoized per country value"""
+
+    def __init__(self, flags_dir=FLAGS_DIR):
+        try:
+            files = set(os.listdir(flags_dir))
+        except FileNotFoundError:
+            files = set()
+
+        # Named mappings take priority, then a file named after the code itself
+        # (.png before .jpg before .jpeg)
+        self.images = {
+            key: FLAGS_URL_PREFIX + file_name
+            for key, file_name in FLAG_IMAGE_FILES.items()
+            if file_name in files
+        }
+        for suffix in FLAG_IMAGE_SUFFIXES:
+            for file_name in sorted(files):
+                if file_name.endswith(suffix):
+                    self.images.setdefault(file_name[:-len(suffix)], FLAGS_URL_PREFIX + file_name)
+
+        self._emoji_cache = {}
+
+    def emoji(self, country_value):
+        """Return the flag emoji for a country code or name ('' if unknown)"""
+        if not country_value:
+            return ''
+        upper = str(country_value).strip().upper()
+        if not upper:
+            return ''
+
+        icon = FLAG_EMOJI.get(upper)
+        if icon is not None:
+            return icon
+
+        icon = self._emoji_cache.get(upper)
+        if icon is None:
+            # Fall back to a partial match (e.g. "Republic of Korea" -> KOREA), once per value
+            icon = ''
+            for key, candidate in FLAG_EMOJI.items():
+                if upper in key or key in upper:
+                    icon = candidate
+                    break
+            self._emoji_cache[upper] = icon
+        return icon
+
+    def image(self, country_value):
+        """Return the flag image path (relative to output/) for a country ('' if none)"""
+        if not country_value:
+            return ''
+        country_clean = str(country_value).strip().upper()
+        if not country_clean:
+            return ''
+        return self.images.get(country_clean, '')
+
+
+_flag_index = None
+
+
+def get_flag_index():
+    """Return the process-wide FlagIndex, scanning flags/ on first use"""
+    global _flag_index
+    if _flag_index is None:
+        _flag_index = FlagIndex()
+    return _flag_index
@@ -4,112 +4,160 @@ Daily Schedule Summary Generator for AYG25
 Generates minimalistic daily schedule summaries from Google Sheets schedule data
 """
 
+import numpy as np
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-import json
-import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from jinja2 import Template
 
+from output_files import write_atomic
+from precompress import Precompressor
+from schedule_records import ScheduleIndex, build_schedule_records, group_records, partition_by_date
+from sheet_fetch import FETCH_MODES, fetch_rows
+from sheet_session import SCHEDULE_WORKSHEET, SheetSession
+from sheet_snapshot import SnapshotStore, load_or_fetch
+from stage_profiler import StageProfiler
+from template_env import get_template
+
 # Import config
 try:
     from config import (
         GOOGLE_SPREADSHEET_ID,
         GOOGLE_CREDENTIALS_FILE,
-        COLUMN_MAPPINGS
+        FETCH_MODE,
+        SNAPSHOT_TTL,
+        COLUMN_MAPPINGS,
+        PRECOMPRESS
     )
 except ImportError:
     GOOGLE_SPREADSHEET_ID = '1xzFo8qBtGGSqW9V9UyaPVGqT6w5UIypw9hIgV3JZmto'
     GOOGLE_CREDENTIALS_FILE = '../ayg-form-system/functions/google_credentials.json'
+    FETCH_MODE = 'full'
+    SNAPSHOT_TTL = 0
     COLUMN_MAPPINGS = {}
+    PRECOMPRESS = False
+
+# Columns the schedule pages use (COLUMN_MAPPINGS key, default header name)
+SCHEDULE_COLUMNS = {
+    'DATE_SGP': 'DATE (SGP)',
+    'TIME_START_SGP': 'TIME START (SGP) 24HR CLOCK',
+    'SPORT': 'SPORT',
+    'DISCIPLINE': 'DISCIPLINE',
+    'EVENT': 'EVENT',
+    'STAGE': 'STAGE / ROUND OF COMPETITION',
+    'ATHLETE_NAME': 'NAME OF ATHLETE (SGP)',
+}
+
+# Default --profile report location
+PROFILE_REPORT = Path(__file__).parent / 'output' / '.profile' / 'schedule_profile.json'
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+def schedule_column_names():
+    """Header names of SCHEDULE_COLUMNS, as mapped in COLUMN_MAPPINGS"""
+    return [COLUMN_MAPPINGS.get(key, default) for key, default in SCHEDULE_COLUMNS.items()]
+
+
+def date_filename(day):
+    """Output file of one day's page, e.g. schedule_2025_10_24.html"""
+    return f"schedule_{day.strftime('%Y_%m_%d')}.html"
+
+
+def window_filename(hours):
+    """Output file of a rolling window page, e.g. schedule_next_6h.html"""
+    return f"schedule_next_{hours:g}h.html"
+
+
 class DailyScheduleGenerator:
-    def __init__(self, spreadsheet_id=None, credentials_file=None):
+    def __init__(self, spreadsheet_id=None, credentials_file=None, fetch_mode=None,
+                 offline=False, refresh=False, snapshot_ttl=None, profiler=None, session=None):
         """
         Initialize the Daily Schedule Generator
         
+        The Google Sheets connection is opened on the first fetch, so runs served from
+        the sheet snapshot in output/.cache never authenticate.
+        
         Args:
             spreadsheet_id: Google Sheets spreadsheet ID (defaults to config)
             credentials_file: Path to Google credentials JSON file (defaults to config)
+            fetch_mode: 'columns', 'full' or 'incremental' (defaults to FETCH_MODE from config)
+            offline: Render from the sheet snapshot only, never connecting
+            refresh: Ignore the sheet snapshot and always fetch
+            snapshot_ttl: Seconds a sheet snapshot is reused (defaults to SNAPSHOT_TTL from config)
+            profiler: StageProfiler recording per-stage timings (disabled by default)
+            session: SheetSession shared with other generators; in 'columns' and 'full'
+                     fetch modes the schedule (its columns or every column) is read from
+                     its batched fetch
         """
-        self.spreadsheet_id = spreadsheet_id or GOOGLE_SPREADSHEET_ID
+        self.spreadsheet_id = spreadsheet_id or (session.spreadsheet_id if session else GOOGLE_SPREADSHEET_ID)
+        if session is not None and session.spreadsheet_id != self.spreadsheet_id:
+            raise ValueError(f"Session is for spreadsheet {session.spreadsheet_id}, not {self.spreadsheet_id}")
+        self.session = session
         self.credentials_file = credentials_file or GOOGLE_CREDENTIALS_FILE
+        self.fetch_mode = fetch_mode or FETCH_MODE
+        self.offline = offline
+        self.refresh = refresh
+        self.snapshot_ttl = SNAPSHOT_TTL if snapshot_ttl is None else snapshot_ttl
+        self.profiler = profiler or StageProfiler()
         self.gc = None
         self.worksheet = None
         self.output_dir = Path(__file__).parent / 'output'
         self.output_dir.mkdir(exist_ok=True)
-        self.setup_google_sheets()
+        if session is not None and self.fetch_mode != 'incremental':
+            # Fetched together with the other generators' worksheets on the first fetch
+            session.register(SCHEDULE_WORKSHEET, 8, self.session_columns())
         
     def setup_google_sheets(self):
-        """Setup Google Sheets connection"""
+        """Setup Google Sheets connection (through the shared session, if one was given)"""
         try:
-            scope = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            # Try to load credentials from environment variable first
-            creds = None
-            creds_json = os.environ.get('GOOGLE_CREDENTIALS_JSON')
-            if creds_json:
-                try:
-                    creds = Credentials.from_service_account_info(
-                        json.loads(creds_json),
-                        scopes=scope
-                    )
-                    logger.info("Loaded Google credentials from environment variable")
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON in GOOGLE_CREDENTIALS_JSON: {e}, trying file...")
-                    creds = None
-            
-            # If not from environment variable, try to load from file
-            if creds is None:
-                creds_path = (Path(__file__).parent / self.credentials_file).resolve()
-                if not creds_path.exists():
-                    creds_path = Path(self.credentials_file).resolve()
-                    if not creds_path.exists():
-                        creds_path = (Path(__file__).parent.parent / self.credentials_file).resolve()
-                        if not creds_path.exists():
-                            raise FileNotFoundError(
-                                f"Credentials file not found: {self.credentials_file}\n"
-                                f"Set GOOGLE_CREDENTIALS_JSON environment variable or place credentials file."
-                            )
-                
-                creds = Credentials.from_service_account_file(str(creds_path), scopes=scope)
-                logger.info(f"Loaded Google credentials from: {creds_path}")
-            
-            self.gc = gspread.authorize(creds)
-            spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
-            logger.info(f"Opened spreadsheet: {spreadsheet.title}")
-            
-            self.worksheet = spreadsheet.worksheet('AYG2025 Competition Schedule')
-            logger.info(f"Found worksheet: {self.worksheet.title}")
+            session = self.session or SheetSession(self.spreadsheet_id, self.credentials_file)
+            self.worksheet = session.worksheet(SCHEDULE_WORKSHEET)
+            self.gc = session.gc
             
         except Exception as e:
             logger.error(f"Failed to setup Google Sheets: {str(e)}")
             raise e
     
+    def session_columns(self):
+        """Columns to fetch through a shared session: the schedule ones, or None (all) in 'full' mode"""
+        return None if self.fetch_mode == 'full' else schedule_column_names()
+    
     def load_schedule_data(self):
         """Load schedule data from Google Sheets"""
         try:
-            all_values = self.worksheet.get_all_values()
+            # Headers are in row 8, data starts from row 9
+            column_names = schedule_column_names()
+            cache_dir = self.output_dir / '.cache'
+            store = SnapshotStore(cache_dir, 'schedule', {
+                'spreadsheet_id': self.spreadsheet_id,
+                'worksheet': SCHEDULE_WORKSHEET,
+                'header_row': 8,
+                'columns': column_names,
+                'fetch_mode': self.fetch_mode
+            })
             
-            if not all_values or len(all_values) < 8:
+            def fetch():
+                if self.session is not None and self.worksheet is None and self.fetch_mode != 'incremental':
+                    # Batched with all of the session's worksheets
+                    return self.session.fetch_rows(SCHEDULE_WORKSHEET, 8, self.session_columns())
+                if self.worksheet is None:
+                    self.setup_google_sheets()
+                return fetch_rows(self.worksheet, 8, column_names, mode=self.fetch_mode,
+                                  sync_dir=cache_dir)
+            
+            fetched = load_or_fetch(store, fetch, self.snapshot_ttl,
+                                    offline=self.offline, refresh=self.refresh)
+            
+            if fetched is None:
                 logger.warning("No data found or insufficient rows")
                 return pd.DataFrame()
             
-            # Headers are in row 8 (index 7)
-            headers = all_values[7]
-            
-            # Data starts from row 9 (index 8)
-            data_rows = all_values[8:]
+            headers, data_rows = fetched
             
             # Create DataFrame
             df = pd.DataFrame(data_rows, columns=headers)
@@ -124,112 +172,30 @@ class DailyScheduleGenerator:
             raise e
     
     def format_schedule_data(self, df):
-        """Format and filter schedule data"""
-        if df.empty:
-            return []
-        
-        date_col = COLUMN_MAPPINGS.get('DATE_SGP', 'DATE (SGP)')
-        time_col = COLUMN_MAPPINGS.get('TIME_START_SGP', 'TIME START (SGP) 24HR CLOCK')
-        sport_col = COLUMN_MAPPINGS.get('SPORT', 'SPORT')
-        discipline_col = COLUMN_MAPPINGS.get('DISCIPLINE', 'DISCIPLINE')
-        event_col = COLUMN_MAPPINGS.get('EVENT', 'EVENT')
-        stage_col = COLUMN_MAPPINGS.get('STAGE', 'STAGE / ROUND OF COMPETITION')
-        athlete_col = COLUMN_MAPPINGS.get('ATHLETE_NAME', 'NAME OF ATHLETE (SGP)')
-        
-        schedule_items = []
-        
-        for _, row in df.iterrows():
-            # Get date and time
-            date_str = str(row.get(date_col, '')).strip()
-            time_str = str(row.get(time_col, '')).strip()
-            
-            if not date_str or date_str.lower() in ('na', 'n/a', 'none', ''):
-                continue
-            
-            # Parse date
-            try:
-                event_date = pd.to_datetime(date_str, errors='coerce')
-                if pd.isna(event_date):
-                    continue
-            except:
-                continue
-            
-            # Get sport and discipline
-            sport = str(row.get(sport_col, '')).strip()
-            discipline = str(row.get(discipline_col, '')).strip()
-            
-            if not sport:
-                continue
-            
-            # Format sport header (sport - discipline if different, else just sport)
-            if discipline and discipline.upper() != sport.upper():
-                sport_header = f"{sport} - {discipline}"
-            else:
-                sport_header = sport
-            
-            # Get event and stage
-            event = str(row.get(event_col, '')).strip()
-            stage = str(row.get(stage_col, '')).strip()
-            
-            # Get athlete name
-            athlete = str(row.get(athlete_col, '')).strip()
-            
-            schedule_items.append({
-                'date': event_date,
-                'date_str': date_str,
-                'time': time_str,
-                'sport': sport,
-                'discipline': discipline,
-                'sport_header': sport_header,
-                'event': event if event and event.lower() not in ('na', 'n/a', 'none', '') else None,
-                'stage': stage if stage and stage.lower() not in ('na', 'n/a', 'none', '') else None,
-                'athlete': athlete if athlete and athlete.lower() not in ('na', 'n/a', 'none', '') else None
-            })
+        """
+        Format and filter schedule data
         
-        return schedule_items
+        Returns:
+            numpy record array of schedule items (see schedule_records.RECORD_DTYPE)
+        """
+        return build_schedule_records(df)
     
-    def filter_by_time_window(self, schedule_items, hours_ahead=24):
-        """Filter schedule items to show events within the next N hours"""
-        now = datetime.now()
-        cutoff_time = now + timedelta(hours=hours_ahead)
-        
-        filtered = []
-        for item in schedule_items:
-            event_datetime = item['date']
-            
-            # If we have a time, try to parse it
-            if item['time']:
-                try:
-                    # Try to parse time (format: HH:MM or HH:MM:SS)
-                    time_parts = item['time'].split(':')
-                    if len(time_parts) >= 2:
-                        hour = int(time_parts[0])
-                        minute = int(time_parts[1])
-                        event_datetime = event_datetime.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                except:
-                    pass
-            
-            # Include if event is in the future and within the time window
-            if event_datetime >= now and event_datetime <= cutoff_time:
-                filtered.append(item)
+    def filter_by_time_window(self, schedule_items, hours_ahead=24, now=None):
+        """
+        Filter schedule items to show events within the next N hours
         
-        return filtered
+        Args:
+            schedule_items: Record array, or a ScheduleIndex when querying several windows
+            hours_ahead: Number of hours ahead to show
+            now: Window start (defaults to the current time)
+        """
+        if not isinstance(schedule_items, ScheduleIndex):
+            schedule_items = ScheduleIndex(schedule_items)
+        return schedule_items.next_hours(hours_ahead, now)
     
     def group_by_sport(self, schedule_items):
-        """Group schedule items by sport"""
-        grouped = {}
-        
-        for item in schedule_items:
-            sport_header = item['sport_header']
-            if sport_header not in grouped:
-                grouped[sport_header] = []
-            grouped[sport_header].append(item)
-        
-        # Sort items within each sport by date/time
-        for sport in grouped:
-            grouped[sport].sort(key=lambda x: (x['date'], x['time'] or ''))
-        
-        return grouped
+        """Group schedule items by sport, sorted by date/time within each sport"""
+        return group_records(schedule_items, 'sport_header')
     
     def chunk_sports_into_slides(self, sports, grouped_items, max_sports_per_slide=9):
         """Split sports into multiple slides to fit on screen (3x3 grid = 9 sports per slide)"""
@@ -254,50 +220,83 @@ class DailyScheduleGenerator:
         
         return slides
     
-    def generate_html(self, target_date=None, hours_ahead=24):
+    def load_schedule_items(self):
+        """Load the schedule sheet and format it into a record array"""
+        with self.profiler.stage('fetch') as stage:
+            df = self.load_schedule_data()
+            stage['rows'] = len(df)
+        
+        with self.profiler.stage('format') as stage:
+            schedule_items = self.format_schedule_data(df)
+            stage['rows'] = len(schedule_items)
+        
+        return schedule_items
+    
+    def render_items(self, schedule_items, formatted_date):
         """
-        Generate HTML for daily schedule summary
+        Render already filtered schedule items
         
         Args:
-            target_date: Specific date to show (YYYY-MM-DD), or None for next 24 hours
-            hours_ahead: Number of hours ahead to show (default 24)
+            schedule_items: Record array of the items to show
+            formatted_date: Date shown in the page title
         
         Returns:
             HTML string
         """
-        df = self.load_schedule_data()
-        schedule_items = self.format_schedule_data(df)
+        with self.profiler.stage('group', rows=len(schedule_items)):
+            # Group by sport
+            grouped_by_sport = self.group_by_sport(schedule_items)
+            
+            # Sort sports alphabetically
+            sorted_sports = sorted(grouped_by_sport.keys())
+            
+            # Chunk sports into slides
+            slides = self.chunk_sports_into_slides(sorted_sports, grouped_by_sport, max_sports_per_slide=12)
         
-        # Filter by time window
-        if target_date:
-            # Filter to specific date
-            try:
-                target = pd.to_datetime(target_date)
-                schedule_items = [item for item in schedule_items if item['date'].date() == target.date()]
-            except:
-                logger.warning(f"Invalid target_date: {target_date}")
-        else:
-            # Filter to next N hours
-            schedule_items = self.filter_by_time_window(schedule_items, hours_ahead)
+        # Load template
+        html_template = get_template('schedule_template.html', fallback=self.get_default_template)
         
-        # Group by sport
-        grouped_by_sport = self.group_by_sport(schedule_items)
+        with self.profiler.stage('render', rows=len(schedule_items)):
+            html_content = html_template.render(
+                date=formatted_date,
+                sports=sorted_sports,
+                grouped_items=grouped_by_sport,
+                slides=slides,
+                generation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            )
         
-        # Sort sports alphabetically
-        sorted_sports = sorted(grouped_by_sport.keys())
+        return html_content
+    
+    def generate_html(self, target_date=None, hours_ahead=24, schedule_items=None):
+        """
+        Generate HTML for daily schedule summary
         
-        # Chunk sports into slides
-        slides = self.chunk_sports_into_slides(sorted_sports, grouped_by_sport, max_sports_per_slide=12)
+        Args:
+            target_date: Specific date to show (YYYY-MM-DD), or None for next 24 hours
+            hours_ahead: Number of hours ahead to show (default 24)
+            schedule_items: Already loaded record array or ScheduleIndex (loaded from the sheet if None)
         
-        # Load template
-        template_path = Path(__file__).parent / 'templates' / 'schedule_template.html'
+        Returns:
+            HTML string
+        """
+        if schedule_items is None:
+            schedule_items = self.load_schedule_items()
         
-        if template_path.exists():
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-                html_template = Template(template_content)
-        else:
-            html_template = self.get_default_template()
+        # Filter by time window
+        with self.profiler.stage('filter') as stage:
+            if target_date:
+                if isinstance(schedule_items, ScheduleIndex):
+                    schedule_items = schedule_items.records
+                # Filter to specific date
+                try:
+                    target = np.datetime64(pd.to_datetime(target_date).date())
+                    schedule_items = schedule_items[schedule_items.date.astype('datetime64[D]') == target]
+                except:
+                    logger.warning(f"Invalid target_date: {target_date}")
+            else:
+                # Filter to next N hours
+                schedule_items = self.filter_by_time_window(schedule_items, hours_ahead)
+            stage['rows'] = len(schedule_items)
         
         # Format date for title
         if target_date:
@@ -309,38 +308,146 @@ class DailyScheduleGenerator:
         else:
             formatted_date = datetime.now().strftime('%d %B %Y')
         
-        html_content = html_template.render(
-            date=formatted_date,
-            sports=sorted_sports,
-            grouped_items=grouped_by_sport,
-            slides=slides,
-            generation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        )
+        return self.render_items(schedule_items, formatted_date)
+    
+    def generate_windows(self, hours_list, now=None):
+        """
+        Generate one page per rolling window from a single sheet load
         
-        return html_content
+        The start times are indexed once; each window is then a binary search, and all
+        windows share the same start time.
+        
+        Args:
+            hours_list: Window lengths in hours, e.g. [3, 6, 24]
+            now: Window start (defaults to the current time)
+        
+        Returns:
+            List of (hours, HTML string)
+        """
+        schedule_items = self.load_schedule_items()
+        now = now or datetime.now()
+        
+        with self.profiler.stage('index', rows=len(schedule_items)):
+            index = ScheduleIndex(schedule_items)
+        
+        pages = []
+        for hours in hours_list:
+            with self.profiler.stage('filter') as stage:
+                window_items = self.filter_by_time_window(index, hours, now)
+                stage['rows'] = len(window_items)
+            pages.append((hours, self.render_items(window_items, now.strftime('%d %B %Y'))))
+        return pages
     
-    def generate_all(self, target_date=None, hours_ahead=24):
-        """Generate HTML file for schedule summary"""
+    def generate_all(self, target_date=None, hours_ahead=24, precompress=None):
+        """
+        Generate HTML file for schedule summary
+        
+        Args:
+            target_date: Date to show (YYYY-MM-DD), or None for the next hours_ahead hours
+            hours_ahead: Hours ahead to show when no date is given; a list of several
+                         values writes one schedule_next_<N>h.html page per window
+            precompress: Also write .gz/.br siblings of the page (defaults to PRECOMPRESS from config)
+        
+        Returns:
+            Path of the generated file, or a list of paths for several windows
+        """
+        if precompress is None:
+            precompress = PRECOMPRESS
+        hours_list = list(hours_ahead) if isinstance(hours_ahead, (list, tuple)) else [hours_ahead]
         try:
-            html_content = self.generate_html(target_date, hours_ahead)
-            
-            # Generate filename
-            if target_date:
-                filename = f"schedule_{target_date.replace('-', '_')}.html"
+            if target_date or len(hours_list) == 1:
+                html_content = self.generate_html(target_date, hours_list[0])
+                
+                # Generate filename
+                if target_date:
+                    filename = f"schedule_{target_date.replace('-', '_')}.html"
+                else:
+                    filename = f"schedule_{datetime.now().strftime('%Y_%m_%d')}.html"
+                pages = [(filename, html_content)]
             else:
-                filename = f"schedule_{datetime.now().strftime('%Y_%m_%d')}.html"
+                pages = [(window_filename(hours), html_content)
+                         for hours, html_content in self.generate_windows(hours_list)]
             
-            output_file = self.output_dir / filename
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            output_files = []
+            with self.profiler.stage('write'):
+                for filename, html_content in pages:
+                    output_file = self.output_dir / filename
+                    write_atomic(output_file, html_content)
+                    output_files.append(output_file)
             
-            logger.info(f"Generated schedule summary: {output_file}")
-            return output_file
+            if precompress:
+                with self.profiler.stage('precompress'):
+                    Precompressor(self.output_dir, workers=1).run(output_files)
+            
+            for output_file in output_files:
+                logger.info(f"Generated schedule summary: {output_file}")
+            return output_files[0] if len(output_files) == 1 else output_files
             
         except Exception as e:
             logger.error(f"Error generating schedule: {str(e)}")
             raise e
     
+    def generate_dates(self, date_range=None, workers=1, precompress=None):
+        """
+        Generate one page per day from a single sheet load
+        
+        Args:
+            date_range: (start, end) dates (YYYY-MM-DD, inclusive) - every day in the range
+                        gets a page, empty days included; None for every date in the sheet
+            workers: Number of worker processes rendering and precompressing pages (1 runs sequentially)
+            precompress: Also write .gz/.br siblings of the pages (defaults to PRECOMPRESS from config)
+        
+        Returns:
+            List of generated files, in date order
+        """
+        if precompress is None:
+            precompress = PRECOMPRESS
+        try:
+            schedule_items = self.load_schedule_items()
+            
+            # Partition by date
+            with self.profiler.stage('filter', rows=len(schedule_items)):
+                by_date = partition_by_date(schedule_items)
+                if date_range:
+                    start, end = (pd.to_datetime(value).date() for value in date_range)
+                    if end < start:
+                        raise ValueError(f"Date range ends before it starts: {date_range[0]} - {date_range[1]}")
+                    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+                    empty = schedule_items[:0]
+                    by_date = {day: by_date.get(day, empty) for day in days}
+            
+            jobs = [
+                (items, day.strftime('%d %B %Y'), self.output_dir / date_filename(day))
+                for day, items in by_date.items()
+            ]
+            
+            if workers and workers > 1 and len(jobs) > 1:
+                logger.info(f"Rendering {len(jobs)} days with {workers} worker processes")
+                # Workers render and write each page, so the two are timed together
+                with self.profiler.stage('render_write_parallel', rows=len(schedule_items)), \
+                        ProcessPoolExecutor(max_workers=workers) as executor:
+                    output_files = list(executor.map(_render_day_worker, *zip(*jobs)))
+            else:
+                output_files = []
+                for items, formatted_date, output_file in jobs:
+                    html_content = self.render_items(items, formatted_date)
+                    with self.profiler.stage('write'):
+                        write_atomic(output_file, html_content)
+                    output_files.append(output_file)
+            
+            if precompress and output_files:
+                with self.profiler.stage('precompress'):
+                    Precompressor(self.output_dir, workers=workers or 1).run(output_files)
+            
+            for (items, _, _), output_file in zip(jobs, output_files):
+                logger.info(f"Generated schedule summary: {output_file} ({len(items)} events)")
+            logger.info(f"Generated {len(output_files)} daily schedule page(s) from one sheet load")
+            return output_files
+            
+        except Exception as e:
+            logger.error(f"Error generating schedules: {str(e)}")
+            raise e
+    
     def get_default_template(self):
         """Return default HTML template as string"""
         return Template("""
@@ -366,28 +473,76 @@ class DailyScheduleGenerator:
         """)
 
 
+def _render_day_worker(schedule_items, formatted_date, output_file):
+    """Render and write one day's page in a worker process (module-level so it can be pickled)"""
+    generator = DailyScheduleGenerator()
+    write_atomic(output_file, generator.render_items(schedule_items, formatted_date))
+    return output_file
+
+
 def main():
     """Main function"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Generate daily schedule summaries from Google Sheets')
-    parser.add_argument('--date', type=str, default=None,
+    dates = parser.add_mutually_exclusive_group()
+    dates.add_argument('--date', type=str, default=None,
                        help='Specific date to show (YYYY-MM-DD). If not specified, shows next 24 hours.')
-    parser.add_argument('--hours', type=int, default=24,
-                       help='Number of hours ahead to show (default: 24)')
+    dates.add_argument('--all-dates', action='store_true',
+                       help='Write one schedule_YYYY_MM_DD.html page for every date in the sheet, from one load')
+    dates.add_argument('--date-range', nargs=2, metavar=('START', 'END'), default=None,
+                       help='Write one page for every day from START to END (YYYY-MM-DD, inclusive), '
+                            'from one load')
+    parser.add_argument('--hours', type=int, nargs='+', default=[24],
+                       help='Number of hours ahead to show (default: 24). Several values (e.g. 3 6 24) '
+                            'render one schedule_next_<N>h.html page per window from a single load.')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='With --all-dates/--date-range, number of worker processes rendering pages '
+                            '(default: 1, sequential)')
     parser.add_argument('--spreadsheet-id', type=str, default=None,
                        help='Google Sheets spreadsheet ID (defaults to config.py)')
     parser.add_argument('--credentials', type=str, default=None,
                        help='Path to Google credentials JSON file (defaults to config.py)')
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default=None,
+                       help="'columns' fetches only the schedule columns, 'full' fetches the whole sheet, "
+                            "'incremental' fetches only appended/changed rows into a local snapshot "
+                            "(defaults to FETCH_MODE in config.py)")
+    parser.add_argument('--precompress', action='store_true', default=None,
+                       help='Also write .gz/.br siblings of the page for static hosts '
+                            '(defaults to PRECOMPRESS in config.py)')
+    parser.add_argument('--offline', action='store_true',
+                       help='Render from the cached sheet snapshot only, without connecting to Google Sheets')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Ignore the cached sheet snapshot and fetch the sheet')
+    parser.add_argument('--snapshot-ttl', type=int, default=None,
+                       help='Seconds a cached sheet snapshot is reused (defaults to SNAPSHOT_TTL in config.py)')
+    parser.add_argument('--profile', nargs='?', const=str(PROFILE_REPORT), default=None, metavar='REPORT',
+                       help='Record wall/CPU time, rows and peak memory per stage and write a JSON report '
+                            f'(default: {PROFILE_REPORT.relative_to(Path(__file__).parent)})')
+    parser.add_argument('--cprofile', action='store_true',
+                       help='With --profile, also dump cProfile stats for the slowest stage next to the report')
     
     args = parser.parse_args()
+    profiler = StageProfiler(enabled=args.profile is not None, cprofile=args.cprofile)
     
     try:
         generator = DailyScheduleGenerator(
             spreadsheet_id=args.spreadsheet_id,
-            credentials_file=args.credentials
+            credentials_file=args.credentials,
+            fetch_mode=args.fetch_mode,
+            offline=args.offline,
+            refresh=args.refresh,
+            snapshot_ttl=args.snapshot_ttl,
+            profiler=profiler
         )
-        generator.generate_all(target_date=args.date, hours_ahead=args.hours)
+        if args.all_dates or args.date_range:
+            generator.generate_dates(date_range=args.date_range, workers=args.workers,
+                                     precompress=args.precompress)
+        else:
+            hours_ahead = args.hours[0] if len(args.hours) == 1 else args.hours
+            generator.generate_all(target_date=args.date, hours_ahead=hours_ahead, precompress=args.precompress)
+        if profiler.enabled:
+            profiler.write_report(args.profile, command='generate_daily_schedule')
     except Exception as e:
         logger.error(f"Failed to generate schedule: {str(e)}")
         return 1
@@ -4,16 +4,32 @@ Highlights Generator for AYG25 Competition Results
 Generates HTML highlights pages from Google Sheets data, grouped by sport
 """
 
-import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-import json
-import os
 import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from jinja2 import Template
 
+from template_env import get_template
+from highlight_dates import (
+    GROUPINGS, date_group_keys, date_sport_group_keys, format_date_title, group_positions, normalize_date_key,
+    sport_group_keys
+)
+from highlight_feeds import FeedWriter
+from highlight_pipeline import FusedHighlightsPipeline
+from highlight_records import ColumnIndex, build_highlight, build_highlights_text, clean_cell, format_timing
+from flags import get_flag_index
+from output_files import write_atomic
+from precompress import Precompressor
+from medal_tally import MEDAL_ICONS, MEDAL_KINDS, MedalTally, count_medals
+from render_manifest import RenderManifest, combine_digests, hash_file, hash_highlights
+from sheet_fetch import FETCH_MODES, fetch_rows
+from sheet_session import SheetSession
+from sheet_snapshot import SnapshotStore, load_or_fetch
+from stage_profiler import StageProfiler
+from static_assets import AssetPublisher, prune_assets, rewrite_asset_chunks
+
 # Import config
 try:
     from config import (
@@ -21,24 +37,48 @@ try:
         GOOGLE_SHEET_NAME,
         GOOGLE_CREDENTIALS_FILE,
         DATA_START_ROW,
+        FETCH_MODE,
+        SNAPSHOT_TTL,
         COLUMN_MAPPINGS,
-        GROUP_BY_DATE
+        GROUP_BY_DATE,
+        MEDAL_TALLY,
+        PUBLISH_ASSETS,
+        JSON_FEEDS,
+        PRECOMPRESS
     )
 except ImportError:
     # Fallback if config.py doesn't exist
     GOOGLE_SPREADSHEET_ID = '1xzFo8qBtGGSqW9V9UyaPVGqT6w5UIypw9hIgV3JZmto'
     GOOGLE_SHEET_NAME = 'Data Collection'
-    GOOGLE_CREDENTIALS_FILE = 'google_credentials.json'
+    GOOGLE_CREDENTIALS_FILE = '../ayg-form-system/functions/google_credentials.json'
     DATA_START_ROW = 8
+    FETCH_MODE = 'full'
+    SNAPSHOT_TTL = 0
     COLUMN_MAPPINGS = {}
     GROUP_BY_DATE = False
+    MEDAL_TALLY = False
+    PUBLISH_ASSETS = False
+    JSON_FEEDS = False
+    PRECOMPRESS = False
+
+# Content hashes of generated pages, used to skip unchanged groups
+MANIFEST_FILENAME = '.highlights_manifest.json'
+
+# Cumulative medal tally state and standings page (--tally)
+MEDAL_TALLY_FILENAME = 'medal_tally.json'
+STANDINGS_FILENAME = 'medal_standings.html'
+
+# Default --profile report location
+PROFILE_REPORT = Path(__file__).parent / 'output' / '.profile' / 'highlights_profile.json'
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class HighlightsGenerator:
-    def __init__(self, spreadsheet_id=None, sheet_name=None, credentials_file=None):
+    def __init__(self, spreadsheet_id=None, sheet_name=None, credentials_file=None, connect=True,
+                 fetch_mode=None, offline=False, refresh=False, snapshot_ttl=None, profiler=None,
+                 session=None):
         """
         Initialize the Highlights Generator
         
@@ -46,71 +86,95 @@ class HighlightsGenerator:
             spreadsheet_id: Google Sheets spreadsheet ID (defaults to config)
             sheet_name: Name of the worksheet to read from (defaults to config)
             credentials_file: Path to Google credentials JSON file (defaults to config)
+            connect: Connect to Google Sheets when data has to be fetched (False for
+                     render-only use, e.g. worker processes)
+            fetch_mode: 'columns', 'full' or 'incremental' (defaults to FETCH_MODE from config)
+            offline: Render from the sheet snapshot in output/.cache only, never connecting
+            refresh: Ignore the sheet snapshot and always fetch
+            snapshot_ttl: Seconds a sheet snapshot is reused (defaults to SNAPSHOT_TTL from config)
+            profiler: StageProfiler recording per-stage timings (disabled by default)
+            session: SheetSession shared with other generators; in 'columns' and 'full'
+                     fetch modes the worksheet (mapped columns or every column) is read from
+                     its batched fetch
         """
-        self.spreadsheet_id = spreadsheet_id or GOOGLE_SPREADSHEET_ID
+        self.spreadsheet_id = spreadsheet_id or (session.spreadsheet_id if session else GOOGLE_SPREADSHEET_ID)
+        if session is not None and session.spreadsheet_id != self.spreadsheet_id:
+            raise ValueError(f"Session is for spreadsheet {session.spreadsheet_id}, not {self.spreadsheet_id}")
+        self.session = session
         self.sheet_name = sheet_name or GOOGLE_SHEET_NAME
         self.credentials_file = credentials_file or GOOGLE_CREDENTIALS_FILE
+        self.fetch_mode = fetch_mode or FETCH_MODE
+        self.connect = connect and not offline
+        self.offline = offline
+        self.refresh = refresh
+        self.snapshot_ttl = SNAPSHOT_TTL if snapshot_ttl is None else snapshot_ttl
+        self.profiler = profiler or StageProfiler()
         self.gc = None
         self.worksheet = None
+        self.pipeline_stats = {}
+        if session is not None and self.fetch_mode != 'incremental':
+            # Fetched together with the other generators' worksheets on the first fetch
+            session.register(self.sheet_name, DATA_START_ROW, self.session_columns())
         self.output_dir = Path(__file__).parent / 'output'
         self.output_dir.mkdir(exist_ok=True)
-        self.setup_google_sheets()
         
     def setup_google_sheets(self):
-        """Setup Google Sheets connection"""
+        """Setup Google Sheets connection (through the shared session, if one was given)"""
         try:
-            scope = [
-                'https://www.googleapis.com/auth/spreadsheets',
-                'https://www.googleapis.com/auth/drive'
-            ]
-            
-            # Try to load credentials from environment variable first (like other parts of the system)
-            creds = None
-            creds_json = os.environ.get('GOOGLE_CREDENTIALS_JSON')
-            if creds_json:
-                try:
-                    creds = Credentials.from_service_account_info(
-                        json.loads(creds_json),
-                        scopes=scope
-                    )
-                    logger.info("Loaded Google credentials from environment variable")
-                except json.JSONDecodeError as e:
-                    logger.warning(f"Invalid JSON in GOOGLE_CREDENTIALS_JSON: {e}, trying file...")
-                    creds = None
-            
-            # If not from environment variable, try to load from file
-            if creds is None:
-                # Try as relative path from highlights directory first
-                creds_path = (Path(__file__).parent / self.credentials_file).resolve()
-                if not creds_path.exists():
-                    # Try as absolute path (if provided as absolute)
-                    creds_path = Path(self.credentials_file).resolve()
-                    if not creds_path.exists():
-                        # Try from project root (parent of highlights directory)
-                        creds_path = (Path(__file__).parent.parent / self.credentials_file).resolve()
-                        if not creds_path.exists():
-                            raise FileNotFoundError(
-                                f"Credentials file not found: {self.credentials_file}\n"
-                                f"Tried: {(Path(__file__).parent / self.credentials_file).resolve()}\n"
-                                f"Tried: {Path(self.credentials_file).resolve()}\n"
-                                f"Tried: {(Path(__file__).parent.parent / self.credentials_file).resolve()}\n"
-                                f"Set GOOGLE_CREDENTIALS_JSON environment variable or place credentials file."
-                            )
-                
-                creds = Credentials.from_service_account_file(str(creds_path), scopes=scope)
-                logger.info(f"Loaded Google credentials from: {creds_path}")
-            
-            self.gc = gspread.authorize(creds)
-            spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
-            logger.info(f"Opened spreadsheet: {spreadsheet.title}")
-            
-            self.worksheet = spreadsheet.worksheet(self.sheet_name)
-            logger.info(f"Found worksheet: {self.sheet_name}")
+            session = self.session or SheetSession(self.spreadsheet_id, self.credentials_file)
+            self.worksheet = session.worksheet(self.sheet_name)
+            self.gc = session.gc
             
         except Exception as e:
             logger.error(f"Error setting up Google Sheets: {str(e)}")
             raise e
     
+    def session_columns(self):
+        """Columns to fetch through a shared session: the mapped ones, or None (all) in 'full' mode"""
+        return None if self.fetch_mode == 'full' else list(COLUMN_MAPPINGS.values())
+    
+    def fetch_rows(self, start_row):
+        """
+        Fetch the header row and data rows of the results worksheet
+        
+        A snapshot in output/.cache younger than the snapshot TTL is used instead of
+        fetching (always in offline mode, never with refresh); the Google Sheets
+        connection is only opened when a fetch is needed.
+        
+        In 'columns' fetch mode only the columns named in COLUMN_MAPPINGS are downloaded
+        (see sheet_fetch.py); in 'full' mode the whole sheet is read with get_all_values();
+        in 'incremental' mode only appended/changed rows are fetched and merged into a
+        snapshot in output/.cache (see sheet_sync.py).
+        
+        Args:
+            start_row: Row number where headers are
+        
+        Returns:
+            Tuple of (headers, data rows), or None if the sheet has fewer than start_row rows
+        """
+        cache_dir = self.output_dir / '.cache'
+        column_names = list(COLUMN_MAPPINGS.values())
+        store = SnapshotStore(cache_dir, 'highlights', {
+            'spreadsheet_id': self.spreadsheet_id,
+            'worksheet': self.sheet_name,
+            'header_row': start_row,
+            'columns': column_names,
+            'fetch_mode': self.fetch_mode
+        })
+        
+        def fetch():
+            if self.worksheet is None and not self.connect:
+                raise RuntimeError("Google Sheets connection disabled, cannot fetch data")
+            if self.session is not None and self.worksheet is None and self.fetch_mode != 'incremental':
+                # Batched with all of the session's worksheets
+                return self.session.fetch_rows(self.sheet_name, start_row, self.session_columns())
+            if self.worksheet is None:
+                self.setup_google_sheets()
+            return fetch_rows(self.worksheet, start_row, column_names, mode=self.fetch_mode,
+                              sync_dir=cache_dir)
+        
+        return load_or_fetch(store, fetch, self.snapshot_ttl, offline=self.offline, refresh=self.refresh)
+    
     def load_data(self, start_row=None):
         """
         Load data from Google Sheets starting from specified row
@@ -121,92 +185,48 @@ class HighlightsGenerator:
         Returns:
             DataFrame with the data
         """
+        # pandas is only needed for the DataFrame stages; the fused pipeline and
+        # snapshot renders (render_snapshot.py) never import it
+        import pandas as pd
+        from highlight_filters import build_eligibility_masks
+        
         try:
             if start_row is None:
                 start_row = DATA_START_ROW
             
-            # Get all values starting from specified row (where headers are)
-            all_values = self.worksheet.get_all_values()
+            # Get the header row (row 8) and the data rows below it
+            with self.profiler.stage('fetch') as stage:
+                fetched = self.fetch_rows(start_row)
+                stage['rows'] = len(fetched[1]) if fetched else 0
             
-            if len(all_values) < start_row:
+            if fetched is None:
                 logger.warning(f"Sheet has fewer than {start_row} rows")
                 return pd.DataFrame()
             
-            # Row 8 (index 7) contains headers
-            headers = all_values[start_row - 1]
-            
-            # Get data rows (starting from row 9, index 8)
-            data_rows = all_values[start_row:]
-            
-            # Create DataFrame
-            df = pd.DataFrame(data_rows, columns=headers)
+            headers, data_rows = fetched
             
-            # Clean up column names (remove extra spaces, handle special characters)
-            df.columns = df.columns.str.strip()
-            
-            logger.info(f"Total rows loaded: {len(df)}")
-            logger.info(f"Total columns: {len(df.columns)}")
-            logger.info(f"Column names: {list(df.columns)[:10]}...")  # Show first 10 columns
-            
-            # Check for required columns and filter rows that have enough data to generate highlights
-            # Get column mappings
-            sport_col = COLUMN_MAPPINGS.get('SPORT', 'SPORT')
-            event_col = COLUMN_MAPPINGS.get('EVENT', 'EVENT')
-            stage_col = COLUMN_MAPPINGS.get('STAGE', 'STAGE / ROUND OF COMPETITION')
-            athlete_col = COLUMN_MAPPINGS.get('ATHLETE_NAME', 'NAME OF ATHLETE (SGP)')
-            competitor_name_col = COLUMN_MAPPINGS.get('COMPETITOR_NAME', 'NAME OF ATHLETE (COMPETITOR)')
-            competitor_country_col = COLUMN_MAPPINGS.get('COMPETITOR_COUNTRY', 'COUNTRY NAME (COMPETITOR)')
-            score_sgp_col = COLUMN_MAPPINGS.get('SCORE_SGP', 'SCORE/DISTANCE/HEIGHT\n(SGP)')
-            score_competitor_col = COLUMN_MAPPINGS.get('SCORE_COMPETITOR', 'SCORE (COMPETITOR)')
-            timing_sgp_col = COLUMN_MAPPINGS.get('TIMING_SGP', 'TIMING (SGP)\nhh:mm:ss.ms')
-            
-            # Check which columns exist
-            available_cols = set(df.columns)
-            
-            # Filter rows that have enough data to generate highlights
-            before_count = len(df)
-            valid_rows = []
-            
-            def has_value(col, row):
-                """Check if column exists and has a non-empty value"""
-                if col not in available_cols:
-                    return False
-                val = row.get(col)
-                return pd.notna(val) and str(val).strip() != ''
-            
-            for idx, row in df.iterrows():
-                # Check if it's H2H (has competitor name and country)
-                has_competitor_name = has_value(competitor_name_col, row)
-                has_competitor_country = has_value(competitor_country_col, row)
-                is_h2h = has_competitor_name and has_competitor_country
+            with self.profiler.stage('filter') as stage:
+                # Create DataFrame
+                df = pd.DataFrame(data_rows, columns=headers)
                 
-                if is_h2h:
-                    # H2H sport requirements:
-                    # - SPORT, EVENT, STAGE, ATHLETE(SGP), COMPETITOR_NAME, COMPETITOR_COUNTRY
-                    # - At least one of: SCORE(SGP) or SCORE(COMPETITOR)
-                    has_basic = (has_value(sport_col, row) and 
-                                has_value(event_col, row) and 
-                                has_value(stage_col, row) and 
-                                has_value(athlete_col, row))
-                    has_score = has_value(score_sgp_col, row) or has_value(score_competitor_col, row)
-                    
-                    if has_basic and has_score:
-                        valid_rows.append(idx)
-                else:
-                    # Non-H2H sport requirements:
-                    # - SPORT, EVENT, STAGE, ATHLETE(SGP)
-                    # - At least one of: TIMING(SGP) or SCORE(SGP)
-                    has_basic = (has_value(sport_col, row) and 
-                                has_value(event_col, row) and 
-                                has_value(stage_col, row) and 
-                                has_value(athlete_col, row))
-                    has_result = has_value(timing_sgp_col, row) or has_value(score_sgp_col, row)
-                    
-                    if has_basic and has_result:
-                        valid_rows.append(idx)
-            
-            df = df.loc[valid_rows].copy()
-            after_count = len(df)
+                # Clean up column names (remove extra spaces, handle special characters)
+                df.columns = df.columns.str.strip()
+                
+                logger.info(f"Total rows loaded: {len(df)}")
+                logger.info(f"Total columns: {len(df.columns)}")
+                logger.info(f"Column names: {list(df.columns)[:10]}...")  # Show first 10 columns
+                
+                # Filter rows that have enough data to generate highlights.
+                # Masks are built once per column (see highlight_filters.py) rather than per row.
+                before_count = len(df)
+                masks = build_eligibility_masks(df)
+                
+                logger.info(f"Eligible H2H rows: {int(masks['h2h'].sum())}, "
+                            f"non-H2H rows: {int(masks['non_h2h'].sum())}")
+                
+                df = df.loc[masks['eligible']].copy()
+                after_count = len(df)
+                stage['rows'] = after_count
             
             logger.info(f"Rows before filtering: {before_count}")
             logger.info(f"Rows after filtering (with enough data for highlights): {after_count}")
@@ -232,6 +252,8 @@ class HighlightsGenerator:
         Returns:
             'h2h' or 'non-h2h'
         """
+        import pandas as pd
+        
         # Check if there's competitor information using actual column names
         competitor_cols = [
             COLUMN_MAPPINGS.get('COMPETITOR_NAME', 'NAME OF ATHLETE (COMPETITOR)'),
@@ -257,26 +279,7 @@ class HighlightsGenerator:
         Returns:
             Formatted timing string with "00:", "0:", and ":00:" removed
         """
-        if not timing_str or pd.isna(timing_str):
-            return ''
-        
-        timing_str = str(timing_str).strip()
-        if not timing_str:
-            return ''
-        
-        result = timing_str
-        
-        # Remove "00:" from the start if present
-        if result.startswith('00:'):
-            result = result[3:]  # Remove "00:" (3 characters)
-        # Remove "0:" from the start if present (after checking for "00:")
-        elif result.startswith('0:'):
-            result = result[2:]  # Remove "0:" (2 characters)
-        
-        # Remove ":00:" if present (zero minutes)
-        result = result.replace(':00:', ':')
-        
-        return result
+        return format_timing(timing_str)
     
     def format_highlight_data(self, row):
         """
@@ -286,50 +289,9 @@ class HighlightsGenerator:
             row: DataFrame row
         
         Returns:
-            Dictionary with formatted highlight data
+            Highlight record (supports dictionary-style .get() access)
         """
-        # Use column mappings to get actual column names
-        def get_col(key):
-            col_name = COLUMN_MAPPINGS.get(key, key)
-            return row.get(col_name, '')
-        
-        timing_raw = get_col('TIMING_SGP')
-        
-        highlight = {
-            'sport': get_col('SPORT'),
-            'discipline': get_col('DISCIPLINE'),
-            'event': get_col('EVENT'),
-            'event_gender': get_col('EVENT_GENDER'),
-            'stage': get_col('STAGE'),
-            'heat': get_col('HEAT'),
-            'venue': get_col('VENUE'),
-            'city': get_col('CITY'),
-            'date_sgp': get_col('DATE_SGP'),
-            'time_start_sgp': get_col('TIME_START_SGP'),
-            'time_end_sgp': get_col('TIME_END_SGP'),
-            'athlete_name': get_col('ATHLETE_NAME'),
-            'country_sgp': get_col('COUNTRY_SGP'),
-            'timing_sgp': self.format_timing(timing_raw),
-            'personal_best': get_col('PERSONAL_BEST'),
-            'national_record': get_col('NATIONAL_RECORD'),
-            'pb_nr': get_col('PB_NR'),
-            'score_sgp': get_col('SCORE_SGP'),
-            'score_competitor': get_col('SCORE_COMPETITOR'),
-            'competitor_name': get_col('COMPETITOR_NAME'),
-            'competitor_country': get_col('COMPETITOR_COUNTRY'),
-            'win_draw_lose': get_col('WIN_DRAW_LOSE'),
-            'position': get_col('POSITION'),
-            'total_competitors': get_col('TOTAL_COMPETITORS'),
-            'final_position': get_col('FINAL_POSITION'),
-            'total_in_event': get_col('TOTAL_IN_EVENT'),
-            'advanced': get_col('ADVANCED'),
-            'medals': get_col('MEDALS'),
-            'highlights_text': self.generate_highlights_text(row),
-            'remarks': get_col('REMARKS'),
-            'type': self.categorize_highlight(row)
-        }
-        
-        return highlight
+        return build_highlight(row.tolist(), ColumnIndex(row.index))
     
     def generate_highlights_text(self, row):
         """
@@ -343,107 +305,32 @@ class HighlightsGenerator:
         """
         def get_col(key):
             col_name = COLUMN_MAPPINGS.get(key, key)
-            val = row.get(col_name, '')
-            return str(val).strip() if pd.notna(val) else ''
-        
-        sport = get_col('SPORT')
-        event = get_col('EVENT')
-        stage = get_col('STAGE')
-        athlete_name = get_col('ATHLETE_NAME')
-        competitor_name = get_col('COMPETITOR_NAME')
-        competitor_country = get_col('COMPETITOR_COUNTRY')
-        score_sgp = get_col('SCORE_SGP')
-        score_competitor = get_col('SCORE_COMPETITOR')
-        timing_sgp = get_col('TIMING_SGP')
-        
-        # Determine if H2H
-        is_h2h = competitor_name and competitor_country
-        
-        if is_h2h:
-            # H2H format: SPORT, EVENT, STAGE, ATHLETE(SGP), COMPETITOR, COUNTRY, SCORE(SGP), SCORE(COMPETITOR)
-            parts = []
-            if sport:
-                parts.append(sport)
-            if event:
-                parts.append(event)
-            if stage:
-                parts.append(stage)
-            if athlete_name:
-                parts.append(f"{athlete_name} (SGP)")
-            if competitor_name:
-                if competitor_country:
-                    parts.append(f"vs {competitor_name} ({competitor_country})")
-                else:
-                    parts.append(f"vs {competitor_name}")
-            
-            result_parts = []
-            if score_sgp and score_competitor:
-                result_parts.append(f"{score_sgp}-{score_competitor}")
-            elif score_sgp:
-                result_parts.append(score_sgp)
-            elif score_competitor:
-                result_parts.append(f"Opponent: {score_competitor}")
-            
-            if result_parts:
-                return " | ".join(parts + result_parts)
-            else:
-                return " | ".join(parts)
-        else:
-            # Non-H2H format: SPORT, EVENT, STAGE, ATHLETE(SGP), TIMING or SCORE
-            parts = []
-            if sport:
-                parts.append(sport)
-            if event:
-                parts.append(event)
-            if stage:
-                parts.append(stage)
-            if athlete_name:
-                parts.append(f"{athlete_name} (SGP)")
-            
-            result_parts = []
-            if timing_sgp:
-                result_parts.append(f"Time: {timing_sgp}")
-            elif score_sgp:
-                result_parts.append(f"Score: {score_sgp}")
-            
-            if result_parts:
-                return " | ".join(parts + result_parts)
-            else:
-                return " | ".join(parts)
+            return clean_cell(row.get(col_name, '')).strip()
+        
+        return build_highlights_text(
+            get_col('SPORT'), get_col('EVENT'), get_col('STAGE'), get_col('ATHLETE_NAME'),
+            get_col('COMPETITOR_NAME'), get_col('COMPETITOR_COUNTRY'),
+            get_col('SCORE_SGP'), get_col('SCORE_COMPETITOR'), get_col('TIMING_SGP')
+        )
     
-    def _create_medal_tally_card(self, highlights):
-        """Create a medal tally card showing total medals for the day."""
-        gold_count = 0
-        silver_count = 0
-        bronze_count = 0
+    def _create_medal_tally_card(self, counts, label='Total'):
+        """
+        Create a medal tally card from gold/silver/bronze counts.
         
-        for highlight in highlights:
-            medals = (highlight.get('medals') or '').strip()
-            if not medals:
-                continue
-            medal_key = str(medals).lower()
-            if medal_key in ('na', 'n/a', 'none', 'no medal', 'nil'):
-                continue
-            if 'gold' in medal_key:
-                gold_count += 1
-            elif 'silver' in medal_key:
-                silver_count += 1
-            elif 'bronze' in medal_key:
-                bronze_count += 1
-        
-        total_medals = gold_count + silver_count + bronze_count
+        Args:
+            counts: Dictionary with 'gold', 'silver' and 'bronze' counts
+            label: Prefix for the card title (e.g. 'Tally to 28 October 2025')
+        
+        Returns:
+            Card dictionary, or None if there are no medals
+        """
+        total_medals = sum(counts[kind] for kind in MEDAL_KINDS)
         
         # Only create tally card if there are medals
         if total_medals == 0:
             return None
         
-        tally_text = []
-        if gold_count > 0:
-            tally_text.append(f"{gold_count} 🥇")
-        if silver_count > 0:
-            tally_text.append(f"{silver_count} 🥈")
-        if bronze_count > 0:
-            tally_text.append(f"{bronze_count} 🥉")
+        tally_text = [f"{counts[kind]} {MEDAL_ICONS[kind]}" for kind in MEDAL_KINDS if counts[kind] > 0]
         
         return {
             'index': 0,  # Will be re-indexed
@@ -453,13 +340,39 @@ class HighlightsGenerator:
             'medal_label': '',
             'medal_icon': '',
             'athletes': '',
-            'event_details': f"Total: {total_medals} Medals",
-            'result_summary': ' | '.join(tally_text) if tally_text else 'No medals',
+            'event_details': f"{label}: {total_medals} Medals",
+            'result_summary': ' | '.join(tally_text),
             'result_badge': '',
-            'competitors': [],
+            # One scoreboard row per medal colour so the regular card layout shows the counts
+            'competitors': [
+                {
+                    'flag_icon': MEDAL_ICONS[kind],
+                    'flag_alt': kind.title(),
+                    'name': kind.title(),
+                    'country': '',
+                    'score': str(counts[kind])
+                }
+                for kind in MEDAL_KINDS
+            ],
             'is_tally_card': True
         }
     
+    def tally_card(self, tally, group_key, grouping=None):
+        """
+        "Tally to date" card for a group: cumulative counts up to the group's date
+        (date grouping), the sport's totals across all days (sport grouping) or the
+        sport's totals up to the date (date x sport grouping)
+        """
+        grouping = grouping or self.default_grouping()
+        if grouping == 'date':
+            return self._create_medal_tally_card(tally.to_date(group_key),
+                                                 f"Tally to {format_date_title(group_key)}")
+        if grouping == 'date_sport':
+            date_key, sport = group_key
+            return self._create_medal_tally_card(tally.to_date(date_key, sport=sport),
+                                                 f"Tally to {format_date_title(date_key)}")
+        return self._create_medal_tally_card(tally.counts('sport', group_key), "Tally to date")
+    
     def build_result_cards(self, group_key, highlights):
         """
         Prepare the list of card dictionaries for rendering.
@@ -471,6 +384,13 @@ class HighlightsGenerator:
             card = self._card_from_highlight(highlight, len(cards) + 1, group_key)
             cards.append(card)
         
+        return self.finalize_cards(cards)
+    
+    def finalize_cards(self, cards):
+        """
+        Sort a group's cards by sport header and re-index them (in place).
+        Adds sample placeholder cards if the group has none.
+        """
         if not cards:
             sample_cards = self._example_cards()
             for idx, example in enumerate(sample_cards, start=1):
@@ -503,6 +423,9 @@ class HighlightsGenerator:
     
     def _card_from_highlight(self, highlight, index, group_key=None):
         """Build a single card dictionary from a highlight entry."""
+        if isinstance(group_key, tuple):
+            # (date, sport) group
+            group_key = group_key[1]
         sport = (highlight.get('sport') or group_key or 'Sport Name').strip() or 'Sport Name'
         discipline = (highlight.get('discipline') or '').strip()
         
@@ -553,97 +476,13 @@ class HighlightsGenerator:
         competitors = []
         primary_name = (highlight.get('athlete_name') or '').strip() or "Athlete Name"
         primary_country = (highlight.get('country_sgp') or 'SGP').strip() or 'SGP'
-        def resolve_flag(country_value):
-            if not country_value:
-                return ''
-            country = str(country_value).strip()
-            if not country:
-                return ''
-            upper = country.upper()
-            flag_map = {
-                'SGP': '🇸🇬', 'SINGAPORE': '🇸🇬',
-                'MAS': '🇲🇾', 'MALAYSIA': '🇲🇾',
-                'THA': '🇹🇭', 'THAILAND': '🇹🇭',
-                'PHI': '🇵🇭', 'PHILIPPINES': '🇵🇭',
-                'VIE': '🇻🇳', 'VIETNAM': '🇻🇳',
-                'INA': '🇮🇩', 'INDONESIA': '🇮🇩',
-                'MYA': '🇲🇲', 'MYANMAR': '🇲🇲',
-                'CAM': '🇰🇭', 'CAMBODIA': '🇰🇭',
-                'LAO': '🇱🇦', 'LAOS': '🇱🇦',
-                'BRU': '🇧🇳', 'BRUNEI': '🇧🇳',
-                'TLS': '🇹🇱', 'TIMOR-LESTE': '🇹🇱',
-                'CHN': '🇨🇳', 'CHINA': '🇨🇳',
-                'JPN': '🇯🇵', 'JAPAN': '🇯🇵',
-                'KOR': '🇰🇷', 'SOUTH KOREA': '🇰🇷', 'KOREA': '🇰🇷',
-                'HKG': '🇭🇰', 'HONG KONG': '🇭🇰',
-                'TPE': '🇹🇼', 'TAIWAN': '🇹🇼',
-                'IND': '🇮🇳', 'INDIA': '🇮🇳',
-                'AUS': '🇦🇺', 'AUSTRALIA': '🇦🇺',
-                'NZL': '🇳🇿', 'NEW ZEALAND': '🇳🇿',
-                'USA': '🇺🇸', 'UNITED STATES': '🇺🇸',
-                'GBR': '🇬🇧', 'UNITED KINGDOM': '🇬🇧', 'UK': '🇬🇧',
-                'FRA': '🇫🇷', 'FRANCE': '🇫🇷',
-                'GER': '🇩🇪', 'GERMANY': '🇩🇪',
-                'ITA': '🇮🇹', 'ITALY': '🇮🇹',
-                'ESP': '🇪🇸', 'SPAIN': '🇪🇸',
-                'MGL': '🇲🇳', 'MONGOLIA': '🇲🇳',
-                'KAZ': '🇰🇿', 'KAZAKHSTAN': '🇰🇿',
-            }
-            if upper in flag_map:
-                return flag_map[upper]
-            for key, icon in flag_map.items():
-                if upper in key or key in upper:
-                    return icon
-            return ''
-        
-        def resolve_flag_image(country_value):
-            flags_dir = Path(__file__).parent / "flags"
-            if not country_value:
-                return ""
-            country_clean = str(country_value).strip().upper()
-            if not country_clean:
-                return ""
-            mapping = {
-                "SGP": "SIN.png",
-                "SINGAPORE": "SIN.png",
-                "SIN": "SIN.png",
-                "THA": "THA.png",
-                "THAILAND": "THA.png",
-                "VIE": "VIE.png",
-                "VIETNAM": "VIE.png",
-                "INA": "INA.png",
-                "INDONESIA": "INA.png",
-                "MAS": "MAS.png",
-                "MALAYSIA": "MAS.png",
-                "PHI": "PHI.png",
-                "PHILIPPINES": "PHI.png",
-                "MYA": "MYA.png",
-                "MYANMAR": "MYA.png",
-                "LAO": "LAO.png",
-                "LAOS": "LAO.png",
-                "CAM": "CAM.png",
-                "CAMBODIA": "CAM.png",
-                "BRU": "BRU.jpg",
-                "BRUNEI": "BRU.jpg",
-                "TIMOR-LESTE": "TLS.png",
-            }
-            file_name = mapping.get(country_clean)
-            if file_name:
-                candidate = flags_dir / file_name
-                if candidate.exists():
-                    return f"../flags/{file_name}"
-            # try using the country code directly
-            for suffix in (".png", ".jpg", ".jpeg"):
-                candidate = flags_dir / f"{country_clean}{suffix}"
-                if candidate.exists():
-                    return f"../flags/{country_clean}{suffix}"
-            return ""
+        flags = get_flag_index()
         
         competitors.append({
             'flag_src': '#',
             'flag_alt': f"{primary_country} flag placeholder",
-            'flag_image': resolve_flag_image(primary_country),
-            'flag_icon': resolve_flag(primary_country),
+            'flag_image': flags.image(primary_country),
+            'flag_icon': flags.emoji(primary_country),
             'name': primary_name,
             'country': primary_country,
             'score': primary_score
@@ -655,8 +494,8 @@ class HighlightsGenerator:
             competitors.append({
                 'flag_src': '#',
                 'flag_alt': f"{opponent_country or 'Opponent'} flag placeholder",
-                'flag_image': resolve_flag_image(opponent_country),
-                'flag_icon': resolve_flag(opponent_country),
+                'flag_image': flags.image(opponent_country),
+                'flag_icon': flags.emoji(opponent_country),
                 'name': opponent_name or "Opponent Name",
                 'country': opponent_country or "Opponent Country",
                 'score': opponent_score
@@ -903,67 +742,133 @@ class HighlightsGenerator:
         ]
         return example_cards
     
-    def group_highlights(self, df):
+    def default_grouping(self):
+        """Grouping used when none is given: 'date' or 'sport' (GROUP_BY_DATE in config)"""
+        return 'date' if GROUP_BY_DATE else 'sport'
+    
+    def group_highlights(self, df, grouping=None):
         """
         Group highlights data by date or sport (based on config)
         
         Args:
             df: DataFrame with highlights data
+            grouping: 'date', 'sport' or 'date_sport' (defaults to config)
         
         Returns:
             Dictionary mapping date/sport names to lists of highlight entries
         """
-        grouped_data = {}
-        date_col = COLUMN_MAPPINGS.get('DATE_SGP', 'DATE (SGP)')
-        sport_col = COLUMN_MAPPINGS.get('SPORT', 'SPORT')
-        
-        for _, row in df.iterrows():
-            if GROUP_BY_DATE:
-                # Group by date
-                date_key = row.get(date_col, 'Unknown Date')
-                if pd.isna(date_key) or str(date_key).strip() == '':
-                    date_key = 'Unknown Date'
-                else:
-                    # Format date nicely (handle YYYY-MM-DD format)
-                    try:
-                        date_str = str(date_key).strip()
-                        # Try to parse and format date if it's in a standard format
-                        try:
-                            from datetime import datetime as dt
-                            parsed_date = dt.strptime(date_str, '%Y-%m-%d')
-                            date_key = parsed_date.strftime('%Y-%m-%d')  # Keep consistent format
-                        except ValueError:
-                            # If parsing fails, use the string as-is
-                            date_key = date_str
-                    except:
-                        date_key = 'Unknown Date'
-                
-                key = date_key
+        grouping = grouping or self.default_grouping()
+        return self.group_highlights_multi(df, [grouping])[grouping]
+    
+    def group_highlights_multi(self, df, groupings):
+        """
+        Group highlights data several ways from one set of highlight records
+        
+        Each row is turned into a Highlight once; the groupings share those records.
+        
+        Args:
+            df: DataFrame with highlights data
+            groupings: List of 'date', 'sport' and/or 'date_sport'
+        
+        Returns:
+            Dictionary mapping grouping -> {group key: list of highlights}; date_sport
+            group keys are (date, sport) tuples
+        """
+        # Resolve column positions once, then read plain value tuples (no per-row Series)
+        columns = ColumnIndex(df.columns)
+        records = [build_highlight(row, columns) for row in df.itertuples(index=False, name=None)]
+        
+        # Compute every row's group key column-wise (each distinct date is parsed once)
+        date_keys = sport_keys = None
+        if 'date' in groupings or 'date_sport' in groupings:
+            date_keys = date_group_keys(df, COLUMN_MAPPINGS.get('DATE_SGP', 'DATE (SGP)'))
+        if 'sport' in groupings or 'date_sport' in groupings:
+            sport_keys = sport_group_keys(df, COLUMN_MAPPINGS.get('SPORT', 'SPORT'))
+        
+        results = {}
+        for grouping in groupings:
+            if grouping == 'date':
+                keys = date_keys
+            elif grouping == 'sport':
+                keys = sport_keys
+            elif grouping == 'date_sport':
+                keys = date_sport_group_keys(date_keys, sport_keys)
             else:
-                # Group by sport
-                sport = row.get(sport_col, 'Unknown')
-                if pd.isna(sport) or str(sport).strip() == '':
-                    sport = 'Unknown'
-                key = sport
+                raise ValueError(f"Unknown grouping: {grouping} (expected one of {GROUPINGS})")
             
-            if key not in grouped_data:
-                grouped_data[key] = []
+            grouped_data = {
+                key: [records[position] for position in positions]
+                for key, positions in group_positions(keys).items()
+            }
+            results[grouping] = grouped_data
             
-            highlight = self.format_highlight_data(row)
-            grouped_data[key].append(highlight)
+            if grouping == 'date':
+                logger.info(f"Grouped highlights into {len(grouped_data)} dates")
+                for date, highlights in sorted(grouped_data.items()):
+                    logger.info(f"   - {date}: {len(highlights)} highlights")
+            elif grouping == 'sport':
+                logger.info(f"Grouped highlights into {len(grouped_data)} sports")
+                for sport, highlights in grouped_data.items():
+                    logger.info(f"   - {sport}: {len(highlights)} highlights")
+            else:
+                logger.info(f"Grouped highlights into {len(grouped_data)} sport/date pages")
         
-        if GROUP_BY_DATE:
-            logger.info(f"Grouped highlights into {len(grouped_data)} dates")
-            for date, highlights in sorted(grouped_data.items()):
-                logger.info(f"   - {date}: {len(highlights)} highlights")
-        else:
-            logger.info(f"Grouped highlights into {len(grouped_data)} sports")
-            for sport, highlights in grouped_data.items():
-                logger.info(f"   - {sport}: {len(highlights)} highlights")
+        return results
+    
+    def load_grouped_fused(self, start_row=None, grouping=None):
+        """
+        Load, filter, format and group highlights in a single pass over the raw sheet rows
+        (see highlight_pipeline.py). Cards are built in the same pass.
+        
+        Args:
+            start_row: Row number where headers are (defaults to DATA_START_ROW from config)
+            grouping: 'date', 'sport' or 'date_sport' (defaults to config)
         
-        return grouped_data
+        Returns:
+            Tuple of (grouped highlights, grouped cards)
+        """
+        grouping = grouping or self.default_grouping()
+        return self.load_grouped_fused_multi(start_row, [grouping]).get(grouping, ({}, {}))
     
-    def generate_html(self, group_key, highlights):
+    def load_grouped_fused_multi(self, start_row=None, groupings=None):
+        """
+        Single-pass load for several groupings at once (see load_grouped_fused)
+        
+        Returns:
+            Dictionary mapping grouping -> (grouped highlights, grouped cards), or an
+            empty dictionary if the sheet has no data
+        """
+        if start_row is None:
+            start_row = DATA_START_ROW
+        groupings = groupings or [self.default_grouping()]
+        
+        with self.profiler.stage('fetch') as stage:
+            fetched = self.fetch_rows(start_row)
+            stage['rows'] = len(fetched[1]) if fetched else 0
+        if fetched is None:
+            logger.warning(f"Sheet has fewer than {start_row} rows")
+            return {}
+        
+        pipeline = FusedHighlightsPipeline(
+            self._card_from_highlight, self.finalize_cards, groupings=groupings
+        )
+        with self.profiler.stage('fused_pipeline') as stage:
+            results = pipeline.run_groupings(*fetched)
+            stage['rows'] = pipeline.stats['highlights_formatted']
+        self.pipeline_stats = pipeline.stats
+        
+        logger.info("Fused pipeline counters: " +
+                    ", ".join(f"{name}={count}" for name, count in pipeline.stats.items()))
+        for grouping, (grouped_data, _) in results.items():
+            if len(results) > 1:
+                logger.info(f"Grouping '{grouping}': {len(grouped_data)} pages")
+            for key, highlights in grouped_data.items():
+                logger.info(f"   - {key}: {len(highlights)} highlights")
+        
+        return results
+    
+    def generate_html(self, group_key, highlights, generation_date=None, stream=False, cards=None,
+                      grouping=None):
         """
         Generate HTML section for results grouped by date or sport.
         Produces a responsive 2x4 grid of result cards.
@@ -971,59 +876,59 @@ class HighlightsGenerator:
         Args:
             group_key: Date or sport name
             highlights: List of highlight dictionaries
+            generation_date: Timestamp shown on the page (defaults to now)
+            stream: Return an iterator of HTML chunks instead of one string
+            cards: Prebuilt card dictionaries (built from highlights if not given)
+            grouping: 'date', 'sport' or 'date_sport' (defaults to config)
         
         Returns:
-            HTML string
+            HTML string (or iterator of HTML strings if stream=True)
         """
-        template_path = Path(__file__).parent / 'templates' / 'highlights_template.html'
-        
-        if template_path.exists():
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template_content = f.read()
-                html_template = Template(template_content)
-        else:
-            html_template = self.get_default_template()
+        html_template = get_template('highlights_template.html', fallback=self.get_default_template)
         
-        cards = self.build_result_cards(group_key, highlights)
+        if cards is None:
+            cards = self.build_result_cards(group_key, highlights)
         slides = self.chunk_cards(cards, chunk_size=9)
         
         # Calculate gold medal count for header
-        gold_count = 0
-        for highlight in highlights:
-            medals = (highlight.get('medals') or '').strip()
-            if medals:
-                medal_key = str(medals).lower()
-                if medal_key not in ('na', 'n/a', 'none', 'no medal', 'nil') and 'gold' in medal_key:
-                    gold_count += 1
+        gold_count = count_medals(highlights)['gold']
         
         # Format date for title
-        if GROUP_BY_DATE and group_key:
-            # Format date nicely
-            try:
-                from datetime import datetime as dt
-                parsed_date = dt.strptime(str(group_key), '%Y-%m-%d')
-                formatted_date = parsed_date.strftime('%d %B %Y')
-            except:
-                formatted_date = str(group_key)
+        grouping = grouping or self.default_grouping()
+        subtitle = "AYG25 Competition Results"
+        group_label = group_key
+        if grouping == 'date_sport':
+            date_key, sport = group_key
+            formatted_date = format_date_title(date_key)
+            subtitle = f"{sport} Competition Results"
+            group_label = f"{sport} {date_key}"
+        elif grouping == 'date' and group_key:
+            formatted_date = format_date_title(group_key)
         else:
             formatted_date = group_key or ''
-        
-        subtitle = "AYG25 Competition Results"
-        if group_key and not GROUP_BY_DATE:
-            subtitle = f"{group_key} Competition Results"
+            if group_key:
+                subtitle = f"{group_key} Competition Results"
         
         section_title = f"GOLD MEDALS FOR {formatted_date}" if formatted_date else "GOLD MEDALS FOR THE DAY"
         
-        html_content = html_template.render(
+        if generation_date is None:
+            generation_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        context = dict(
             section_title=section_title,
             subtitle=subtitle,
-            group_label=group_key,
+            group_label=group_label,
             cards=cards,
             slides=slides,
-            generation_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            generation_date=generation_date,
             gold_medal_count=gold_count
         )
         
+        if stream:
+            return html_template.generate(**context)
+        
+        html_content = html_template.render(**context)
+        
         return html_content
     
     def get_default_template(self):
@@ -1383,58 +1288,376 @@ class HighlightsGenerator:
 </html>
         """)
     
-    def generate_all(self):
+    def get_output_filename(self, group_key, grouping=None):
+        """
+        Return the output HTML filename for a group:
+        highlights_<date>.html, <Sport>_highlights.html or <Sport>_highlights_<date>.html
+        """
+        grouping = grouping or self.default_grouping()
+        
+        def safe_date(value):
+            # For dates, format as YYYY-MM-DD or keep original
+            safe_name = "".join(c for c in str(value) if c.isalnum() or c in (' ', '-', '_', '/')).strip()
+            return safe_name.replace(' ', '_').replace('/', '-')
+        
+        def safe_sport(value):
+            safe_name = "".join(c for c in value if c.isalnum() or c in (' ', '-', '_')).strip()
+            return safe_name.replace(' ', '_')
+        
+        # Sanitize key for filename
+        if grouping == 'date':
+            return f"highlights_{safe_date(group_key)}.html"
+        if grouping == 'date_sport':
+            date_key, sport = group_key
+            return f"{safe_sport(sport)}_highlights_{safe_date(date_key)}.html"
+        return f"{safe_sport(group_key)}_highlights.html"
+    
+    def render_group(self, group_key, highlights, output_file, generation_date=None, cards=None,
+                     grouping=None, asset_urls=None):
+        """
+        Render one group's page and stream it to disk.
+        Template chunks go straight to a temp file that is renamed into place,
+        so the whole page is never held in memory and a crash never leaves a partial page.
+        Asset references are rewritten to fingerprinted names chunk by chunk (asset_urls
+        from AssetPublisher.publish()). Rendering and writing are profiled together as
+        the 'render_write' stage.
+        
+        Returns:
+            Render time in seconds
+        """
+        start = time.perf_counter()
+        with self.profiler.stage('render_write', rows=len(highlights)):
+            chunks = self.generate_html(group_key, highlights, generation_date, stream=True, cards=cards,
+                                        grouping=grouping)
+            write_atomic(output_file, rewrite_asset_chunks(chunks, asset_urls))
+        
+        return time.perf_counter() - start
+    
+    def render_fingerprint(self, grouping=None, assets_digest=''):
+        """Hash of the render inputs other than the data (template, grouping mode and published assets)"""
+        template_path = Path(__file__).parent / 'templates' / 'highlights_template.html'
+        fingerprint = f"{hash_file(template_path)}:{grouping or self.default_grouping()}"
+        return f"{fingerprint}:{assets_digest}" if assets_digest else fingerprint
+    
+    def write_feeds(self, grouped_by, cards_by, generation_date, tally=None, asset_urls=None):
+        """
+        Write the per-day JSON feeds (cards, medal counts, generation time) and their index
+        
+        Feeds come from the date grouping; cards built here are stored in cards_by so
+        the date pages reuse them. Without a date grouping the first grouping's
+        highlights are regrouped by date.
+        
+        Returns:
+            The feed index dictionary
+        """
+        if 'date' in grouped_by:
+            date_groups = grouped_by['date']
+            date_cards = cards_by['date']
+        else:
+            date_groups = {}
+            for highlights in next(iter(grouped_by.values())).values():
+                for highlight in highlights:
+                    date_key = normalize_date_key(highlight.get('date_sgp') or '')
+                    date_groups.setdefault(date_key, []).append(highlight)
+            date_cards = {}
+        
+        def days():
+            for date_key, highlights in date_groups.items():
+                cards = date_cards.get(date_key)
+                if cards is None:
+                    cards = date_cards[date_key] = self.build_result_cards(date_key, highlights)
+                to_date = tally.to_date(date_key) if tally is not None else None
+                yield date_key, cards, count_medals(highlights), to_date
+        
+        return FeedWriter(self.output_dir).write(days(), generation_date, asset_urls)
+    
+    def render_standings(self, tally, generation_date=None):
+        """
+        Write the medal standings page (overall, per date, per sport and top athletes)
+        
+        Returns:
+            Path of the standings page
+        """
+        html_template = get_template('standings_template.html', fallback=self.get_default_standings_template)
+        
+        by_date = sorted(tally.standings('date'), key=lambda row: row['name'])
+        for row in by_date:
+            row['name'] = format_date_title(row['name'])
+        
+        output_file = self.output_dir / STANDINGS_FILENAME
+        write_atomic(output_file, html_template.generate(
+            as_of=format_date_title(tally.latest_date()) if tally.latest_date() else '',
+            overall=tally.overall,
+            panels=[
+                {'title': 'By Sport', 'label': 'Sport', 'rows': tally.standings('sport')},
+                {'title': 'By Day', 'label': 'Date', 'rows': by_date},
+                {'title': 'Top Athletes', 'label': 'Athlete', 'rows': tally.standings('athlete')[:20]}
+            ],
+            generation_date=generation_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        ))
+        logger.info(f"Generated medal standings page: {output_file}")
+        return output_file
+    
+    def get_default_standings_template(self):
+        """Return a minimal standings template (used if templates/standings_template.html is missing)"""
+        return Template("""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="UTF-8"><title>Medal Standings</title></head>
+<body>
+    <h1>Medal Standings: {{ overall.gold }} 🥇 {{ overall.silver }} 🥈 {{ overall.bronze }} 🥉</h1>
+    {% for panel in panels %}
+    <h2>{{ panel.title }}</h2>
+    <table>
+        <tr><th>{{ panel.label }}</th><th>🥇</th><th>🥈</th><th>🥉</th><th>Total</th></tr>
+        {% for row in panel.rows %}
+        <tr><td>{{ row.name }}</td><td>{{ row.gold }}</td><td>{{ row.silver }}</td><td>{{ row.bronze }}</td><td>{{ row.total }}</td></tr>
+        {% endfor %}
+    </table>
+    {% endfor %}
+    <p>Updated {{ generation_date }}</p>
+</body>
+</html>
+""")
+    
+    def load_groups(self, fused, groupings):
+        """
+        Load the sheet and group its highlights for every grouping
+        
+        Returns:
+            Tuple of (grouped_by, cards_by) dictionaries keyed by grouping, or None if
+            there is no highlights data
+        """
+        if fused:
+            results = self.load_grouped_fused_multi(start_row=8, groupings=groupings)
+            if not results or not results[groupings[0]][0]:
+                return None
+            grouped_by = {grouping: grouped for grouping, (grouped, _) in results.items()}
+            cards_by = {grouping: cards for grouping, (_, cards) in results.items()}
+            return grouped_by, cards_by
+        
+        # Load data from Google Sheets
+        df = self.load_data(start_row=8)
+        if df.empty:
+            return None
+        
+        # Group highlights by date and/or sport
+        with self.profiler.stage('group', rows=len(df)):
+            grouped_by = self.group_highlights_multi(df, groupings)
+        return grouped_by, {grouping: {} for grouping in groupings}
+    
+    def publish_static(self, publish_assets):
+        """
+        Copy styles.css to the output directory and publish the fingerprinted assets
+        
+        Returns:
+            Tuple of (asset_urls, assets_digest); empty when publish_assets is off
+        """
+        # Copy CSS file to output directory if it is missing or out of date
+        css_source = Path(__file__).parent / 'styles.css'
+        css_dest = self.output_dir / 'styles.css'
+        if css_source.exists() and hash_file(css_source) != hash_file(css_dest):
+            import shutil
+            shutil.copy2(css_source, css_dest)
+            logger.info(f"Copied styles.css to output directory")
+        
+        if not publish_assets:
+            return {}, ''
+        # Fingerprinted asset copies; only new content is written
+        with self.profiler.stage('assets'):
+            publisher = AssetPublisher(self.output_dir)
+            asset_urls = publisher.publish()
+        return asset_urls, publisher.digest
+    
+    def hash_groups(self, grouped_by, assets_digest=''):
+        """
+        Content hash of every group's page inputs
+        
+        Returns:
+            Dictionary mapping grouping -> {group key: digest}
+        """
+        digests_by = {}
+        for grouping, grouped_data in grouped_by.items():
+            fingerprint = self.render_fingerprint(grouping, assets_digest)
+            digests_by[grouping] = {
+                group_key: hash_highlights(group_key, highlights, fingerprint)
+                for group_key, highlights in grouped_data.items()
+            }
+        return digests_by
+    
+    def apply_tally(self, grouped_by, cards_by, digests_by, groupings):
+        """
+        Update the running medal totals and prepend a tally card to every group
+        
+        Only groups whose content hash changed are re-read; the first grouping feeds the
+        tally and every grouping gets tally cards. A group's digest is combined with its
+        card, since the page also depends on the cumulative totals shown there.
+        
+        Returns:
+            The updated MedalTally
+        """
+        medal_tally = MedalTally(self.output_dir / '.cache' / MEDAL_TALLY_FILENAME)
+        medal_tally.update(grouped_by[groupings[0]], digests_by[groupings[0]])
+        medal_tally.save()
+        for grouping, grouped_data in grouped_by.items():
+            grouped_cards, group_digests = cards_by[grouping], digests_by[grouping]
+            for group_key, highlights in grouped_data.items():
+                card = self.tally_card(medal_tally, group_key, grouping)
+                if card is None:
+                    continue
+                cards = grouped_cards.get(group_key)
+                if cards is None:
+                    cards = self.build_result_cards(group_key, highlights)
+                cards = [card] + cards
+                for idx, item in enumerate(cards, start=1):
+                    item['index'] = idx
+                grouped_cards[group_key] = cards
+                group_digests[group_key] = combine_digests(group_digests[group_key],
+                                                           card['result_summary'], card['event_details'])
+        return medal_tally
+    
+    def plan_renders(self, grouped_by, digests_by, manifest, force=False):
+        """
+        Split the pages into those to render and those already current in the manifest
+        
+        Returns:
+            Tuple of (jobs, skipped): jobs are (grouping, group key, highlights, output
+            file, digest) tuples, skipped the output files left as they are
+        """
+        jobs = []
+        skipped = []
+        for grouping, grouped_data in grouped_by.items():
+            for group_key, highlights in grouped_data.items():
+                output_file = self.output_dir / self.get_output_filename(group_key, grouping)
+                digest = digests_by[grouping][group_key]
+                if not force and manifest.is_current(output_file, digest):
+                    skipped.append(output_file)
+                    continue
+                jobs.append((grouping, group_key, highlights, output_file, digest))
+        return jobs, skipped
+    
+    def render_jobs(self, jobs, cards_by, generation_date, asset_urls=None, workers=1):
+        """
+        Render and write the planned pages, in worker processes when workers > 1
+        
+        Returns:
+            Render time in seconds of each job, in job order
+        """
+        if not (workers and workers > 1 and len(jobs) > 1):
+            return [
+                self.render_group(group_key, highlights, output_file, generation_date,
+                                  cards_by[grouping].get(group_key), grouping, asset_urls)
+                for grouping, group_key, highlights, output_file, _ in jobs
+            ]
+        
+        logger.info(f"Rendering {len(jobs)} groups with {workers} worker processes")
+        # Workers render and write each page, so the two are timed together
+        with self.profiler.stage('render_write_parallel', rows=sum(len(job[2]) for job in jobs)), \
+                ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_render_group_worker, group_key, highlights, output_file,
+                                generation_date, cards_by[grouping].get(group_key), grouping,
+                                asset_urls)
+                for grouping, group_key, highlights, output_file, _ in jobs
+            ]
+            # Collect in submission order so the log is deterministic
+            return [future.result() for future in futures]
+    
+    def generate_all(self, workers=1, force=False, fused=False, tally=None, groupings=None,
+                     publish_assets=None, feeds=None, precompress=None):
         """
         Generate highlights pages for all sports
+        
+        Args:
+            workers: Number of worker processes used to render groups and precompress (1 runs sequentially)
+            force: Rebuild every page even if its content hash is unchanged
+            fused: Use the single-pass pipeline instead of the DataFrame stages
+            tally: Keep the cumulative medal tally, add "tally to date" cards and write the
+                   standings page (defaults to MEDAL_TALLY from config)
+            groupings: Page sets to render from the one load - any of 'date', 'sport' and
+                       'date_sport' (defaults to date or sport per GROUP_BY_DATE in config)
+            publish_assets: Write content-hashed copies of styles.css and the flag images to
+                            output/assets/ and reference them from the pages (defaults to
+                            PUBLISH_ASSETS from config)
+            feeds: Also write per-day JSON feeds and an index to output/feeds/ (defaults
+                   to JSON_FEEDS from config)
+            precompress: Write .gz/.br siblings of changed HTML/CSS/JSON output files
+                         (defaults to PRECOMPRESS from config)
         """
+        if tally is None:
+            tally = MEDAL_TALLY
+        if publish_assets is None:
+            publish_assets = PUBLISH_ASSETS
+        if feeds is None:
+            feeds = JSON_FEEDS
+        if precompress is None:
+            precompress = PRECOMPRESS
+        groupings = list(dict.fromkeys(groupings or [self.default_grouping()]))
         try:
-            # Load data from Google Sheets
-            df = self.load_data(start_row=8)
-            
-            if df.empty:
+            loaded = self.load_groups(fused, groupings)
+            if loaded is None:
                 logger.warning("No highlights data found")
                 return
+            grouped_by, cards_by = loaded
             
-            # Group highlights by date or sport
-            grouped_data = self.group_highlights(df)
+            asset_urls, assets_digest = self.publish_static(publish_assets)
             
-            # Copy CSS file to output directory if it doesn't exist (once)
-            css_source = Path(__file__).parent / 'styles.css'
-            css_dest = self.output_dir / 'styles.css'
-            if css_source.exists() and not css_dest.exists():
-                import shutil
-                shutil.copy2(css_source, css_dest)
-                logger.info(f"Copied styles.css to output directory")
+            # One timestamp for the whole run so output doesn't depend on render order
+            generation_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
+            # Skip groups whose highlight records haven't changed since the last run
+            with self.profiler.stage('hash', rows=sum(map(len, grouped_by[groupings[0]].values()))):
+                manifest = RenderManifest(self.output_dir / MANIFEST_FILENAME)
+                digests_by = self.hash_groups(grouped_by, assets_digest)
+            
+            medal_tally = None
+            if tally:
+                with self.profiler.stage('tally'):
+                    medal_tally = self.apply_tally(grouped_by, cards_by, digests_by, groupings)
+            
+            if feeds:
+                with self.profiler.stage('feeds'):
+                    self.write_feeds(grouped_by, cards_by, generation_date, medal_tally, asset_urls)
+            
+            with self.profiler.stage('plan'):
+                jobs, skipped = self.plan_renders(grouped_by, digests_by, manifest, force)
             
             # Generate HTML for each group (date or sport)
-            for group_key, highlights in grouped_data.items():
-                # Sanitize key for filename
-                if GROUP_BY_DATE:
-                    # For dates, format as YYYY-MM-DD or keep original
-                    safe_name = "".join(c for c in str(group_key) if c.isalnum() or c in (' ', '-', '_', '/')).strip()
-                    safe_name = safe_name.replace(' ', '_').replace('/', '-')
-                    filename = f"highlights_{safe_name}.html"
-                else:
-                    safe_name = "".join(c for c in group_key if c.isalnum() or c in (' ', '-', '_')).strip()
-                    safe_name = safe_name.replace(' ', '_')
-                    filename = f"{safe_name}_highlights.html"
-                
-                html_content = self.generate_html(group_key, highlights)
-                
-                # Save HTML file
-                output_file = self.output_dir / filename
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                
-                logger.info(f"Generated highlights page: {output_file}")
+            render_times = self.render_jobs(jobs, cards_by, generation_date, asset_urls, workers)
+            
+            for (_, _, highlights, output_file, digest), seconds in zip(jobs, render_times):
+                logger.info(f"Generated highlights page: {output_file} "
+                            f"({len(highlights)} highlights, {seconds * 1000:.1f} ms)")
+                manifest.update(output_file, digest)
+            with self.profiler.stage('write'):
+                manifest.save()
+                if medal_tally is not None:
+                    self.render_standings(medal_tally, generation_date)
+                # Every page now references the current asset names
+                if publish_assets:
+                    prune_assets(self.output_dir, asset_urls)
             
-            logger.info(f"Successfully generated {len(grouped_data)} highlights pages")
+            if precompress:
+                with self.profiler.stage('precompress'):
+                    Precompressor(self.output_dir, workers=workers or 1).run()
+            
+            for output_file in skipped:
+                logger.info(f"Unchanged, skipped: {output_file.name}")
+            
+            logger.info(f"Pages rebuilt: {len(jobs)}, skipped (unchanged): {len(skipped)}")
+            logger.info(f"Successfully generated {sum(map(len, grouped_by.values()))} highlights pages")
             logger.info(f"Output directory: {self.output_dir}")
             
         except Exception as e:
             logger.error(f"Error generating highlights: {str(e)}")
             raise e
 
+def _render_group_worker(group_key, highlights, output_file, generation_date, cards=None, grouping=None,
+                         asset_urls=None):
+    """Render one group in a worker process (module-level so it can be pickled)"""
+    generator = HighlightsGenerator(connect=False)
+    return generator.render_group(group_key, highlights, output_file, generation_date, cards, grouping,
+                                  asset_urls)
+
 
 def main():
     """Main function"""
@@ -1448,16 +1671,62 @@ def main():
                        help='Worksheet name (defaults to config.py)')
     parser.add_argument('--credentials', type=str, default=None,
                        help='Path to Google credentials JSON file (defaults to config.py)')
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default=None,
+                       help="'columns' fetches only the mapped columns, 'full' fetches the whole sheet, "
+                            "'incremental' fetches only appended/changed rows into a local snapshot "
+                            "(defaults to FETCH_MODE in config.py)")
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for rendering pages (default: 1, sequential)')
+    parser.add_argument('--force', action='store_true',
+                       help='Rebuild all pages, even those whose data has not changed')
+    parser.add_argument('--fused', action='store_true',
+                       help='Load, filter, group and build cards in a single pass over the sheet rows')
+    parser.add_argument('--tally', action='store_true', default=None,
+                       help='Keep a cumulative medal tally: add "tally to date" cards and write '
+                            'medal_standings.html (defaults to MEDAL_TALLY in config.py)')
+    parser.add_argument('--groupings', nargs='+', choices=GROUPINGS, default=None,
+                       help="Page sets to render from one load: 'date', 'sport' and/or 'date_sport' "
+                            "(defaults to date or sport per GROUP_BY_DATE in config.py)")
+    parser.add_argument('--publish-assets', action='store_true', default=None,
+                       help='Write content-hashed copies of styles.css and the flag images to output/assets/ '
+                            'and reference them from the pages (defaults to PUBLISH_ASSETS in config.py)')
+    parser.add_argument('--feeds', action='store_true', default=None,
+                       help='Also write per-day JSON feeds (cards, medal tally, generation time) and an '
+                            'index to output/feeds/ (defaults to JSON_FEEDS in config.py)')
+    parser.add_argument('--precompress', action='store_true', default=None,
+                       help='Write .gz/.br siblings of changed HTML/CSS/JSON files in output/ for static hosts '
+                            '(defaults to PRECOMPRESS in config.py)')
+    parser.add_argument('--offline', action='store_true',
+                       help='Render from the cached sheet snapshot only, without connecting to Google Sheets')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Ignore the cached sheet snapshot and fetch the sheet')
+    parser.add_argument('--snapshot-ttl', type=int, default=None,
+                       help='Seconds a cached sheet snapshot is reused (defaults to SNAPSHOT_TTL in config.py)')
+    parser.add_argument('--profile', nargs='?', const=str(PROFILE_REPORT), default=None, metavar='REPORT',
+                       help='Record wall/CPU time, rows and peak memory per stage and write a JSON report '
+                            f'(default: {PROFILE_REPORT.relative_to(Path(__file__).parent)})')
+    parser.add_argument('--cprofile', action='store_true',
+                       help='With --profile, also dump cProfile stats for the slowest stage next to the report')
     
     args = parser.parse_args()
+    profiler = StageProfiler(enabled=args.profile is not None, cprofile=args.cprofile)
     
     try:
         generator = HighlightsGenerator(
             spreadsheet_id=args.spreadsheet_id,
             sheet_name=args.sheet_name,
-            credentials_file=args.credentials
+            credentials_file=args.credentials,
+            fetch_mode=args.fetch_mode,
+            offline=args.offline,
+            refresh=args.refresh,
+            snapshot_ttl=args.snapshot_ttl,
+            profiler=profiler
         )
-        generator.generate_all()
+        generator.generate_all(workers=args.workers, force=args.force, fused=args.fused, tally=args.tally,
+                               groupings=args.groupings, publish_assets=args.publish_assets,
+                               feeds=args.feeds, precompress=args.precompress)
+        if profiler.enabled:
+            profiler.write_report(args.profile, command='generate_highlights')
     except Exception as e:
         logger.error(f"Failed to generate highlights: {str(e)}")
         return 1
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Date normalization for the Highlights Generator
+Each distinct DATE (SGP) value is parsed once; group keys and page titles are
+looked up from per-date caches instead of calling strptime for every row.
+The DataFrame helpers import pandas when called, so the fused pipeline can use the
+date keys without loading pandas.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+UNKNOWN_DATE = 'Unknown Date'
+UNKNOWN_SPORT = 'Unknown'
+
+# Page groupings: one page per date, per sport, or per sport on each date
+GROUPINGS = ('date', 'sport', 'date_sport')
+
+
+@lru_cache(maxsize=None)
+def normalize_date_key(value):
+    """
+    Normalize a DATE (SGP) cell into a group key
+
+    YYYY-MM-DD dates are re-formatted consistently (e.g. 2025-10-5 -> 2025-10-05),
+    other text is kept as-is and blanks become 'Unknown Date'.
+    """
+    date_str = str(value).strip()
+    if not date_str:
+        return UNKNOWN_DATE
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        # If parsing fails, use the string as-is
+        return date_str
+
+
+@lru_cache(maxsize=None)
+def format_date_title(group_key):
+    """Display form of a date group key, e.g. 2025-10-28 -> 28 October 2025"""
+    try:
+        return datetime.strptime(str(group_key), '%Y-%m-%d').strftime('%d %B %Y')
+    except ValueError:
+        return str(group_key)
+
+
+def _column(df, col):
+    """Return a column as a Series with missing values as '' (None if the column is absent)"""
+    import pandas as pd
+
+    if col not in df.columns:
+        return None
+    series = df[col]
+    if isinstance(series, pd.DataFrame):
+        # Duplicate header names - use the first matching column
+        series = series.iloc[:, 0]
+    return series.astype(object).where(series.notna(), '')
+
+
+def date_group_keys(df, date_col):
+    """Group keys for every row, parsing each distinct date only once"""
+    import pandas as pd
+
+    series = _column(df, date_col)
+    if series is None:
+        return pd.Series(UNKNOWN_DATE, index=df.index, dtype=object)
+    mapping = {value: normalize_date_key(value) for value in pd.unique(series)}
+    return series.map(mapping)
+
+
+def sport_group_keys(df, sport_col):
+    """Group keys for every row: the SPORT value, or 'Unknown' when blank"""
+    import pandas as pd
+
+    series = _column(df, sport_col)
+    if series is None:
+        return pd.Series(UNKNOWN_SPORT, index=df.index, dtype=object)
+    blank = series.astype(str).str.strip() == ''
+    return series.where(~blank, UNKNOWN_SPORT)
+
+
+def date_sport_group_keys(date_keys, sport_keys):
+    """(date, sport) group keys for every row, from the per-row date and sport keys"""
+    import pandas as pd
+
+    return pd.Series(list(zip(date_keys, sport_keys)), index=date_keys.index, dtype=object)
+
+
+def group_positions(keys):
+    """
+    Row positions for each group key, in order of first appearance
+
+    Returns:
+        Dictionary mapping group key -> array of row positions
+    """
+    import pandas as pd
+
+    positional = pd.Series(keys.to_numpy(dtype=object))
+    indices = positional.groupby(positional, sort=False).indices
+    return {key: indices[key] for key in pd.unique(positional)}
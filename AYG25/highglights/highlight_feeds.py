@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Per-day JSON data feeds for the Highlights Generator
+Each day's cards and medal counts are written to output/feeds/<date>.json with a small
+output/feeds/index.json listing the days, so a widget can fetch only the data instead
+of a whole rendered page. A feed file is only rewritten when its content changes; its
+digest in the index doubles as a cache key.
+"""
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+from highlight_dates import format_date_title
+from output_files import write_atomic
+
+logger = logging.getLogger(__name__)
+
+FEEDS_DIRNAME = 'feeds'
+FEED_INDEX_FILENAME = 'index.json'
+
+# Card fields that only matter to the HTML template
+TEMPLATE_ONLY_FIELDS = ('index', 'flag_src')
+
+
+def compact_card(card, asset_urls=None):
+    """
+    Card dictionary without template-only and empty fields
+
+    Args:
+        card: Card dictionary as passed to the template
+        asset_urls: Page reference -> fingerprinted URL for flag images (optional)
+    """
+    compact = {}
+    for key, value in card.items():
+        if key in TEMPLATE_ONLY_FIELDS or value in ('', None, []):
+            continue
+        if key == 'competitors':
+            value = [compact_card(competitor, asset_urls) for competitor in value]
+        elif key == 'flag_image' and asset_urls:
+            value = asset_urls.get(value, value)
+        compact[key] = value
+    return compact
+
+
+def _feed_name(date_key):
+    safe_name = "".join(c for c in str(date_key) if c.isalnum() or c in (' ', '-', '_', '/')).strip()
+    return safe_name.replace(' ', '_').replace('/', '-') + '.json'
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+class FeedWriter:
+    """Writes changed per-day feeds and the feed index"""
+
+    def __init__(self, output_dir):
+        self.feeds_dir = Path(output_dir) / FEEDS_DIRNAME
+        self.index_path = self.feeds_dir / FEED_INDEX_FILENAME
+        self.previous = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.previous = {entry['date']: entry for entry in json.load(f).get('days', [])}
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable feed index {self.index_path}: {e}")
+        self.stats = {}
+
+    def write(self, days, generated_at, asset_urls=None):
+        """
+        Write one feed per day plus the index
+
+        Args:
+            days: Iterable of (date key, cards, day medal counts, medal counts to date or None)
+            generated_at: Generation timestamp for feeds whose content changed
+            asset_urls: Page reference -> fingerprinted URL for flag images (optional)
+
+        Returns:
+            The index dictionary
+        """
+        self.feeds_dir.mkdir(parents=True, exist_ok=True)
+        entries = []
+        written = unchanged = 0
+        for date_key, cards, day_counts, to_date_counts in days:
+            medal_tally = {'day': day_counts}
+            if to_date_counts is not None:
+                medal_tally['to_date'] = to_date_counts
+            content = {
+                'date': date_key,
+                'title': format_date_title(date_key),
+                'medal_tally': medal_tally,
+                'cards': [compact_card(card, asset_urls) for card in cards if not card.get('is_tally_card')]
+            }
+            digest = hashlib.sha256(_dumps(content).encode('utf-8')).hexdigest()[:16]
+            name = _feed_name(date_key)
+
+            previous = self.previous.get(date_key)
+            if previous is not None and previous.get('digest') == digest and (self.feeds_dir / name).exists():
+                feed_generated_at = previous.get('generated_at', generated_at)
+                unchanged += 1
+            else:
+                feed_generated_at = generated_at
+                write_atomic(self.feeds_dir / name, _dumps({'generated_at': generated_at, **content}))
+                written += 1
+
+            entries.append({
+                'date': date_key,
+                'title': content['title'],
+                'url': f"{FEEDS_DIRNAME}/{name}",
+                'digest': digest,
+                'generated_at': feed_generated_at,
+                'cards': len(content['cards']),
+                'medals': day_counts
+            })
+
+        # Days that disappeared from the sheet
+        current = {entry['date'] for entry in entries}
+        removed = [date_key for date_key in self.previous if date_key not in current]
+        for date_key in removed:
+            (self.feeds_dir / _feed_name(date_key)).unlink(missing_ok=True)
+
+        entries.sort(key=lambda entry: entry['date'])
+        index = {'generated_at': generated_at, 'days': entries}
+        write_atomic(self.index_path, _dumps(index))
+
+        self.stats = {'feeds_written': written, 'feeds_unchanged': unchanged, 'feeds_removed': len(removed)}
+        logger.info(f"JSON feeds: {written} written, {unchanged} unchanged, {len(removed)} removed "
+                    f"({self.feeds_dir})")
+        return index
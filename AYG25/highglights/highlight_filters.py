@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Eligibility rules for the Highlights Generator
+The rules are defined once, by COLUMN_MAPPINGS key, and applied either per row
+(classify_row, used by the fused pipeline) or a column at a time (the H2H and
+non-H2H masks for the DataFrame path, built once per column instead of once per row).
+pandas is only imported by the mask builders.
+"""
+
+from functools import reduce
+from operator import and_, or_
+
+# Import config
+try:
+    from config import COLUMN_MAPPINGS
+except ImportError:
+    COLUMN_MAPPINGS = {}
+
+# A row needs a value in every BASIC_KEYS column. It is head-to-head when every
+# H2H_KEYS column is set and then needs one of H2H_RESULT_KEYS; any other row needs
+# one of RESULT_KEYS.
+BASIC_KEYS = ('SPORT', 'EVENT', 'STAGE', 'ATHLETE_NAME')
+H2H_KEYS = ('COMPETITOR_NAME', 'COMPETITOR_COUNTRY')
+H2H_RESULT_KEYS = ('SCORE_SGP', 'SCORE_COMPETITOR')
+RESULT_KEYS = ('TIMING_SGP', 'SCORE_SGP')
+
+# Sheet header names used when COLUMN_MAPPINGS has no entry for a rule key
+DEFAULT_COLUMNS = {
+    'SPORT': 'SPORT',
+    'EVENT': 'EVENT',
+    'STAGE': 'STAGE / ROUND OF COMPETITION',
+    'ATHLETE_NAME': 'NAME OF ATHLETE (SGP)',
+    'COMPETITOR_NAME': 'NAME OF ATHLETE (COMPETITOR)',
+    'COMPETITOR_COUNTRY': 'COUNTRY NAME (COMPETITOR)',
+    'SCORE_SGP': 'SCORE/DISTANCE/HEIGHT\n(SGP)',
+    'SCORE_COMPETITOR': 'SCORE (COMPETITOR)',
+    'TIMING_SGP': 'TIMING (SGP)\nhh:mm:ss.ms',
+}
+
+
+def classify_row(has):
+    """
+    Eligibility of one row
+
+    Args:
+        has: Callable(COLUMN_MAPPINGS key) returning whether the row has a value there
+
+    Returns:
+        'h2h', 'non_h2h', or None if the row does not have enough data for a highlight
+    """
+    if not all(map(has, BASIC_KEYS)):
+        return None
+    if all(map(has, H2H_KEYS)):
+        return 'h2h' if any(map(has, H2H_RESULT_KEYS)) else None
+    return 'non_h2h' if any(map(has, RESULT_KEYS)) else None
+
+
+def has_value_mask(df, col):
+    """
+    Boolean mask of rows where a column exists and has a non-empty value
+
+    Args:
+        df: DataFrame with the sheet data
+        col: Actual column name from the sheet
+
+    Returns:
+        Boolean Series aligned with df.index
+    """
+    import pandas as pd
+
+    if col not in df.columns:
+        return pd.Series(False, index=df.index)
+
+    series = df[col]
+    if isinstance(series, pd.DataFrame):
+        # Duplicate header names - use the first matching column
+        series = series.iloc[:, 0]
+
+    return series.notna() & (series.astype(str).str.strip() != '')
+
+
+def build_eligibility_masks(df):
+    """
+    Build the masks that decide which rows have enough data for a highlight
+
+    Same rules as classify_row(), evaluated a column at a time.
+
+    Args:
+        df: DataFrame with the sheet data
+
+    Returns:
+        Dictionary with 'h2h', 'non_h2h' and 'eligible' boolean Series
+    """
+    column_masks = {}
+
+    def mask(key):
+        """Compute each column's mask only once, even if several rules use it"""
+        col = COLUMN_MAPPINGS.get(key, DEFAULT_COLUMNS[key])
+        if col not in column_masks:
+            column_masks[col] = has_value_mask(df, col)
+        return column_masks[col]
+
+    def all_of(keys):
+        return reduce(and_, map(mask, keys))
+
+    def any_of(keys):
+        return reduce(or_, map(mask, keys))
+
+    has_basic = all_of(BASIC_KEYS)
+    is_h2h = all_of(H2H_KEYS)
+
+    h2h = is_h2h & has_basic & any_of(H2H_RESULT_KEYS)
+    non_h2h = ~is_h2h & has_basic & any_of(RESULT_KEYS)
+
+    return {
+        'h2h': h2h,
+        'non_h2h': non_h2h,
+        'eligible': h2h | non_h2h
+    }
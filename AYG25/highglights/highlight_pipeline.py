@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Fused single-pass highlights pipeline
+Turns raw sheet rows (lists from get_all_values()) into grouped Highlight records
+and card dictionaries in one pass - filtering, formatting, grouping and card
+building happen per row, with no intermediate DataFrame copies.
+"""
+
+from highlight_dates import GROUPINGS, UNKNOWN_SPORT, normalize_date_key
+from highlight_filters import classify_row
+from highlight_records import SOURCE_FIELDS, ColumnIndex, highlight_from_fields
+
+# Import config
+try:
+    from config import GROUP_BY_DATE
+except ImportError:
+    GROUP_BY_DATE = False
+
+# COLUMN_MAPPINGS key -> highlight field name, for the eligibility rules
+FIELD_NAMES = {key: field for field, key in SOURCE_FIELDS}
+
+
+class FusedHighlightsPipeline:
+    """
+    Single-pass highlights pipeline with per-stage counters
+
+    Stages (per row): read -> filter -> format -> group -> card.
+    Counters are available in self.stats after run().
+    """
+
+    def __init__(self, card_builder, card_finalizer=None, group_by_date=None, groupings=None):
+        """
+        Args:
+            card_builder: Callable(highlight, index, group_key) returning a card dictionary
+            card_finalizer: Callable(cards) that sorts/re-indexes a group's cards in place
+            group_by_date: Group by date (True) or sport (False), defaults to config
+            groupings: Several groupings to build in the same pass ('date', 'sport',
+                       'date_sport'); overrides group_by_date
+        """
+        self.card_builder = card_builder
+        self.card_finalizer = card_finalizer
+        self.group_by_date = GROUP_BY_DATE if group_by_date is None else group_by_date
+        if groupings:
+            self.groupings = tuple(groupings)
+        else:
+            self.groupings = ('date',) if self.group_by_date else ('sport',)
+        unknown = set(self.groupings) - set(GROUPINGS)
+        if unknown:
+            raise ValueError(f"Unknown grouping(s): {sorted(unknown)} (expected {GROUPINGS})")
+        self.stats = {}
+
+    def run(self, headers, rows):
+        """
+        Run the pipeline over raw sheet rows
+
+        Args:
+            headers: Header row values
+            rows: Iterable of data rows (lists of cell values)
+
+        Returns:
+            Tuple of (grouped highlights, grouped cards) for the first grouping, both
+            dictionaries keyed by group in order of first appearance
+        """
+        return self.run_groupings(headers, rows)[self.groupings[0]]
+
+    def run_groupings(self, headers, rows):
+        """
+        Run the pipeline over raw sheet rows, grouping every record once per grouping
+
+        Highlight records are shared between groupings; each card is built once and
+        copied for the other groupings (they are re-indexed per group).
+
+        Returns:
+            Dictionary mapping grouping -> (grouped highlights, grouped cards)
+        """
+        columns = ColumnIndex(headers)
+        groupings = self.groupings
+        results = {grouping: ({}, {}) for grouping in groupings}
+        stats = dict.fromkeys(
+            ('rows_read', 'rows_filtered_out', 'rows_h2h', 'rows_non_h2h',
+             'highlights_formatted', 'groups', 'cards_built'), 0
+        )
+
+        for values in rows:
+            stats['rows_read'] += 1
+
+            # Filter: the rules in highlight_filters, applied to this row
+            fields = columns.read(values)
+            stripped = {field: value.strip() for field, value in fields.items()}
+            kind = classify_row(lambda key: stripped[FIELD_NAMES[key]])
+            if kind is None:
+                stats['rows_filtered_out'] += 1
+                continue
+            stats[f'rows_{kind}'] += 1
+
+            # Format
+            highlight = highlight_from_fields(fields, stripped)
+            stats['highlights_formatted'] += 1
+
+            # Group
+            date_key = sport_key = None
+            card = None
+            for grouping in groupings:
+                if grouping != 'sport' and date_key is None:
+                    date_key = normalize_date_key(fields['date_sgp'])
+                if grouping != 'date' and sport_key is None:
+                    sport_key = fields['sport'] if stripped['sport'] else UNKNOWN_SPORT
+                if grouping == 'date':
+                    key = date_key
+                elif grouping == 'sport':
+                    key = sport_key
+                else:
+                    key = (date_key, sport_key)
+
+                grouped, grouped_cards = results[grouping]
+                group = grouped.get(key)
+                if group is None:
+                    group = grouped[key] = []
+                    grouped_cards[key] = []
+                    stats['groups'] += 1
+                group.append(highlight)
+
+                # Card (built for the first grouping, copied for the others)
+                cards = grouped_cards[key]
+                if card is None:
+                    card = self.card_builder(highlight, len(cards) + 1, key)
+                    stats['cards_built'] += 1
+                    cards.append(card)
+                else:
+                    cards.append(dict(card, index=len(cards) + 1))
+
+        if self.card_finalizer is not None:
+            for grouped, grouped_cards in results.values():
+                for cards in grouped_cards.values():
+                    self.card_finalizer(cards)
+
+        self.stats = stats
+        return results
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Compiled highlight records for the Highlights Generator
+Resolves COLUMN_MAPPINGS to positional indexes once per sheet, then builds
+compact slotted Highlight records straight from raw row value lists
+(as returned by worksheet.get_all_values() or DataFrame.itertuples()).
+"""
+
+from operator import itemgetter
+
+# Import config
+try:
+    from config import COLUMN_MAPPINGS
+except ImportError:
+    COLUMN_MAPPINGS = {}
+
+
+# Highlight field name -> COLUMN_MAPPINGS key, in the order format_highlight_data used
+SOURCE_FIELDS = (
+    ('sport', 'SPORT'),
+    ('discipline', 'DISCIPLINE'),
+    ('event', 'EVENT'),
+    ('event_gender', 'EVENT_GENDER'),
+    ('stage', 'STAGE'),
+    ('heat', 'HEAT'),
+    ('venue', 'VENUE'),
+    ('city', 'CITY'),
+    ('date_sgp', 'DATE_SGP'),
+    ('time_start_sgp', 'TIME_START_SGP'),
+    ('time_end_sgp', 'TIME_END_SGP'),
+    ('athlete_name', 'ATHLETE_NAME'),
+    ('country_sgp', 'COUNTRY_SGP'),
+    ('timing_raw', 'TIMING_SGP'),
+    ('personal_best', 'PERSONAL_BEST'),
+    ('national_record', 'NATIONAL_RECORD'),
+    ('pb_nr', 'PB_NR'),
+    ('score_sgp', 'SCORE_SGP'),
+    ('score_competitor', 'SCORE_COMPETITOR'),
+    ('competitor_name', 'COMPETITOR_NAME'),
+    ('competitor_country', 'COMPETITOR_COUNTRY'),
+    ('win_draw_lose', 'WIN_DRAW_LOSE'),
+    ('position', 'POSITION'),
+    ('total_competitors', 'TOTAL_COMPETITORS'),
+    ('final_position', 'FINAL_POSITION'),
+    ('total_in_event', 'TOTAL_IN_EVENT'),
+    ('advanced', 'ADVANCED'),
+    ('medals', 'MEDALS'),
+    ('remarks', 'REMARKS'),
+)
+
+# Fields derived from the source fields when a record is built
+DERIVED_FIELDS = ('timing_sgp', 'highlights_text', 'type')
+
+# Public highlight keys, in the same order as the old highlight dictionaries
+HIGHLIGHT_KEYS = (
+    'sport', 'discipline', 'event', 'event_gender', 'stage', 'heat', 'venue', 'city',
+    'date_sgp', 'time_start_sgp', 'time_end_sgp', 'athlete_name', 'country_sgp',
+    'timing_sgp', 'personal_best', 'national_record', 'pb_nr', 'score_sgp',
+    'score_competitor', 'competitor_name', 'competitor_country', 'win_draw_lose',
+    'position', 'total_competitors', 'final_position', 'total_in_event', 'advanced',
+    'medals', 'highlights_text', 'remarks', 'type'
+)
+_HIGHLIGHT_KEY_SET = frozenset(HIGHLIGHT_KEYS)
+
+# Columns that mark a row as head-to-head when any of them has a value
+H2H_FIELDS = ('competitor_name', 'competitor_country', 'score_competitor', 'win_draw_lose')
+
+
+def clean_cell(value):
+    """Normalize a raw cell value to a string ('' for missing values)"""
+    if isinstance(value, str):
+        return value
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value)
+
+
+def format_timing(timing_str):
+    """
+    Remove "00:", "0:" at start and ":00:" if present
+    Example: "00:02:00.94" -> "02:00.94", "0:2:00.94" -> "2:00.94", "00:00:23.45" -> "23.45"
+    """
+    timing_str = clean_cell(timing_str).strip()
+    if not timing_str:
+        return ''
+
+    result = timing_str
+
+    # Remove "00:" from the start if present
+    if result.startswith('00:'):
+        result = result[3:]
+    # Remove "0:" from the start if present (after checking for "00:")
+    elif result.startswith('0:'):
+        result = result[2:]
+
+    # Remove ":00:" if present (zero minutes)
+    return result.replace(':00:', ':')
+
+
+def build_highlights_text(sport, event, stage, athlete_name, competitor_name,
+                          competitor_country, score_sgp, score_competitor, timing_sgp):
+    """
+    Generate highlights text from stripped field values
+
+    Returns:
+        String with generated highlights text
+    """
+    parts = []
+    if sport:
+        parts.append(sport)
+    if event:
+        parts.append(event)
+    if stage:
+        parts.append(stage)
+    if athlete_name:
+        parts.append(f"{athlete_name} (SGP)")
+
+    result_parts = []
+    if competitor_name and competitor_country:
+        # H2H format: SPORT, EVENT, STAGE, ATHLETE(SGP), COMPETITOR, COUNTRY, SCORE(SGP), SCORE(COMPETITOR)
+        parts.append(f"vs {competitor_name} ({competitor_country})")
+
+        if score_sgp and score_competitor:
+            result_parts.append(f"{score_sgp}-{score_competitor}")
+        elif score_sgp:
+            result_parts.append(score_sgp)
+        elif score_competitor:
+            result_parts.append(f"Opponent: {score_competitor}")
+    else:
+        # Non-H2H format: SPORT, EVENT, STAGE, ATHLETE(SGP), TIMING or SCORE
+        if timing_sgp:
+            result_parts.append(f"Time: {timing_sgp}")
+        elif score_sgp:
+            result_parts.append(f"Score: {score_sgp}")
+
+    return " | ".join(parts + result_parts)
+
+
+class ColumnIndex:
+    """COLUMN_MAPPINGS resolved to positional indexes for one header row"""
+
+    __slots__ = ('headers', 'positions', '_present', '_getter', '_width')
+
+    def __init__(self, headers):
+        """
+        Args:
+            headers: Header row values (stripped before matching)
+        """
+        self.headers = [clean_cell(h).strip() for h in headers]
+
+        first_position = {}
+        for position, header in enumerate(self.headers):
+            first_position.setdefault(header, position)
+
+        self.positions = {}
+        for key in COLUMN_MAPPINGS.keys() | {key for _, key in SOURCE_FIELDS}:
+            self.positions[key] = first_position.get(COLUMN_MAPPINGS.get(key, key))
+
+        # Fields whose column exists, read with one itemgetter call per row
+        self._present = tuple(
+            (field, self.positions[key]) for field, key in SOURCE_FIELDS
+            if self.positions[key] is not None
+        )
+        positions = [position for _, position in self._present]
+        if len(positions) == 1:
+            single = itemgetter(positions[0])
+            self._getter = lambda values: (single(values),)
+        elif positions:
+            self._getter = itemgetter(*positions)
+        else:
+            self._getter = lambda values: ()
+        self._width = max(positions) + 1 if positions else 0
+
+    def position(self, key):
+        """Return the column position for a COLUMN_MAPPINGS key (None if missing)"""
+        return self.positions.get(key)
+
+    def value(self, values, key, default=''):
+        """Return the raw cell for a COLUMN_MAPPINGS key from a row of values"""
+        position = self.positions.get(key)
+        if position is None or position >= len(values):
+            return default
+        return values[position]
+
+    def read(self, values):
+        """Return {field: cleaned value} for every source field of a row"""
+        if len(values) < self._width:
+            values = list(values) + [''] * (self._width - len(values))
+        fields = dict.fromkeys((field for field, _ in SOURCE_FIELDS), '')
+        for (field, _), value in zip(self._present, self._getter(values)):
+            fields[field] = clean_cell(value)
+        return fields
+
+
+class Highlight:
+    """Compact highlight record - a drop-in for the old highlight dictionaries"""
+
+    __slots__ = tuple(field for field, _ in SOURCE_FIELDS) + DERIVED_FIELDS
+
+    def get(self, key, default=None):
+        """Dictionary-style access used by the card builders"""
+        return getattr(self, key, default) if key in _HIGHLIGHT_KEY_SET else default
+
+    def __getitem__(self, key):
+        if key not in _HIGHLIGHT_KEY_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in _HIGHLIGHT_KEY_SET
+
+    def keys(self):
+        return HIGHLIGHT_KEYS
+
+    def to_dict(self):
+        """Return the record as a plain highlight dictionary"""
+        return {key: getattr(self, key) for key in HIGHLIGHT_KEYS}
+
+    def __repr__(self):
+        return f"Highlight(sport={self.sport!r}, event={self.event!r}, athlete_name={self.athlete_name!r})"
+
+
+def build_highlight(values, columns):
+    """
+    Build a Highlight record from one row of raw values
+
+    Args:
+        values: Sequence of cell values for one sheet row
+        columns: ColumnIndex for the sheet's header row
+
+    Returns:
+        Highlight record
+    """
+    return highlight_from_fields(columns.read(values))
+
+
+def highlight_from_fields(fields, stripped=None):
+    """
+    Build a Highlight record from the {field: value} dictionary of ColumnIndex.read()
+
+    Args:
+        fields: Cleaned source field values
+        stripped: The same values already stripped (computed if not given)
+
+    Returns:
+        Highlight record
+    """
+    if stripped is None:
+        stripped = {field: value.strip() for field, value in fields.items()}
+
+    record = Highlight()
+    for field, value in fields.items():
+        setattr(record, field, value)
+
+    record.timing_sgp = format_timing(fields['timing_raw'])
+    record.highlights_text = build_highlights_text(
+        stripped['sport'], stripped['event'], stripped['stage'], stripped['athlete_name'],
+        stripped['competitor_name'], stripped['competitor_country'],
+        stripped['score_sgp'], stripped['score_competitor'], stripped['timing_raw']
+    )
+    record.type = 'h2h' if any(stripped[field] for field in H2H_FIELDS) else 'non-h2h'
+
+    return record
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Cumulative medal tally for the Highlights Generator
+Keeps running gold/silver/bronze totals per date, sport and athlete across runs.
+Medals are recorded per page group together with the group's content hash, so a
+run only re-reads the groups whose highlights changed; totals for unchanged groups
+come from the saved state (output/.cache/medal_tally.json).
+"""
+
+import json
+import logging
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from highlight_dates import UNKNOWN_SPORT, normalize_date_key
+
+logger = logging.getLogger(__name__)
+
+MEDAL_KINDS = ('gold', 'silver', 'bronze')
+MEDAL_ICONS = {'gold': '🥇', 'silver': '🥈', 'bronze': '🥉'}
+NO_MEDAL_VALUES = frozenset(('na', 'n/a', 'none', 'no medal', 'nil'))
+DIMENSIONS = ('date', 'sport', 'athlete')
+
+
+@lru_cache(maxsize=None)
+def medal_kind(value):
+    """
+    Classify a MEDALS cell as 'gold', 'silver', 'bronze' or None
+
+    Same rules as the card medal badges: blanks and NA/none/nil are no medal,
+    otherwise the first of gold/silver/bronze found in the text wins.
+    """
+    medal_key = str(value or '').strip().lower()
+    if not medal_key or medal_key in NO_MEDAL_VALUES:
+        return None
+    for kind in MEDAL_KINDS:
+        if kind in medal_key:
+            return kind
+    return None
+
+
+def count_medals(highlights):
+    """Gold, silver and bronze counts for a list of highlights"""
+    counts = dict.fromkeys(MEDAL_KINDS, 0)
+    for highlight in highlights:
+        kind = medal_kind(highlight.get('medals'))
+        if kind:
+            counts[kind] += 1
+    return counts
+
+
+def sport_key(value):
+    """
+    Tally key for a SPORT cell: stripped, or 'Unknown' when blank
+
+    Page group keys keep the raw cell ('Swimming '), so lookups go through this too.
+    """
+    return str(value or '').strip() or UNKNOWN_SPORT
+
+
+def _is_iso_date(key):
+    return len(key) == 10 and key[4] == '-' and key[7] == '-' and key.replace('-', '').isdigit()
+
+
+class MedalTally:
+    """Running medal totals per date, sport and athlete, updated per changed group"""
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path: JSON state file (None keeps the tally in memory only)
+        """
+        self.path = Path(path) if path else None
+        self.groups = {}
+        self.totals = {dimension: {} for dimension in DIMENSIONS}
+        self.overall = dict.fromkeys(MEDAL_KINDS, 0)
+        # (sport, date) -> counts, for per-sport tallies to date
+        self.sport_dates = {}
+        self.last_update = {}
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                groups = json.load(f).get('groups', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable medal tally {self.path}: {e}")
+            return
+        # Totals are rebuilt from the stored medal entries (medal rows only, never the sheet)
+        for group_key, group in groups.items():
+            self.groups[group_key] = group
+            self._apply(group['medals'], 1)
+
+    def _apply(self, medals, sign):
+        """Add (sign=1) or remove (sign=-1) medal entries from the running totals"""
+        for date, sport, athlete, kind in medals:
+            self.overall[kind] += sign
+            for table, key in ((self.totals['date'], date), (self.totals['sport'], sport),
+                               (self.totals['athlete'], athlete), (self.sport_dates, (sport, date))):
+                counts = table.get(key)
+                if counts is None:
+                    counts = table[key] = dict.fromkeys(MEDAL_KINDS, 0)
+                counts[kind] += sign
+                if sign < 0 and not any(counts.values()):
+                    del table[key]
+
+    def update(self, grouped_highlights, digests):
+        """
+        Bring the tally up to date with the current groups
+
+        Args:
+            grouped_highlights: Dictionary of group key -> highlights
+            digests: Dictionary of group key -> content hash of the group's highlights
+
+        Returns:
+            Number of groups re-read (new or changed) plus groups removed
+        """
+        changed = 0
+        for group_key, highlights in grouped_highlights.items():
+            key = str(group_key)
+            digest = digests[group_key]
+            group = self.groups.get(key)
+            if group is not None and group['digest'] == digest:
+                continue
+
+            medals = []
+            for highlight in highlights:
+                kind = medal_kind(highlight.get('medals'))
+                if kind:
+                    sport = sport_key(highlight.get('sport'))
+                    athlete = (highlight.get('athlete_name') or '').strip()
+                    medals.append([normalize_date_key(highlight.get('date_sgp') or ''), sport, athlete, kind])
+
+            if group is not None:
+                self._apply(group['medals'], -1)
+            self._apply(medals, 1)
+            self.groups[key] = {'digest': digest, 'medals': medals}
+            changed += 1
+
+        current = {str(group_key) for group_key in grouped_highlights}
+        removed = [key for key in self.groups if key not in current]
+        for key in removed:
+            self._apply(self.groups.pop(key)['medals'], -1)
+
+        self.last_update = {'groups_updated': changed, 'groups_removed': len(removed),
+                            'groups_unchanged': len(grouped_highlights) - changed}
+        logger.info(f"Medal tally: {changed} group(s) updated, {len(removed)} removed, "
+                    f"{self.last_update['groups_unchanged']} unchanged - "
+                    + ', '.join(f"{self.overall[kind]} {kind}" for kind in MEDAL_KINDS))
+        return changed + len(removed)
+
+    def counts(self, dimension, key):
+        """Medal counts for one date, sport or athlete"""
+        if dimension == 'sport':
+            key = sport_key(key)
+        return dict(self.totals[dimension].get(key) or dict.fromkeys(MEDAL_KINDS, 0))
+
+    def to_date(self, date_key, sport=None):
+        """
+        Cumulative medal counts up to and including a date, optionally for one sport
+
+        Only YYYY-MM-DD dates are ordered; for other keys the overall (or sport) totals
+        are returned.
+        """
+        if not _is_iso_date(str(date_key)):
+            return dict(self.overall) if sport is None else self.counts('sport', sport)
+        if sport is None:
+            per_date = self.totals['date'].items()
+        else:
+            sport = sport_key(sport)
+            per_date = ((date, counts) for (name, date), counts in self.sport_dates.items() if name == sport)
+        totals = dict.fromkeys(MEDAL_KINDS, 0)
+        for date, counts in per_date:
+            if _is_iso_date(date) and date <= date_key:
+                for kind in MEDAL_KINDS:
+                    totals[kind] += counts[kind]
+        return totals
+
+    def latest_date(self):
+        """Latest YYYY-MM-DD date with a medal ('' if none)"""
+        return max((date for date in self.totals['date'] if _is_iso_date(date)), default='')
+
+    def standings(self, dimension):
+        """
+        Rows sorted by gold, silver, bronze (descending), then name
+
+        Returns:
+            List of dictionaries with name, gold, silver, bronze and total
+        """
+        rows = [
+            {'name': name, **counts, 'total': sum(counts.values())}
+            for name, counts in self.totals[dimension].items()
+        ]
+        rows.sort(key=lambda row: (-row['gold'], -row['silver'], -row['bronze'], row['name']))
+        return rows
+
+    def save(self):
+        """Write the tally state atomically"""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'groups': self.groups}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
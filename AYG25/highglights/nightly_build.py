@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Combined nightly build: highlights pages and every day's schedule page
+Both generators share one SheetSession, so the run authorizes and opens the
+spreadsheet once and fetches 'Sheet17' and the competition schedule together (one
+batched header request and one batched request for their columns) instead of one
+connection and download per generator.
+"""
+
+import logging
+
+from generate_daily_schedule import DailyScheduleGenerator
+from generate_highlights import HighlightsGenerator
+from highlight_dates import GROUPINGS
+from sheet_session import SheetSession
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate the highlights and daily schedule pages '
+                                                 'from one batched Google Sheets fetch')
+    parser.add_argument('--spreadsheet-id', type=str, default=None,
+                       help='Google Sheets spreadsheet ID (defaults to config.py)')
+    parser.add_argument('--credentials', type=str, default=None,
+                       help='Path to Google credentials JSON file (defaults to config.py)')
+    parser.add_argument('--groupings', nargs='+', choices=GROUPINGS, default=None,
+                       help="Highlights page sets to render: 'date', 'sport' and/or 'date_sport' "
+                            "(defaults to date or sport per GROUP_BY_DATE in config.py)")
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for rendering pages (default: 1, sequential)')
+    parser.add_argument('--tally', action='store_true', default=None,
+                       help='Add "tally to date" cards and write medal_standings.html '
+                            '(defaults to MEDAL_TALLY in config.py)')
+    parser.add_argument('--precompress', action='store_true', default=None,
+                       help='Write .gz/.br siblings of the generated pages (defaults to PRECOMPRESS in config.py)')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Ignore the cached sheet snapshots and fetch both worksheets')
+    parser.add_argument('--snapshot-ttl', type=int, default=None,
+                       help='Seconds a cached sheet snapshot is reused (defaults to SNAPSHOT_TTL in config.py)')
+
+    args = parser.parse_args()
+
+    try:
+        session = SheetSession(spreadsheet_id=args.spreadsheet_id, credentials_file=args.credentials)
+        # Both generators register their worksheet before the first fetch, so it fetches both
+        highlights = HighlightsGenerator(session=session, refresh=args.refresh, snapshot_ttl=args.snapshot_ttl)
+        schedule = DailyScheduleGenerator(session=session, refresh=args.refresh, snapshot_ttl=args.snapshot_ttl)
+
+        highlights.generate_all(workers=args.workers, fused=True, tally=args.tally, groupings=args.groupings,
+                                precompress=args.precompress)
+        schedule.generate_dates(workers=args.workers, precompress=args.precompress)
+
+        logger.info(f"Nightly build done with {session.batch_calls} batched sheet request(s)")
+    except Exception as e:
+        logger.error(f"Nightly build failed: {str(e)}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
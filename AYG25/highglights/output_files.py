@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Atomic output file writing for generated pages
+Chunks are streamed to a hidden temp file next to the target, which is then
+renamed into place, so readers (e.g. the screenshot scripts) never see a
+half-written page.
+"""
+
+import os
+import uuid
+from pathlib import Path
+
+
+def write_atomic(path, chunks, encoding='utf-8'):
+    """
+    Stream text chunks to path atomically
+
+    Args:
+        path: Destination file
+        chunks: Iterable of strings (e.g. Template.generate()) or a single string
+        encoding: Text encoding
+
+    Returns:
+        Number of characters written
+    """
+    path = Path(path)
+    if isinstance(chunks, str):
+        chunks = (chunks,)
+
+    # Dot-prefixed so glob patterns like highlights_*.html never match it
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    written = 0
+    try:
+        with open(tmp_path, 'x', encoding=encoding) as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return written
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Precompressed siblings for static output
+Writes <file>.gz (and <file>.br when the Brotli package is installed) next to every
+HTML, CSS and JSON file, so static hosts that serve precompressed files (nginx
+gzip_static/brotli_static, Netlify, S3 + CloudFront with the right metadata, ...)
+never compress on the fly. Source content hashes are kept in .precompress.json in
+the root directory; only files whose hash changed are recompressed, in a process pool.
+
+Usage:
+    python precompress.py output static_widgets
+    python precompress.py static_widgets --workers 4
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+PRECOMPRESS_SUFFIXES = ('.html', '.css', '.json')
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+PRECOMPRESS_MANIFEST = '.precompress.json'
+
+
+def _write_bytes_atomic(path, data):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _compress_worker(path):
+    """
+    Write the .gz/.br siblings of one file (module-level so it can be pickled)
+
+    Returns:
+        Tuple of (path, original size, gzip size, brotli size or None)
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    # mtime=0 so identical content always gives identical .gz bytes
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    _write_bytes_atomic(path.with_name(path.name + '.gz'), gz)
+    br_size = None
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        _write_bytes_atomic(path.with_name(path.name + '.br'), br)
+        br_size = len(br)
+    return str(path), len(data), len(gz), br_size
+
+
+def _is_hidden(path, root):
+    return any(part.startswith('.') for part in path.relative_to(root).parts)
+
+
+class Precompressor:
+    """Keeps .gz/.br siblings of a directory's text files in sync with their content"""
+
+    def __init__(self, root, workers=None):
+        """
+        Args:
+            root: Directory whose HTML/CSS/JSON files are compressed (hidden entries skipped)
+            workers: Worker processes (defaults to the CPU count; 1 compresses in-process)
+        """
+        self.root = Path(root)
+        self.workers = workers or os.cpu_count() or 1
+        self.manifest_path = self.root / PRECOMPRESS_MANIFEST
+        self.hashes = {}
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    self.hashes = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable precompress manifest {self.manifest_path}: {e}")
+        self.stats = {}
+
+    def source_files(self):
+        """Every HTML/CSS/JSON file under the root, hidden files and directories excluded"""
+        return sorted(
+            path for path in self.root.rglob('*')
+            if path.suffix in PRECOMPRESS_SUFFIXES and path.is_file() and not _is_hidden(path, self.root)
+        )
+
+    def _siblings_exist(self, path):
+        if not path.with_name(path.name + '.gz').exists():
+            return False
+        return brotli is None or path.with_name(path.name + '.br').exists()
+
+    def run(self, files=None):
+        """
+        Compress new and changed files
+
+        Args:
+            files: Files to consider (default: every source file under the root; only a
+                   full run removes siblings of deleted files)
+
+        Returns:
+            Dictionary of counts and byte totals for the files compressed in this run
+        """
+        full_run = files is None
+        files = self.source_files() if full_run else [Path(path) for path in files]
+
+        jobs = []
+        current = {}
+        for path in files:
+            key = path.relative_to(self.root).as_posix()
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            current[key] = digest
+            if self.hashes.get(key) != digest or not self._siblings_exist(path):
+                jobs.append(str(path))
+
+        if self.workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as executor:
+                results = list(executor.map(_compress_worker, jobs))
+        else:
+            results = [_compress_worker(path) for path in jobs]
+
+        removed = 0
+        if full_run:
+            # Siblings whose source file is gone
+            for suffix in COMPRESSED_SUFFIXES:
+                for sibling in self.root.rglob(f"*{suffix}"):
+                    source = sibling.with_name(sibling.name[:-len(suffix)])
+                    if source.suffix in PRECOMPRESS_SUFFIXES and not source.exists() \
+                            and not _is_hidden(sibling, self.root):
+                        sibling.unlink()
+                        removed += 1
+            self.hashes = current
+        else:
+            self.hashes.update(current)
+        self.root.mkdir(parents=True, exist_ok=True)
+        _write_bytes_atomic(self.manifest_path,
+                            json.dumps(self.hashes, indent=1, sort_keys=True).encode('utf-8'))
+
+        original = sum(result[1] for result in results)
+        gz_total = sum(result[2] for result in results)
+        br_total = sum(result[3] for result in results if result[3] is not None)
+        self.stats = {
+            'files': len(files), 'compressed': len(results), 'unchanged': len(files) - len(results),
+            'siblings_removed': removed, 'original_bytes': original, 'gzip_bytes': gz_total,
+            'brotli_bytes': br_total if brotli is not None else None
+        }
+
+        summary = f"Precompressed {len(results)} of {len(files)} file(s) in {self.root}"
+        if original:
+            summary += f": {original / 1024:.0f} KB -> gzip {gz_total / 1024:.0f} KB ({gz_total / original:.1%})"
+            if brotli is not None:
+                summary += f", brotli {br_total / 1024:.0f} KB ({br_total / original:.1%})"
+        if removed:
+            summary += f", {removed} stale sibling(s) removed"
+        logger.info(summary)
+        for path, size, gz_size, br_size in results:
+            ratio = f"gzip {gz_size / size:.1%}" if size else "empty"
+            if br_size is not None and size:
+                ratio += f", brotli {br_size / size:.1%}"
+            logger.debug(f"   - {Path(path).relative_to(self.root)}: {size} bytes, {ratio}")
+        return self.stats
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description='Write .gz/.br siblings for HTML, CSS and JSON files')
+    parser.add_argument('directories', nargs='+', help='Directories to precompress (e.g. output static_widgets)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    if brotli is None:
+        logger.info("Brotli package not installed, writing .gz files only (pip install Brotli)")
+    for directory in args.directories:
+        Precompressor(directory, workers=args.workers).run()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Render manifest for incremental page generation
+Stores a content hash per generated page so unchanged pages can be skipped
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def hash_highlights(group_key, highlights, fingerprint=''):
+    """
+    Content hash of a group's normalized highlight records
+
+    Args:
+        group_key: Date or sport name
+        highlights: List of Highlight records (or highlight dictionaries)
+        fingerprint: Extra render inputs (template source, grouping mode, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    records = [h.to_dict() if hasattr(h, 'to_dict') else dict(h) for h in highlights]
+    payload = json.dumps(
+        {'group': str(group_key), 'fingerprint': fingerprint, 'records': records},
+        sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def combine_digests(*parts):
+    """Hex SHA-256 digest of several digests/strings (e.g. a data hash plus extra page inputs)"""
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def hash_file(path):
+    """Hex SHA-256 digest of a file's bytes ('' if it does not exist)"""
+    path = Path(path)
+    if not path.exists():
+        return ''
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class RenderManifest:
+    """JSON manifest mapping output filenames to the content hash they were built from"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable manifest {self.path}: {e}")
+                self.entries = {}
+
+    def is_current(self, output_file, digest):
+        """True if output_file exists and was built from content with this digest"""
+        output_file = Path(output_file)
+        return output_file.exists() and self.entries.get(output_file.name) == digest
+
+    def update(self, output_file, digest):
+        self.entries[Path(output_file).name] = digest
+
+    def save(self):
+        """Write the manifest atomically"""
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
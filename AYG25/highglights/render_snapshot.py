@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Fast-start highlights renderer for cached sheet data
+Re-renders the highlights pages from the sheet snapshot in output/.cache using the
+single-pass pipeline, so neither pandas nor gspread/google-auth is imported. Useful
+for quick re-renders while tweaking templates and before taking screenshots.
+
+With --allow-fetch a missing or stale snapshot is fetched from Google Sheets instead
+(gspread is then imported on demand).
+"""
+
+import logging
+
+from generate_highlights import PROFILE_REPORT, HighlightsGenerator
+from highlight_dates import GROUPINGS
+from sheet_fetch import FETCH_MODES
+from stage_profiler import StageProfiler
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Render highlights pages from the cached sheet snapshot')
+    parser.add_argument('--spreadsheet-id', type=str, default=None,
+                       help='Google Sheets spreadsheet ID the snapshot was fetched from (defaults to config.py)')
+    parser.add_argument('--sheet-name', type=str, default=None,
+                       help='Worksheet name the snapshot was fetched from (defaults to config.py)')
+    parser.add_argument('--fetch-mode', choices=FETCH_MODES, default=None,
+                       help='Fetch mode the snapshot was taken with (defaults to FETCH_MODE in config.py)')
+    parser.add_argument('--allow-fetch', action='store_true',
+                       help='Fetch the sheet when the snapshot is missing or older than the snapshot TTL')
+    parser.add_argument('--snapshot-ttl', type=int, default=None,
+                       help='With --allow-fetch, seconds a snapshot is reused (defaults to SNAPSHOT_TTL in config.py)')
+    parser.add_argument('--credentials', type=str, default=None,
+                       help='With --allow-fetch, path to Google credentials JSON file (defaults to config.py)')
+    parser.add_argument('--groupings', nargs='+', choices=GROUPINGS, default=None,
+                       help="Page sets to render: 'date', 'sport' and/or 'date_sport' "
+                            "(defaults to date or sport per GROUP_BY_DATE in config.py)")
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of worker processes for rendering pages (default: 1, sequential)')
+    parser.add_argument('--force', action='store_true',
+                       help='Rebuild all pages, even those whose data has not changed')
+    parser.add_argument('--tally', action='store_true', default=None,
+                       help='Add "tally to date" cards and write medal_standings.html '
+                            '(defaults to MEDAL_TALLY in config.py)')
+    parser.add_argument('--publish-assets', action='store_true', default=None,
+                       help='Reference content-hashed copies of styles.css and the flag images in output/assets/ '
+                            '(defaults to PUBLISH_ASSETS in config.py)')
+    parser.add_argument('--feeds', action='store_true', default=None,
+                       help='Also write per-day JSON feeds to output/feeds/ (defaults to JSON_FEEDS in config.py)')
+    parser.add_argument('--precompress', action='store_true', default=None,
+                       help='Write .gz/.br siblings of changed HTML/CSS/JSON files (defaults to PRECOMPRESS in config.py)')
+    parser.add_argument('--profile', nargs='?', const=str(PROFILE_REPORT), default=None, metavar='REPORT',
+                       help='Record wall/CPU time, rows and peak memory per stage and write a JSON report')
+
+    args = parser.parse_args()
+    profiler = StageProfiler(enabled=args.profile is not None)
+
+    try:
+        generator = HighlightsGenerator(
+            spreadsheet_id=args.spreadsheet_id,
+            sheet_name=args.sheet_name,
+            credentials_file=args.credentials,
+            fetch_mode=args.fetch_mode,
+            offline=not args.allow_fetch,
+            snapshot_ttl=args.snapshot_ttl,
+            profiler=profiler
+        )
+        # The fused pipeline works on the raw rows, so pandas is never imported
+        generator.generate_all(workers=args.workers, force=args.force, fused=True, tally=args.tally,
+                               groupings=args.groupings, publish_assets=args.publish_assets,
+                               feeds=args.feeds, precompress=args.precompress)
+        if profiler.enabled:
+            profiler.write_report(args.profile, command='render_snapshot')
+    except FileNotFoundError as e:
+        logger.error(f"{e} - run generate_highlights.py (or pass --allow-fetch) to create the snapshot")
+        return 1
+    except Exception as e:
+        logger.error(f"Failed to render highlights: {str(e)}")
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Columnar schedule records for the Daily Schedule Generator
+Parses the schedule sheet a column at a time - dates in one pd.to_datetime call over
+the distinct values, start times with one regex extract, NA tokens with isin masks -
+and returns a numpy record array (one record per scheduled event) instead of a list
+of dictionaries. Records support attribute access (item.time, item.event, ...), so
+the schedule template renders them unchanged.
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Import config
+try:
+    from config import COLUMN_MAPPINGS
+except ImportError:
+    COLUMN_MAPPINGS = {}
+
+# Cell values treated as empty (compared case-insensitively)
+NA_TOKENS = ('', 'na', 'n/a', 'none')
+
+# HH:MM or HH:MM:SS - anything after the minutes must start with another ':'
+TIME_PATTERN = r'^([+-]?\d+)\s*:\s*([+-]?\d+)\s*(?::|$)'
+
+# Record fields, in the order of the old schedule item dictionaries plus 'start'
+# (the date with the start time applied, used by the time window filter)
+RECORD_DTYPE = np.dtype([
+    ('date', 'datetime64[ns]'),
+    ('start', 'datetime64[ns]'),
+    ('date_str', object),
+    ('time', object),
+    ('sport', object),
+    ('discipline', object),
+    ('sport_header', object),
+    ('event', object),
+    ('stage', object),
+    ('athlete', object),
+])
+
+
+def empty_records():
+    """Record array with no rows"""
+    return np.rec.array(np.empty(0, dtype=RECORD_DTYPE))
+
+
+def _column(df, key, default):
+    """Stripped string values of a mapped column ('' for missing cells or an absent column)"""
+    col = COLUMN_MAPPINGS.get(key, default)
+    if col not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    series = df[col]
+    if isinstance(series, pd.DataFrame):
+        # Duplicate header names - use the first matching column
+        series = series.iloc[:, 0]
+    return series.astype(object).where(series.notna(), '').astype(str).str.strip()
+
+
+def _optional(series):
+    """Values as objects, with NA tokens replaced by None"""
+    values = series.to_numpy(dtype=object)
+    values[series.str.lower().isin(NA_TOKENS).to_numpy()] = None
+    return values
+
+
+def parse_dates(date_strs):
+    """
+    Parse date strings, each distinct value only once
+
+    Returns:
+        datetime64[ns] array with NaT for unparseable values
+    """
+    codes, uniques = pd.factorize(date_strs, sort=False)
+    parsed = pd.to_datetime(pd.Series(uniques, dtype=object), errors='coerce', format='mixed')
+    return parsed.to_numpy(dtype='datetime64[ns]')[codes]
+
+
+def start_times(dates, time_strs):
+    """
+    Dates with the HH:MM start time applied
+
+    Rows whose time is missing or not a valid 24-hour time keep the plain date.
+    """
+    parts = time_strs.str.extract(TIME_PATTERN)
+    hours = pd.to_numeric(parts[0], errors='coerce').to_numpy(dtype=float)
+    minutes = pd.to_numeric(parts[1], errors='coerce').to_numpy(dtype=float)
+    valid = (hours >= 0) & (hours <= 23) & (minutes >= 0) & (minutes <= 59)
+
+    offsets = np.zeros(len(dates), dtype='timedelta64[m]')
+    offsets[valid] = (hours[valid] * 60 + minutes[valid]).astype('int64')
+    days = dates.astype('datetime64[D]').astype('datetime64[ns]')
+    return np.where(valid, days + offsets, dates)
+
+
+def build_schedule_records(df):
+    """
+    Build schedule records from the sheet DataFrame
+
+    Rows without a parseable date or without a sport are dropped.
+
+    Args:
+        df: Schedule sheet DataFrame (header names as in COLUMN_MAPPINGS)
+
+    Returns:
+        numpy record array with RECORD_DTYPE fields
+    """
+    if df.empty:
+        return empty_records()
+
+    date_strs = _column(df, 'DATE_SGP', 'DATE (SGP)')
+    sports = _column(df, 'SPORT', 'SPORT')
+
+    dates = parse_dates(date_strs)
+    keep = (~np.isnat(dates)) & (sports != '').to_numpy()
+    if not keep.any():
+        return empty_records()
+
+    dates = dates[keep]
+    date_strs = date_strs[keep]
+    sports = sports[keep]
+    time_strs = _column(df, 'TIME_START_SGP', 'TIME START (SGP) 24HR CLOCK')[keep]
+    disciplines = _column(df, 'DISCIPLINE', 'DISCIPLINE')[keep]
+
+    # "Sport - Discipline" when the discipline is set and differs from the sport
+    distinct = (disciplines != '') & (disciplines.str.upper() != sports.str.upper())
+    sport_headers = sports.where(~distinct, sports + ' - ' + disciplines)
+
+    return np.rec.fromarrays([
+        dates,
+        start_times(dates, time_strs),
+        date_strs.to_numpy(dtype=object),
+        time_strs.to_numpy(dtype=object),
+        sports.to_numpy(dtype=object),
+        disciplines.to_numpy(dtype=object),
+        sport_headers.to_numpy(dtype=object),
+        _optional(_column(df, 'EVENT', 'EVENT')[keep]),
+        _optional(_column(df, 'STAGE', 'STAGE / ROUND OF COMPETITION')[keep]),
+        _optional(_column(df, 'ATHLETE_NAME', 'NAME OF ATHLETE (SGP)')[keep]),
+    ], dtype=RECORD_DTYPE)
+
+
+def group_records(records, key='sport_header'):
+    """
+    Group records by a field, each group sorted by date then start time string
+
+    Returns:
+        Dictionary mapping field value -> record array, in order of first appearance
+    """
+    if len(records) == 0:
+        return {}
+    codes, uniques = pd.factorize(records[key], sort=False)
+    times = np.array([time or '' for time in records.time], dtype=str)
+    # lexsort is stable, so ties keep their sheet order like list.sort() did
+    order = np.lexsort((times, records.date, codes))
+    sorted_codes = codes[order]
+    bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+    return {
+        uniques[sorted_codes[start]]: records[chunk]
+        for start, chunk in zip(np.r_[0, bounds], np.split(order, bounds))
+    }
+
+
+def partition_by_date(records):
+    """
+    Split records by calendar day in a single pass
+
+    Returns:
+        Dictionary mapping datetime.date -> record array (sheet order), days ascending
+    """
+    if len(records) == 0:
+        return {}
+    days = records.date.astype('datetime64[D]')
+    order = np.argsort(days, kind='stable')
+    sorted_days = days[order]
+    bounds = np.flatnonzero(sorted_days[1:] != sorted_days[:-1]) + 1
+    return {
+        sorted_days[start].item(): records[chunk]
+        for start, chunk in zip(np.r_[0, bounds], np.split(order, bounds))
+    }
+
+
+class ScheduleIndex:
+    """
+    Schedule records with their start times in a sorted array
+
+    Any time window is two binary searches (np.searchsorted) instead of a scan, so one
+    loaded schedule can serve many rolling windows ("next 3h / 6h / 24h").
+    """
+
+    def __init__(self, records):
+        """
+        Args:
+            records: Record array from build_schedule_records()
+        """
+        self.records = records
+        self.order = np.argsort(records.start, kind='stable')
+        self.starts = records.start[self.order]
+
+    def __len__(self):
+        return len(self.records)
+
+    def between(self, start, end):
+        """
+        Records starting in [start, end], in sheet order (so grouping sorts them as before)
+
+        Args:
+            start: Window start (datetime or numpy datetime64)
+            end: Window end, inclusive
+        """
+        lo = np.searchsorted(self.starts, np.datetime64(start), side='left')
+        hi = np.searchsorted(self.starts, np.datetime64(end), side='right')
+        return self.records[np.sort(self.order[lo:hi])]
+
+    def next_hours(self, hours, now=None):
+        """Records starting within the next hours from now (default: the current time)"""
+        now = np.datetime64(datetime.now() if now is None else now)
+        return self.between(now, now + np.timedelta64(int(hours * 3600 * 10 ** 6), 'us'))
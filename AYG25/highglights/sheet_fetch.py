@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Column-subset fetching from Google Sheets
+Reads the header row first, maps the wanted column names to column letters and
+pulls only those columns in one batch_get, instead of get_all_values() pulling
+every column (including long text columns the generators never use).
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+FETCH_MODES = ('columns', 'full', 'incremental')
+
+
+def column_letter(index):
+    """Convert a 0-based column index to a sheet column letter (0 -> A, 26 -> AA)"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def column_runs(positions):
+    """Merge sorted 0-based column positions into contiguous (start, end) runs"""
+    runs = []
+    for position in sorted(set(positions)):
+        if runs and position == runs[-1][1] + 1:
+            runs[-1][1] = position
+        else:
+            runs.append([position, position])
+    return [tuple(run) for run in runs]
+
+
+def fetch_full(worksheet, header_row):
+    """
+    Fetch every column with get_all_values()
+
+    Returns:
+        Tuple of (headers, data rows), or None if the sheet has fewer than header_row rows
+    """
+    return split_header(worksheet.get_all_values(), header_row)
+
+
+def split_header(all_values, header_row):
+    """
+    Split a worksheet's values into the header row and the data rows below it
+
+    Returns:
+        Tuple of (headers, data rows), or None if there are fewer than header_row rows
+    """
+    if len(all_values) < header_row:
+        return None
+    return all_values[header_row - 1], all_values[header_row:]
+
+
+def select_columns(headers, column_names, header_row=None):
+    """
+    Positions of the wanted columns in a header row
+
+    Args:
+        headers: Header row values
+        column_names: Header names to find (matched after stripping whitespace)
+        header_row: Row number, only used in the log message
+
+    Returns:
+        Sorted list of 0-based positions (first occurrence of each name)
+    """
+    wanted = {str(name).strip() for name in column_names}
+    positions = []
+    seen = set()
+    for position, header in enumerate(headers):
+        name = str(header).strip()
+        if name in wanted and name not in seen:
+            seen.add(name)
+            positions.append(position)
+
+    missing = wanted - seen
+    if missing:
+        logger.warning(f"Columns not found in header row {header_row}: {sorted(missing)}")
+    return positions
+
+
+def segment_ranges(positions, segments, sheet_name=None):
+    """
+    A1 ranges for row segments of the given columns, one per (segment, contiguous column run)
+
+    Args:
+        positions: Sorted 0-based column positions
+        segments: List of (first_row, last_row) 1-based sheet rows; last_row=None reads
+                  to the end of the sheet
+        sheet_name: Worksheet name to prefix the ranges with (for spreadsheet-level calls)
+    """
+    prefix = "'{}'!".format(sheet_name.replace("'", "''")) if sheet_name else ''
+    ranges = []
+    for first_row, last_row in segments:
+        for start, end in column_runs(positions):
+            ranges.append(f"{prefix}{column_letter(start)}{first_row}:{column_letter(end)}{last_row or ''}")
+    return ranges
+
+
+def segment_rows(value_ranges, positions, segments):
+    """
+    Rows of each segment from the column-major value ranges of segment_ranges()
+
+    Returns:
+        List with one list of rows per segment, each row holding the cells of `positions`.
+        Closed segments are padded to their full length; open segments end at the last
+        row with data in any of the columns.
+    """
+    runs = column_runs(positions)
+    results = []
+    for segment_index, (first_row, last_row) in enumerate(segments):
+        columns = {}
+        for run_index, (start, end) in enumerate(runs):
+            # Trailing empty columns and trailing empty cells are omitted by the API
+            value_range = value_ranges[segment_index * len(runs) + run_index]
+            for offset, cells in enumerate(value_range):
+                columns[start + offset] = cells
+
+        if last_row is None:
+            n_rows = max((len(columns.get(p, ())) for p in positions), default=0)
+        else:
+            n_rows = last_row - first_row + 1
+
+        rows = []
+        for row_index in range(n_rows):
+            row = []
+            for p in positions:
+                cells = columns.get(p, ())
+                row.append(cells[row_index] if row_index < len(cells) else '')
+            rows.append(row)
+        results.append(rows)
+
+    return results
+
+
+def fetch_segments(worksheet, positions, segments):
+    """
+    Fetch row segments of the given columns in one batch_get
+
+    Args:
+        worksheet: gspread Worksheet
+        positions: Sorted 0-based column positions to fetch
+        segments: List of (first_row, last_row) 1-based sheet rows; last_row=None reads
+                  to the end of the sheet
+
+    Returns:
+        List with one list of rows per segment (see segment_rows())
+    """
+    if not positions or not segments:
+        return [[] for _ in segments]
+
+    value_ranges = worksheet.batch_get(segment_ranges(positions, segments), major_dimension='COLUMNS')
+    return segment_rows(value_ranges, positions, segments)
+
+
+def fetch_column_subset(worksheet, header_row, column_names):
+    """
+    Fetch only the named columns, in one batch_get after reading the header row
+
+    Args:
+        worksheet: gspread Worksheet
+        header_row: 1-based row number holding the column headers
+        column_names: Header names to fetch (matched after stripping whitespace)
+
+    Returns:
+        Tuple of (headers, data rows) restricted to the found columns, in sheet order,
+        or None if the header row is empty
+    """
+    headers = worksheet.row_values(header_row)
+    if not headers:
+        return None
+
+    positions = select_columns(headers, column_names, header_row)
+    if not positions:
+        return [], []
+
+    data_rows = fetch_segments(worksheet, positions, [(header_row + 1, None)])[0]
+
+    logger.info(f"Fetched {len(positions)} of {len(headers)} columns ({len(data_rows)} rows)")
+
+    return [headers[p] for p in positions], data_rows
+
+
+def fetch_rows(worksheet, header_row, column_names, mode='columns', sync_dir=None):
+    """
+    Fetch the header row and data rows using the given fetch mode
+
+    Args:
+        worksheet: gspread Worksheet
+        header_row: 1-based row number holding the column headers
+        column_names: Header names needed (ignored in 'full' mode)
+        mode: 'columns' (only the needed columns), 'full' (get_all_values) or
+              'incremental' (only appended/changed rows, merged into a local snapshot)
+        sync_dir: Directory for the incremental sync state (required in 'incremental' mode)
+
+    Returns:
+        Tuple of (headers, data rows), or None if there is no header row
+    """
+    if mode == 'full':
+        return fetch_full(worksheet, header_row)
+    if mode == 'incremental':
+        if sync_dir is None:
+            raise ValueError("Incremental fetch mode needs a sync_dir for the local snapshot")
+        from sheet_sync import IncrementalSheetSync
+        name = getattr(worksheet, 'title', None) or 'sheet'
+        return IncrementalSheetSync(sync_dir, name, header_row, column_names).sync(worksheet)
+    if mode != 'columns':
+        raise ValueError(f"Unknown fetch mode: {mode} (expected one of {FETCH_MODES})")
+    return fetch_column_subset(worksheet, header_row, column_names)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Shared Google Sheets session for the generators
+Authorizes and opens the spreadsheet once and fetches every registered worksheet
+(e.g. 'Sheet17' and the competition schedule) together: one values_batch_get for the
+header rows of the column-subset worksheets, then one values_batch_get (column-major)
+for their mapped column runs and any whole worksheets. A SheetSession passed to both
+HighlightsGenerator and DailyScheduleGenerator lets a combined run (see
+nightly_build.py) make those two data requests instead of two per generator, while
+keeping the column-subset payload saving of the 'columns' fetch mode. gspread and
+google-auth are only imported when the session first connects, so offline runs never
+load them.
+"""
+
+import json
+import logging
+import os
+from itertools import zip_longest
+from pathlib import Path
+
+from sheet_fetch import segment_ranges, segment_rows, select_columns, split_header
+
+# Import config
+try:
+    from config import GOOGLE_SPREADSHEET_ID, GOOGLE_CREDENTIALS_FILE
+except ImportError:
+    GOOGLE_SPREADSHEET_ID = '1xzFo8qBtGGSqW9V9UyaPVGqT6w5UIypw9hIgV3JZmto'
+    GOOGLE_CREDENTIALS_FILE = '../ayg-form-system/functions/google_credentials.json'
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_WORKSHEET = 'AYG2025 Competition Schedule'
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+
+def load_credentials(credentials_file):
+    """
+    Service account credentials from GOOGLE_CREDENTIALS_JSON or a credentials file
+
+    The file is looked up relative to the highlights directory, as given, and relative
+    to the project root, in that order.
+
+    Raises:
+        FileNotFoundError: No credentials in the environment and no file found
+    """
+    from google.oauth2.service_account import Credentials
+
+    # Try to load credentials from environment variable first (like other parts of the system)
+    creds_json = os.environ.get('GOOGLE_CREDENTIALS_JSON')
+    if creds_json:
+        try:
+            creds = Credentials.from_service_account_info(json.loads(creds_json), scopes=SCOPES)
+            logger.info("Loaded Google credentials from environment variable")
+            return creds
+        except json.JSONDecodeError as e:
+            logger.warning(f"Invalid JSON in GOOGLE_CREDENTIALS_JSON: {e}, trying file...")
+
+    candidates = [
+        (Path(__file__).parent / credentials_file).resolve(),
+        Path(credentials_file).resolve(),
+        (Path(__file__).parent.parent / credentials_file).resolve()
+    ]
+    for creds_path in candidates:
+        if creds_path.exists():
+            creds = Credentials.from_service_account_file(str(creds_path), scopes=SCOPES)
+            logger.info(f"Loaded Google credentials from: {creds_path}")
+            return creds
+
+    tried = "".join(f"Tried: {path}\n" for path in candidates)
+    raise FileNotFoundError(
+        f"Credentials file not found: {credentials_file}\n{tried}"
+        f"Set GOOGLE_CREDENTIALS_JSON environment variable or place credentials file."
+    )
+
+
+def sheet_range(worksheet_name):
+    """A1 range covering a whole worksheet ('Sheet17' -> "'Sheet17'")"""
+    return "'{}'".format(worksheet_name.replace("'", "''"))
+
+
+def rows_from_columns(columns):
+    """Row-major values from a column-major value range, padded like Worksheet.get_all_values()"""
+    return [list(row) for row in zip_longest(*columns, fillvalue='')]
+
+
+class SheetSession:
+    """One authorized connection to a spreadsheet, shared by the generators"""
+
+    def __init__(self, spreadsheet_id=None, credentials_file=None):
+        """
+        Args:
+            spreadsheet_id: Google Sheets spreadsheet ID (defaults to config)
+            credentials_file: Path to Google credentials JSON file (defaults to config)
+        """
+        self.spreadsheet_id = spreadsheet_id or GOOGLE_SPREADSHEET_ID
+        self.credentials_file = credentials_file or GOOGLE_CREDENTIALS_FILE
+        self.gc = None
+        self.requests = {}
+        self.batch_calls = 0
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._fetched = {}
+
+    @property
+    def spreadsheet(self):
+        """The opened gspread Spreadsheet (authorizes on first use)"""
+        if self._spreadsheet is None:
+            import gspread
+
+            self.gc = gspread.authorize(load_credentials(self.credentials_file))
+            self._spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
+            logger.info(f"Opened spreadsheet: {self._spreadsheet.title}")
+        return self._spreadsheet
+
+    def worksheet(self, name):
+        """gspread Worksheet by name, for the incremental fetch mode"""
+        if name not in self._worksheets:
+            self._worksheets[name] = self.spreadsheet.worksheet(name)
+            logger.info(f"Found worksheet: {name}")
+        return self._worksheets[name]
+
+    def register(self, name, header_row, column_names=None):
+        """
+        Include a worksheet in the next batched fetch
+
+        Generators register their worksheet when they are created, so the first fetch
+        of any of them fetches all registered worksheets together.
+
+        Args:
+            name: Worksheet name
+            header_row: 1-based row number holding the column headers
+            column_names: Header names to fetch ('columns' mode), or None for every column ('full' mode)
+        """
+        request = (header_row, list(column_names) if column_names is not None else None)
+        if self.requests.get(name) != request:
+            self.requests[name] = request
+            self._fetched.pop(name, None)
+
+    def prefetch(self):
+        """Fetch every registered worksheet not fetched yet, in at most two batch requests"""
+        pending = {name: request for name, request in self.requests.items() if name not in self._fetched}
+        if not pending:
+            return
+
+        # Header rows of the column-subset worksheets, to map column names to positions
+        subsets = [name for name, (_, column_names) in pending.items() if column_names is not None]
+        headers = {}
+        if subsets:
+            response = self.spreadsheet.values_batch_get(
+                [f"{sheet_range(name)}!{pending[name][0]}:{pending[name][0]}" for name in subsets])
+            self.batch_calls += 1
+            for name, value_range in zip(subsets, response.get('valueRanges', [])):
+                headers[name] = (value_range.get('values') or [[]])[0]
+
+        # One column-major request for the mapped column runs and the whole worksheets
+        ranges = []
+        layout = []
+        for name, (header_row, column_names) in pending.items():
+            if column_names is None:
+                layout.append((name, None, 1))
+                ranges.append(sheet_range(name))
+                continue
+            if not headers.get(name):
+                self._fetched[name] = None
+                continue
+            positions = select_columns(headers[name], column_names, header_row)
+            if not positions:
+                self._fetched[name] = ([], [])
+                continue
+            name_ranges = segment_ranges(positions, [(header_row + 1, None)], sheet_name=name)
+            layout.append((name, positions, len(name_ranges)))
+            ranges += name_ranges
+
+        if ranges:
+            response = self.spreadsheet.values_batch_get(ranges, params={'majorDimension': 'COLUMNS'})
+            self.batch_calls += 1
+            value_ranges = [value_range.get('values', []) for value_range in response.get('valueRanges', [])]
+            offset = 0
+            for name, positions, count in layout:
+                name_ranges = value_ranges[offset:offset + count]
+                offset += count
+                header_row = pending[name][0]
+                if positions is None:
+                    self._fetched[name] = split_header(rows_from_columns(name_ranges[0]), header_row)
+                else:
+                    rows = segment_rows(name_ranges, positions, [(header_row + 1, None)])[0]
+                    self._fetched[name] = ([headers[name][p] for p in positions], rows)
+
+        for name in pending:
+            fetched = self._fetched.get(name)
+            detail = 'no header row' if fetched is None else f"{len(fetched[0])} columns, {len(fetched[1])} rows"
+            logger.info(f"Batched fetch of '{name}': {detail}")
+
+    def fetch_rows(self, name, header_row, column_names=None):
+        """
+        Header row and data rows of a worksheet from the batched fetch
+
+        Worksheets fetched for one generator are kept in memory for the others.
+
+        Args:
+            name: Worksheet name
+            header_row: 1-based row number holding the column headers
+            column_names: Header names to fetch, or None for every column
+
+        Returns:
+            Tuple of (headers, data rows), or None if there is no header row
+        """
+        self.register(name, header_row, column_names)
+        self.prefetch()
+        return self._fetched[name]
+
+    def invalidate(self):
+        """Drop the fetched values so the next fetch_rows() call fetches again"""
+        self._fetched = {}
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+On-disk snapshot cache of fetched sheet values
+The header row and data rows returned by sheet_fetch.fetch_rows() are kept as gzip
+JSON under output/.cache with their fetch time, so re-rendering (e.g. while tweaking
+a template) can skip authenticating and downloading the sheet. This module must not
+import gspread - offline runs rely on that.
+"""
+
+import gzip
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """Compressed JSON snapshot of one worksheet's fetched values"""
+
+    def __init__(self, cache_dir, name, source):
+        """
+        Args:
+            cache_dir: Directory holding the snapshot (e.g. output/.cache)
+            name: Snapshot name (used for the filename, e.g. 'highlights')
+            source: Dictionary identifying what was fetched (spreadsheet id, worksheet,
+                    header row, columns, fetch mode); a snapshot from a different source is ignored
+        """
+        safe_name = re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_') or 'sheet'
+        self.path = Path(cache_dir) / f"{safe_name}.snapshot.json.gz"
+        self.source = source
+
+    def load(self):
+        """
+        Return the snapshot, or None if missing, unreadable or from another source
+
+        Returns:
+            Dictionary with 'headers', 'rows' and 'fetched_at' (epoch seconds)
+        """
+        if not self.path.exists():
+            return None
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {self.path}: {e}")
+            return None
+        if snapshot.get('source') != self.source:
+            logger.info(f"Ignoring snapshot {self.path.name}: fetched from a different sheet")
+            return None
+        return snapshot
+
+    def save(self, headers, rows):
+        """Write the snapshot atomically, stamped with the current time"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump({
+                'source': self.source,
+                'fetched_at': time.time(),
+                'headers': headers,
+                'rows': rows
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+
+def load_or_fetch(store, fetch, ttl, offline=False, refresh=False):
+    """
+    Return sheet values from the snapshot when possible, otherwise fetch and save them
+
+    Args:
+        store: SnapshotStore
+        fetch: Callable returning (headers, data rows) or None, called only on a cache miss
+        ttl: Maximum snapshot age in seconds (0 always fetches)
+        offline: Use the snapshot whatever its age and never call fetch
+        refresh: Ignore the snapshot and always fetch
+
+    Returns:
+        Tuple of (headers, data rows), or None if the fetch found no header row
+
+    Raises:
+        FileNotFoundError: offline is set and there is no usable snapshot
+    """
+    snapshot = None if refresh else store.load()
+    if snapshot is not None:
+        age = max(0.0, time.time() - snapshot['fetched_at'])
+        if offline or age < ttl:
+            logger.info(f"Using sheet snapshot {store.path.name} "
+                        f"({len(snapshot['rows'])} rows, fetched {age:.0f}s ago)")
+            return snapshot['headers'], snapshot['rows']
+        logger.info(f"Sheet snapshot is {age:.0f}s old (TTL {ttl}s), fetching")
+
+    if offline:
+        raise FileNotFoundError(
+            f"No sheet snapshot at {store.path} - run once without --offline to create it"
+        )
+
+    fetched = fetch()
+    if fetched is not None:
+        store.save(*fetched)
+    return fetched
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Incremental append-only sync of a worksheet into a local snapshot
+During competition the sheet mostly grows at the bottom, so instead of downloading
+every row on each run we keep the rows (mapped columns only) in a local snapshot and
+on each sync make two small requests:
+
+  * a probe: a few key and result columns (SYNC_KEY_FIELDS, SYNC_PROBE_FIELDS) for
+    every row, compared block by block (SYNC_BLOCK_SIZE rows) with the same columns
+    of the snapshot
+  * one batch_get with the rows appended since the last sync plus every block whose
+    probe values changed
+
+If the key columns differ in a block before the last SYNC_TAIL_BLOCKS blocks, or the
+sheet got shorter, rows were inserted, deleted or re-keyed further up and the cached
+blocks no longer line up, so the whole sheet is fetched again. Key changes inside the
+tail re-fetch everything from the first changed block down.
+
+The Sheets API has no server-side checksum for a range; edits to columns outside the
+probe are picked up by the full fetch made every SYNC_FULL_EVERY syncs. A header change
+(or a missing/unreadable snapshot) also triggers a full fetch.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+
+from sheet_fetch import fetch_segments, select_columns
+
+# Import config
+try:
+    from config import COLUMN_MAPPINGS
+except ImportError:
+    COLUMN_MAPPINGS = {}
+
+logger = logging.getLogger(__name__)
+
+SYNC_BLOCK_SIZE = 200     # rows per checksum block
+SYNC_TAIL_BLOCKS = 1      # trailing blocks where inserted/deleted rows are re-aligned without a full fetch
+SYNC_FULL_EVERY = 36      # syncs between full fetches (6 hours at a 10-minute cycle; 0 = never)
+
+# COLUMN_MAPPINGS keys identifying a row - a difference means rows moved
+SYNC_KEY_FIELDS = ('SPORT', 'EVENT', 'ATHLETE_NAME')
+
+# COLUMN_MAPPINGS keys that change when results are entered
+SYNC_PROBE_FIELDS = (
+    'DATE_SGP', 'TIME_START_SGP', 'STAGE', 'MEDALS', 'POSITION', 'FINAL_POSITION',
+    'WIN_DRAW_LOSE', 'TIMING_SGP', 'SCORE_SGP', 'SCORE_COMPETITOR', 'ADVANCED'
+)
+
+
+def block_checksums(rows, block_size=SYNC_BLOCK_SIZE):
+    """SHA-1 checksum of each block of rows"""
+    checksums = []
+    for start in range(0, len(rows), block_size):
+        payload = json.dumps(rows[start:start + block_size], ensure_ascii=False, separators=(',', ':'))
+        checksums.append(hashlib.sha1(payload.encode('utf-8')).hexdigest())
+    return checksums
+
+
+def _mapped(fields):
+    """Header names of COLUMN_MAPPINGS keys (unmapped keys skipped)"""
+    return [COLUMN_MAPPINGS[field] for field in fields if field in COLUMN_MAPPINGS]
+
+
+def _project(rows, indexes):
+    """The given columns of each row, without trailing all-empty rows (as an open-ended fetch returns them)"""
+    projected = [[row[i] for i in indexes] for row in rows]
+    while projected and not any(projected[-1]):
+        projected.pop()
+    return projected
+
+
+class IncrementalSheetSync:
+    """Keeps a local snapshot of a worksheet's mapped columns up to date incrementally"""
+
+    def __init__(self, cache_dir, name, header_row, column_names,
+                 block_size=SYNC_BLOCK_SIZE, tail_blocks=SYNC_TAIL_BLOCKS,
+                 full_every=SYNC_FULL_EVERY, key_columns=None, probe_columns=None):
+        """
+        Args:
+            cache_dir: Directory holding the sync state (e.g. output/.cache)
+            name: Worksheet name (used for the state filename)
+            header_row: 1-based row number holding the column headers
+            column_names: Header names to keep in the snapshot
+            key_columns: Header names identifying a row (defaults to SYNC_KEY_FIELDS; the
+                         first wanted column if none of them is in the sheet)
+            probe_columns: Further header names compared on every sync (defaults to SYNC_PROBE_FIELDS)
+        """
+        safe_name = re.sub(r'[^A-Za-z0-9_-]+', '_', name).strip('_') or 'sheet'
+        self.path = Path(cache_dir) / f"{safe_name}.sync.json.gz"
+        self.header_row = header_row
+        self.column_names = list(column_names)
+        self.block_size = block_size
+        self.tail_blocks = tail_blocks
+        self.full_every = full_every
+        self.key_columns = list(key_columns) if key_columns is not None else _mapped(SYNC_KEY_FIELDS)
+        self.probe_columns = list(probe_columns) if probe_columns is not None else _mapped(SYNC_PROBE_FIELDS)
+        self.last_sync = {}
+
+    def load_state(self):
+        """Return the saved sync state, or None if missing/unreadable"""
+        if not self.path.exists():
+            return None
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync state {self.path}: {e}")
+            return None
+
+    def save_state(self, state):
+        """Write the sync state atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    def probe_indexes(self, headers):
+        """
+        Snapshot column indexes of the key columns and of all probed columns
+
+        Returns:
+            Tuple of (key indexes, probe indexes); the probe includes the keys
+        """
+        names = [str(header).strip() for header in headers]
+        key_names = {str(name).strip() for name in self.key_columns}
+        probe_names = {str(name).strip() for name in self.probe_columns}
+        keys = [i for i, name in enumerate(names) if name in key_names] or [0]
+        probe = sorted(set(keys) | {i for i, name in enumerate(names) if name in probe_names})
+        return keys, probe
+
+    def sync(self, worksheet, full=False):
+        """
+        Bring the snapshot up to date and return its contents
+
+        Args:
+            worksheet: gspread Worksheet
+            full: Ignore the snapshot and fetch every row
+
+        Returns:
+            Tuple of (headers, data rows) for the mapped columns, or None if the header row is empty
+        """
+        all_headers = worksheet.row_values(self.header_row)
+        if not all_headers:
+            return None
+
+        positions = select_columns(all_headers, self.column_names, self.header_row)
+        headers = [all_headers[p] for p in positions]
+        if not positions:
+            return [], []
+
+        first_data_row = self.header_row + 1
+        state = None if full else self.load_state()
+        if state is not None and (state.get('headers') != headers or
+                                  state.get('positions') != positions or
+                                  state.get('block_size') != self.block_size):
+            logger.info("Sheet columns changed since last sync, fetching all rows")
+            state = None
+        if state is not None and self.full_every and state.get('syncs_since_full', 0) + 1 >= self.full_every:
+            logger.info(f"{self.full_every} syncs since the last full fetch, fetching all rows")
+            state = None
+
+        result = None
+        if state is not None:
+            result = self._sync_incremental(worksheet, positions, state, first_data_row)
+        if result is None:
+            rows = fetch_segments(worksheet, positions, [(first_data_row, None)])[0]
+            stats = {'mode': 'full', 'probe_rows': 0, 'rows_fetched': len(rows),
+                     'rows_appended': len(rows), 'blocks_changed': 0}
+            syncs_since_full = 0
+        else:
+            rows, stats = result
+            syncs_since_full = state.get('syncs_since_full', 0) + 1
+
+        _, probe = self.probe_indexes(headers)
+        self.save_state({
+            'headers': headers,
+            'positions': positions,
+            'block_size': self.block_size,
+            'row_count': len(rows),
+            'probe': probe,
+            'probe_checksums': block_checksums(_project(rows, probe), self.block_size),
+            'syncs_since_full': syncs_since_full,
+            'synced_at': time.time(),
+            'rows': rows
+        })
+
+        stats['row_count'] = len(rows)
+        self.last_sync = stats
+        logger.info(f"Sheet sync ({stats['mode']}): probed {stats['probe_rows']} rows, "
+                    f"fetched {stats['rows_fetched']} rows, {stats['rows_appended']} appended, "
+                    f"{stats['blocks_changed']} changed block(s), {len(rows)} rows in snapshot")
+
+        return headers, rows
+
+    def _sync_incremental(self, worksheet, positions, state, first_data_row):
+        """
+        Probe the sheet and fetch the appended rows and the changed blocks
+
+        Returns:
+            Tuple of (rows, stats), or None when rows moved outside the tail and a
+            full fetch is needed
+        """
+        block_size = self.block_size
+        old_rows = state['rows']
+        keys, probe = self.probe_indexes(state['headers'])
+        key_slots = [probe.index(i) for i in keys]
+
+        old_probe = _project(old_rows, probe)
+        new_probe = fetch_segments(worksheet, [positions[i] for i in probe], [(first_data_row, None)])[0]
+        if len(new_probe) < len(old_probe):
+            logger.info("Sheet has fewer rows than at the last sync, fetching all rows")
+            return None
+
+        old_checksums = state.get('probe_checksums') if state.get('probe') == probe else None
+        if old_checksums is None:
+            old_checksums = block_checksums(old_probe, block_size)
+        new_checksums = block_checksums(new_probe[:len(old_probe)], block_size)
+
+        # Blocks whose probe changed; a key change means rows were inserted, deleted or re-keyed
+        tail_block = max(0, len(old_checksums) - self.tail_blocks)
+        changed = []
+        realign_from = None
+        for block, (old_checksum, new_checksum) in enumerate(zip(old_checksums, new_checksums)):
+            if old_checksum == new_checksum:
+                continue
+            start, end = block * block_size, min((block + 1) * block_size, len(old_probe))
+            moved = any(
+                [new_row[slot] for slot in key_slots] != [old_row[slot] for slot in key_slots]
+                for new_row, old_row in zip(new_probe[start:end], old_probe[start:end])
+            )
+            if moved:
+                if block < tail_block:
+                    logger.info(f"Rows moved in block {block} (before the last {self.tail_blocks} "
+                                f"block(s)), fetching all rows")
+                    return None
+                # Inside the tail: re-fetch everything from here down so the rows line up again
+                realign_from = start
+                break
+            changed.append(block)
+
+        tail_from = len(old_rows) if realign_from is None else realign_from
+        segments = [
+            (first_data_row + block * block_size,
+             first_data_row + min((block + 1) * block_size, len(old_rows)) - 1)
+            for block in changed
+        ]
+        segments.append((first_data_row + tail_from, None))
+        fetched = fetch_segments(worksheet, positions, segments)
+
+        rows = list(old_rows[:tail_from])
+        for block, block_rows in zip(changed, fetched[:-1]):
+            rows[block * block_size:block * block_size + len(block_rows)] = block_rows
+        rows.extend(fetched[-1])
+
+        blocks_changed = len(changed)
+        if realign_from is not None:
+            blocks_changed += len(old_checksums) - realign_from // block_size
+        stats = {
+            'mode': 'incremental',
+            'probe_rows': len(new_probe),
+            'rows_fetched': sum(len(segment_rows) for segment_rows in fetched),
+            'rows_appended': max(0, len(rows) - len(old_rows)),
+            'blocks_changed': blocks_changed
+        }
+        return rows, stats
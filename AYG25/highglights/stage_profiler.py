@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and profiling for the generator CLIs (--profile)
+Records wall time, CPU time, row counts and peak Python memory for each named stage
+(sheet fetch, filtering, grouping, rendering, writing, ...) and writes a JSON report.
+Optionally every stage also runs under cProfile and the slowest stage's stats are
+dumped to a .prof file (open with `python -m pstats` or snakeviz).
+
+A disabled profiler (the default) does no measuring, so the generators can wrap
+their stages unconditionally.
+"""
+
+import cProfile
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class StageProfiler:
+    """Collects per-stage wall/CPU time, rows and peak memory"""
+
+    def __init__(self, enabled=False, cprofile=False):
+        """
+        Args:
+            enabled: Measure stages (False makes stage() a no-op)
+            cprofile: Also run each stage under cProfile so the slowest can be dumped
+        """
+        self.enabled = enabled
+        self.cprofile = enabled and cprofile
+        self.stages = {}
+        self._profiles = {}
+        self._started = None
+
+    def start(self):
+        """Start the run clock (and memory tracing); called by the first stage if needed"""
+        if not self.enabled or self._started is not None:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._started = (time.perf_counter(), time.process_time(), datetime.now())
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Measure a stage; repeated names are accumulated (e.g. one render per page)
+
+        Yields a dictionary whose 'rows' entry can be set inside the block.
+        Stages must not be nested (peak memory is reset per stage).
+        """
+        info = {'rows': rows}
+        if not self.enabled:
+            yield info
+            return
+
+        self.start()
+        tracemalloc.reset_peak()
+        profile = self._profiles.setdefault(name, cProfile.Profile()) if self.cprofile else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield info
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            peak = tracemalloc.get_traced_memory()[1]
+
+            record = self.stages.setdefault(name, {
+                'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows': None, 'peak_memory_mb': 0.0
+            })
+            record['calls'] += 1
+            record['wall_seconds'] += wall
+            record['cpu_seconds'] += cpu
+            if info['rows'] is not None:
+                record['rows'] = (record['rows'] or 0) + info['rows']
+            record['peak_memory_mb'] = max(record['peak_memory_mb'], peak / 2 ** 20)
+
+    def slowest_stage(self):
+        """Name of the stage with the most wall time, or None"""
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda name: self.stages[name]['wall_seconds'])
+
+    def report(self, command=None):
+        """Build the JSON-serializable report"""
+        self.start()
+        wall_start, cpu_start, started_at = self._started
+        max_rss_mb = None
+        if resource is not None:
+            # ru_maxrss is KiB on Linux, bytes on macOS
+            scale = 2 ** 20 if os.uname().sysname == 'Darwin' else 2 ** 10
+            max_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+        return {
+            'command': command,
+            'started_at': started_at.isoformat(timespec='seconds'),
+            'total_wall_seconds': round(time.perf_counter() - wall_start, 4),
+            'total_cpu_seconds': round(time.process_time() - cpu_start, 4),
+            'max_rss_mb': max_rss_mb,
+            'cprofile': self.cprofile,
+            'slowest_stage': self.slowest_stage(),
+            'stages': [
+                {
+                    'name': name,
+                    'calls': record['calls'],
+                    'wall_seconds': round(record['wall_seconds'], 4),
+                    'cpu_seconds': round(record['cpu_seconds'], 4),
+                    'rows': record['rows'],
+                    'peak_memory_mb': round(record['peak_memory_mb'], 2)
+                }
+                for name, record in self.stages.items()
+            ]
+        }
+
+    def write_report(self, path, command=None):
+        """
+        Write the JSON report (and the slowest stage's cProfile dump) and log a summary
+
+        Returns:
+            The report dictionary
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = self.report(command)
+
+        slowest = report['slowest_stage']
+        if self.cprofile and slowest in self._profiles:
+            dump_path = path.with_name(f"{path.stem}_{slowest}.prof")
+            self._profiles[slowest].dump_stats(str(dump_path))
+            report['cprofile_dump'] = str(dump_path)
+
+        path.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+        logger.info(f"Profile ({report['total_wall_seconds']:.3f}s wall, "
+                    f"{report['total_cpu_seconds']:.3f}s CPU):")
+        for stage in report['stages']:
+            rows = '' if stage['rows'] is None else f", {stage['rows']} rows"
+            logger.info(f"   - {stage['name']}: {stage['wall_seconds']:.3f}s wall, "
+                        f"{stage['cpu_seconds']:.3f}s CPU, peak {stage['peak_memory_mb']:.1f} MB"
+                        f"{rows} ({stage['calls']} call(s))")
+        logger.info(f"Profile report written to {path}")
+        if 'cprofile_dump' in report:
+            logger.info(f"cProfile stats for slowest stage '{slowest}' written to {report['cprofile_dump']}")
+
+        return report
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Fingerprinted static assets for the generated pages
+styles.css and the flag images are copied into output/assets/ under content-hashed
+names (styles.3f2a9c1b04.css, flags/SIN.9d81e0c2aa.png) and the references in the
+rendered pages are rewritten to those names. A fingerprinted file never changes, so
+static hosts can serve it with a long cache lifetime, and a new file only appears
+(and needs uploading) when the source content changes.
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+from pathlib import Path
+
+from flags import FLAG_IMAGE_SUFFIXES, FLAGS_DIR, FLAGS_URL_PREFIX
+from render_manifest import combine_digests, hash_file
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIRNAME = 'assets'
+ASSET_MANIFEST_FILENAME = 'manifest.json'
+STYLESHEET = Path(__file__).parent / 'styles.css'
+
+# Hex digits of the content hash kept in fingerprinted names
+FINGERPRINT_LENGTH = 10
+
+# href="..." / src="..." attribute values in rendered pages
+ASSET_REFERENCE = re.compile(r'\b(href|src)="([^"]+)"')
+
+# Names written by fingerprint_name() (styles.3f2a9c1b04.css), and precompressed siblings
+FINGERPRINTED_NAME = re.compile(rf'.+\.[0-9a-f]{{{FINGERPRINT_LENGTH}}}\.[^.]+')
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+
+
+def default_assets():
+    """
+    Assets referenced by the highlights pages
+
+    Returns:
+        Dictionary mapping the reference used in pages (e.g. 'styles.css',
+        '../flags/SIN.png') -> (source file, path under output/assets/)
+    """
+    assets = {'styles.css': (STYLESHEET, 'styles.css')}
+    try:
+        flag_files = sorted(os.listdir(FLAGS_DIR))
+    except FileNotFoundError:
+        flag_files = []
+    for file_name in flag_files:
+        if file_name.endswith(FLAG_IMAGE_SUFFIXES):
+            assets[FLAGS_URL_PREFIX + file_name] = (FLAGS_DIR / file_name, f"flags/{file_name}")
+    return assets
+
+
+def fingerprint_name(name, digest):
+    """Insert a content hash before the suffix: flags/SIN.png -> flags/SIN.<hash>.png"""
+    path = Path(name)
+    return path.with_name(f"{path.stem}.{digest[:FINGERPRINT_LENGTH]}{path.suffix}").as_posix()
+
+
+class AssetPublisher:
+    """Writes fingerprinted copies of the page assets and rewrites page references"""
+
+    def __init__(self, output_dir, assets=None):
+        """
+        Args:
+            output_dir: Directory holding the generated pages
+            assets: Reference -> (source file, path under assets/) (defaults to default_assets())
+        """
+        self.output_dir = Path(output_dir)
+        self.assets_dir = self.output_dir / ASSETS_DIRNAME
+        self.assets = default_assets() if assets is None else assets
+        self.urls = {}
+        self.digest = ''
+        self.stats = {}
+
+    def publish(self):
+        """
+        Copy each asset to its fingerprinted name unless that file already exists
+
+        Returns:
+            Dictionary mapping page references -> fingerprinted URLs (relative to output/)
+        """
+        written = unchanged = 0
+        urls = {}
+        for reference, (source, name) in self.assets.items():
+            digest = hash_file(source)
+            if not digest:
+                logger.warning(f"Asset not found, references left as-is: {source}")
+                continue
+            relative = f"{ASSETS_DIRNAME}/{fingerprint_name(name, digest)}"
+            target = self.output_dir / relative
+            if target.exists():
+                unchanged += 1
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.with_name(f".{target.name}.tmp")
+                shutil.copyfile(source, tmp_path)
+                os.replace(tmp_path, target)
+                written += 1
+                logger.info(f"Published asset: {relative}")
+            urls[reference] = relative
+
+        manifest_path = self.assets_dir / ASSET_MANIFEST_FILENAME
+        manifest = json.dumps(urls, indent=2, sort_keys=True)
+        if not manifest_path.exists() or manifest_path.read_text(encoding='utf-8') != manifest:
+            self.assets_dir.mkdir(parents=True, exist_ok=True)
+            manifest_path.write_text(manifest, encoding='utf-8')
+
+        self.urls = urls
+        # Pages embed the asset names, so they must be rebuilt when any asset changes
+        self.digest = combine_digests(*sorted(f"{reference}={url}" for reference, url in urls.items()))
+        self.stats = {'assets_written': written, 'assets_unchanged': unchanged}
+        logger.info(f"Assets: {written} written, {unchanged} unchanged ({self.assets_dir})")
+        return urls
+
+
+def prune_assets(output_dir, urls):
+    """
+    Delete fingerprinted files under output/assets/ that the current manifest no longer uses
+
+    Call this once the pages referencing the new names have been written. Only files
+    named like fingerprint_name() output (and their .gz/.br siblings) are removed.
+
+    Args:
+        output_dir: Directory holding the generated pages
+        urls: Reference -> fingerprinted URL (from AssetPublisher.publish())
+
+    Returns:
+        Number of files removed
+    """
+    output_dir = Path(output_dir)
+    assets_dir = output_dir / ASSETS_DIRNAME
+    if not assets_dir.is_dir():
+        return 0
+
+    current = set(urls.values())
+    removed = 0
+    for path in sorted(assets_dir.rglob('*')):
+        name = path.name
+        for suffix in COMPRESSED_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        if name.startswith('.') or not path.is_file() or not FINGERPRINTED_NAME.fullmatch(name):
+            continue
+        if path.with_name(name).relative_to(output_dir).as_posix() in current:
+            continue
+        path.unlink()
+        removed += 1
+        logger.info(f"Pruned asset: {path.relative_to(output_dir).as_posix()}")
+    return removed
+
+
+def rewrite_asset_references(html, urls):
+    """
+    Point href/src attributes at fingerprinted assets
+
+    Args:
+        html: Rendered page
+        urls: Reference -> fingerprinted URL (from AssetPublisher.publish())
+
+    Returns:
+        The page with known references replaced (others untouched)
+    """
+    if not urls:
+        return html
+
+    def replace(match):
+        url = urls.get(match[2])
+        return match[0] if url is None else f'{match[1]}="{url}"'
+
+    return ASSET_REFERENCE.sub(replace, html)
+
+
+def rewrite_asset_chunks(chunks, urls):
+    """
+    rewrite_asset_references() over a stream of rendered chunks
+
+    Each chunk is rewritten up to its last '>' and the rest is carried into the next
+    chunk, so an attribute split across chunks is still matched while the page is
+    never held in memory as a whole.
+
+    Args:
+        chunks: Iterable of HTML strings (e.g. Template.generate())
+        urls: Reference -> fingerprinted URL (from AssetPublisher.publish())
+
+    Yields:
+        Rewritten HTML strings
+    """
+    if not urls:
+        yield from chunks
+        return
+
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        cut = pending.rfind('>') + 1
+        if cut:
+            yield rewrite_asset_references(pending[:cut], urls)
+            pending = pending[cut:]
+    if pending:
+        yield rewrite_asset_references(pending, urls)
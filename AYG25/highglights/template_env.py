@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Shared Jinja2 environment for the highlights and schedule generators
+Templates are loaded once per process and their compiled bytecode is cached on disk,
+so repeated renders and cold starts skip the parse step. Templates are reloaded
+automatically when the file's mtime changes.
+"""
+
+import logging
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, TemplateNotFound
+
+# Import config
+try:
+    from config import OUTPUT_DIR
+except ImportError:
+    OUTPUT_DIR = 'output'
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_DIR = Path(__file__).parent / 'templates'
+BYTECODE_CACHE_DIR = Path(__file__).parent / OUTPUT_DIR / '.cache' / 'jinja'
+
+_environment = None
+
+
+def get_environment():
+    """Return the process-wide Jinja2 environment, creating it on first use"""
+    global _environment
+    if _environment is None:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _environment = Environment(
+            loader=FileSystemLoader(str(TEMPLATES_DIR), encoding='utf-8'),
+            bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+            auto_reload=True  # re-check template mtime on every get_template()
+        )
+    return _environment
+
+
+def get_template(name, fallback=None):
+    """
+    Load a template from templates/ through the shared environment
+
+    Args:
+        name: Template file name, e.g. 'highlights_template.html'
+        fallback: Callable returning a Template to use if the file does not exist
+
+    Returns:
+        jinja2 Template
+    """
+    try:
+        return get_environment().get_template(name)
+    except TemplateNotFound:
+        if fallback is None:
+            raise
+        logger.warning(f"Template not found: {TEMPLATES_DIR / name}, using default template")
+        return fallback()
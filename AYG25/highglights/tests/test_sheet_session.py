@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the generators' Google Sheets setup through SheetSession
+gspread and the credentials loader are stubbed, so no network access or credentials
+file is needed.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+# Allow running from the highlights directory or from tests/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import generate_daily_schedule  # noqa: E402
+import generate_highlights  # noqa: E402
+import sheet_session  # noqa: E402
+from sheet_session import SCHEDULE_WORKSHEET  # noqa: E402
+
+
+class FakeSpreadsheet:
+    title = 'Fake spreadsheet'
+
+    def __init__(self):
+        self.opened = []
+
+    def worksheet(self, name):
+        self.opened.append(name)
+        return f"worksheet:{name}"
+
+
+class FakeClient:
+    def __init__(self):
+        self.spreadsheet = FakeSpreadsheet()
+        self.keys = []
+
+    def open_by_key(self, key):
+        self.keys.append(key)
+        return self.spreadsheet
+
+
+@pytest.fixture
+def fake_gspread(monkeypatch):
+    """Stub gspread.authorize and the credentials loader; returns the fake client"""
+    client = FakeClient()
+    module = types.ModuleType('gspread')
+    module.authorize = lambda credentials: client
+    monkeypatch.setitem(sys.modules, 'gspread', module)
+    monkeypatch.setattr(sheet_session, 'load_credentials', lambda credentials_file: object())
+    return client
+
+
+def test_highlights_setup_google_sheets(fake_gspread):
+    generator = generate_highlights.HighlightsGenerator(spreadsheet_id='sheet-id', sheet_name='Sheet17')
+    generator.setup_google_sheets()
+
+    assert generator.worksheet == 'worksheet:Sheet17'
+    assert generator.gc is fake_gspread
+    assert fake_gspread.keys == ['sheet-id']
+    assert fake_gspread.spreadsheet.opened == ['Sheet17']
+
+
+def test_schedule_setup_google_sheets(fake_gspread):
+    generator = generate_daily_schedule.DailyScheduleGenerator(spreadsheet_id='sheet-id')
+    generator.setup_google_sheets()
+
+    assert generator.worksheet == f"worksheet:{SCHEDULE_WORKSHEET}"
+    assert generator.gc is fake_gspread
+    assert fake_gspread.keys == ['sheet-id']
+    assert fake_gspread.spreadsheet.opened == [SCHEDULE_WORKSHEET]
+
+
+def test_shared_session_opens_spreadsheet_once(fake_gspread):
+    session = sheet_session.SheetSession(spreadsheet_id='sheet-id')
+    highlights = generate_highlights.HighlightsGenerator(sheet_name='Sheet17', session=session)
+    schedule = generate_daily_schedule.DailyScheduleGenerator(session=session)
+    highlights.setup_google_sheets()
+    schedule.setup_google_sheets()
+
+    assert fake_gspread.keys == ['sheet-id']
+    assert fake_gspread.spreadsheet.opened == ['Sheet17', SCHEDULE_WORKSHEET]
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Live highlights widget server
+Serves the rendered highlights pages, the per-day JSON feeds (output/feeds/) and their
+assets from an in-memory cache. A background thread re-runs HighlightsGenerator on an
+interval (from the sheet snapshot, fetching the sheet once the snapshot TTL expires);
+only files that changed on disk are re-read and re-compressed.
+
+Responses carry a strong ETag and honour If-None-Match with 304 Not Modified. Text
+bodies are precompressed once per change (gzip, and brotli when the Brotli package is
+installed) and served according to Accept-Encoding.
+
+Usage:
+    python widget_server.py
+    python widget_server.py --port 8080 --interval 30 --groupings date sport
+    python widget_server.py --offline        # serve from the cached snapshot only
+"""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+import time
+from datetime import datetime
+
+from flask import Flask, Response, jsonify, request
+
+from flags import FLAGS_DIR
+from generate_highlights import HighlightsGenerator
+from highlight_dates import GROUPINGS
+from highlight_feeds import FEED_INDEX_FILENAME, FEEDS_DIRNAME
+from static_assets import ASSETS_DIRNAME
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Files served from the output directory
+SERVED_SUFFIXES = ('.html', '.css', '.json', '.png', '.jpg', '.jpeg')
+COMPRESSIBLE_SUFFIXES = ('.html', '.css', '.json')
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+CACHE_CONTROL = {
+    'immutable': 'public, max-age=31536000, immutable',  # fingerprinted assets
+    'revalidate': 'no-cache',                            # pages and feeds: always check the ETag
+    'static': 'public, max-age=3600'                     # unfingerprinted CSS and flags
+}
+
+
+class CacheEntry:
+    """One served file: identity body, precompressed variants and validators"""
+
+    __slots__ = ('body', 'gzip', 'br', 'etag', 'content_type', 'cache_control', 'mtime_ns', 'size')
+
+    def __init__(self, body, content_type, cache_control, mtime_ns=0, size=0, compress=False):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.gzip = self.br = None
+        if compress and len(body) >= MIN_COMPRESS_SIZE:
+            # mtime=0 keeps the gzip bytes (and so the encoded ETag) deterministic
+            compressed = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(compressed) < len(body):
+                self.gzip = compressed
+            if brotli is not None:
+                compressed = brotli.compress(body, quality=11)
+                if len(compressed) < len(body):
+                    self.br = compressed
+
+
+def accepted_encodings(header):
+    """Encodings from an Accept-Encoding header, excluding those with q=0"""
+    encodings = set()
+    for part in (header or '').split(','):
+        name, _, params = part.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = params.strip()
+        if quality.startswith('q='):
+            try:
+                if float(quality[2:]) == 0:
+                    continue
+            except ValueError:
+                pass
+        encodings.add(name)
+    return encodings
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header matches the entity tag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    bare = etag.strip('"')
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        # Encoded variants carry a -gzip / -br suffix on the same tag
+        if candidate.strip('"').split('-')[0] == bare:
+            return True
+    return False
+
+
+def build_response(entry, if_none_match=None, accept_encoding=None):
+    """
+    Status, headers and body for a cached entry
+
+    Args:
+        entry: CacheEntry
+        if_none_match: If-None-Match request header
+        accept_encoding: Accept-Encoding request header
+
+    Returns:
+        Tuple of (status code, headers dictionary, body bytes)
+    """
+    encodings = accepted_encodings(accept_encoding)
+    body, encoding = entry.body, None
+    if entry.br is not None and 'br' in encodings:
+        body, encoding = entry.br, 'br'
+    elif entry.gzip is not None and ('gzip' in encodings or '*' in encodings):
+        body, encoding = entry.gzip, 'gzip'
+
+    etag = entry.etag if encoding is None else f'{entry.etag[:-1]}-{encoding}"'
+    headers = {'ETag': etag, 'Cache-Control': entry.cache_control}
+    if entry.gzip is not None or entry.br is not None:
+        headers['Vary'] = 'Accept-Encoding'
+
+    if etag_matches(if_none_match, entry.etag):
+        return 304, headers, b''
+
+    headers['Content-Type'] = entry.content_type
+    if encoding is not None:
+        headers['Content-Encoding'] = encoding
+    return 200, headers, body
+
+
+class WidgetCache:
+    """In-memory copy of the generated output, refreshed by re-running the generator"""
+
+    def __init__(self, generator, groupings=None, tally=None, publish_assets=None, interval=60):
+        """
+        Args:
+            generator: HighlightsGenerator (its output_dir is what gets served)
+            groupings: Page sets to render (see HighlightsGenerator.generate_all)
+            tally: Keep the medal tally (defaults to MEDAL_TALLY from config)
+            publish_assets: Reference fingerprinted assets (defaults to PUBLISH_ASSETS from config)
+            interval: Seconds between background refreshes
+        """
+        self.generator = generator
+        self.groupings = groupings
+        self.tally = tally
+        self.publish_assets = publish_assets
+        self.interval = interval
+        self.entries = {}
+        self.stats = {'refreshes': 0, 'errors': 0, 'last_refresh': None, 'last_error': None,
+                      'last_refresh_seconds': None, 'files_reloaded': 0}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self, path):
+        """Cached entry for a URL path ('highlights_2025-10-28.html', 'feeds/index.json', ...)"""
+        return self.entries.get(path)
+
+    def refresh(self):
+        """
+        Re-run the generator and reload the files that changed
+
+        Returns:
+            Number of files re-read
+        """
+        with self._lock:
+            start = time.perf_counter()
+            try:
+                self.generator.generate_all(groupings=self.groupings, tally=self.tally,
+                                            publish_assets=self.publish_assets, feeds=True)
+            except Exception as e:
+                # Keep serving the previous content
+                self.stats['errors'] += 1
+                self.stats['last_error'] = f"{datetime.now().isoformat(timespec='seconds')}: {e}"
+                logger.error(f"Widget refresh failed, serving previous content: {e}")
+                return 0
+            reloaded = self._reload()
+            self.stats['refreshes'] += 1
+            self.stats['last_refresh'] = datetime.now().isoformat(timespec='seconds')
+            self.stats['last_refresh_seconds'] = round(time.perf_counter() - start, 3)
+            self.stats['files_reloaded'] = reloaded
+            logger.info(f"Widget cache refreshed: {reloaded} file(s) reloaded, {len(self.entries)} served")
+            return reloaded
+
+    def _served_files(self):
+        """URL path -> file for everything the server exposes"""
+        output_dir = self.generator.output_dir
+        files = {}
+        for path in output_dir.glob('*'):
+            if path.is_file() and path.suffix in SERVED_SUFFIXES and not path.name.startswith('.'):
+                files[path.name] = path
+        for subdir in (FEEDS_DIRNAME, ASSETS_DIRNAME):
+            for path in (output_dir / subdir).rglob('*'):
+                if path.is_file() and path.suffix in SERVED_SUFFIXES and not path.name.startswith('.'):
+                    files[path.relative_to(output_dir).as_posix()] = path
+        # Pages reference flag images as ../flags/<file>, i.e. /flags/<file> from the site root
+        if FLAGS_DIR.exists():
+            for path in FLAGS_DIR.iterdir():
+                if path.is_file() and path.suffix in SERVED_SUFFIXES:
+                    files[f"flags/{path.name}"] = path
+        return files
+
+    def _reload(self):
+        entries = {}
+        reloaded = 0
+        for url_path, path in self._served_files().items():
+            stat = path.stat()
+            entry = self.entries.get(url_path)
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                entries[url_path] = entry
+                continue
+            if url_path.startswith(ASSETS_DIRNAME + '/') and url_path != f"{ASSETS_DIRNAME}/manifest.json":
+                cache_control = CACHE_CONTROL['immutable']
+            elif path.suffix in ('.html', '.json'):
+                cache_control = CACHE_CONTROL['revalidate']
+            else:
+                cache_control = CACHE_CONTROL['static']
+            content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+            if path.suffix in COMPRESSIBLE_SUFFIXES:
+                content_type += '; charset=utf-8'
+            entries[url_path] = CacheEntry(path.read_bytes(), content_type, cache_control,
+                                           stat.st_mtime_ns, stat.st_size,
+                                           compress=path.suffix in COMPRESSIBLE_SUFFIXES)
+            reloaded += 1
+        # Swap in one assignment so requests never see a half-built cache
+        self.entries = entries
+        return reloaded
+
+    def start(self):
+        """Start the background refresh thread"""
+        if self._thread is not None or self.interval <= 0:
+            return
+
+        def run():
+            while not self._stop.wait(self.interval):
+                self.refresh()
+
+        self._thread = threading.Thread(target=run, name='widget-refresh', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def create_app(cache):
+    """Flask app serving a WidgetCache"""
+    app = Flask(__name__)
+
+    @app.route('/healthz')
+    def health():
+        return jsonify({'entries': len(cache.entries), 'brotli': brotli is not None, **cache.stats})
+
+    @app.route('/', defaults={'path': f"{FEEDS_DIRNAME}/{FEED_INDEX_FILENAME}"})
+    @app.route('/<path:path>')
+    def serve(path):
+        entry = cache.get(path)
+        if entry is None:
+            return Response('Not found\n', status=404, mimetype='text/plain')
+        status, headers, body = build_response(entry, request.headers.get('If-None-Match'),
+                                               request.headers.get('Accept-Encoding'))
+        response = Response(body, status=status, headers=headers)
+        if status == 200:
+            # CORS so widgets on other sites can fetch the feeds
+            response.headers['Access-Control-Allow-Origin'] = '*'
+        return response
+
+    return app
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve highlights pages and JSON feeds with live refresh')
+    parser.add_argument('--host', type=str, default='0.0.0.0', help='Interface to bind (default: 0.0.0.0)')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 8080)),
+                       help='Port to listen on (default: $PORT or 8080)')
+    parser.add_argument('--interval', type=int, default=60,
+                       help='Seconds between background refreshes (default: 60, 0 disables)')
+    parser.add_argument('--groupings', nargs='+', choices=GROUPINGS, default=None,
+                       help="Page sets to serve: 'date', 'sport' and/or 'date_sport' "
+                            "(defaults to date or sport per GROUP_BY_DATE in config.py)")
+    parser.add_argument('--tally', action='store_true', default=None,
+                       help='Add "tally to date" cards and serve medal_standings.html')
+    parser.add_argument('--publish-assets', action='store_true', default=None,
+                       help='Serve content-hashed styles.css and flag images with immutable caching')
+    parser.add_argument('--offline', action='store_true',
+                       help='Serve from the cached sheet snapshot only, without connecting to Google Sheets')
+    parser.add_argument('--snapshot-ttl', type=int, default=None,
+                       help='Seconds a fetched sheet snapshot is reused (defaults to SNAPSHOT_TTL in config.py)')
+    parser.add_argument('--spreadsheet-id', type=str, default=None,
+                       help='Google Sheets spreadsheet ID (defaults to config.py)')
+    parser.add_argument('--sheet-name', type=str, default=None,
+                       help='Worksheet name (defaults to config.py)')
+    parser.add_argument('--credentials', type=str, default=None,
+                       help='Path to Google credentials JSON file (defaults to config.py)')
+
+    args = parser.parse_args()
+
+    generator = HighlightsGenerator(
+        spreadsheet_id=args.spreadsheet_id,
+        sheet_name=args.sheet_name,
+        credentials_file=args.credentials,
+        offline=args.offline,
+        snapshot_ttl=args.snapshot_ttl
+    )
+    cache = WidgetCache(generator, groupings=args.groupings, tally=args.tally,
+                        publish_assets=args.publish_assets, interval=args.interval)
+    cache.refresh()
+    if not cache.entries:
+        logger.error("Nothing to serve - check the sheet connection or create a snapshot first")
+        return 1
+    cache.start()
+
+    logger.info(f"Serving {len(cache.entries)} files on http://{args.host}:{args.port}/ "
+                f"(brotli {'on' if brotli is not None else 'off - pip install Brotli'})")
+    create_app(cache).run(host=args.host, port=args.port, threaded=True)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())